@@ -0,0 +1,120 @@
+"""Links page parser microbenchmark.
+
+Compares the incremental `LinksParser` with the previous whole-page regex
+extraction on synthetic `_infoDAT.php` pages.
+
+Usage:
+    python benchmarks/links_parser.py [--pages N] [--padding BYTES]
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import argparse
+import timeit
+
+import regex as re
+
+from bfscraper.scrapers.html import LinksParser
+
+BASE_URL = "http://bigfoil.com"
+FLAGS = re.IGNORECASE | re.DOTALL
+
+
+def page(index: int, padding: int) -> bytes:
+    """Build a synthetic links page.
+
+    Args:
+        index (int): airfoil index.
+        padding (int): number of bytes after the links block.
+
+    Returns:
+        bytes: page contents.
+    """
+    return (
+        "<html><head><title>Airfoil</title></head><body>\n"
+        + f"<div class=\"header\">Airfoil {index}</div>"
+        + f"<b>Selig Format DAT File:</b> <a href=\"/D/{index}.dat\">s</a>"
+        + "<br>\n"
+        + f"<b>Lednicer Format DAT File:</b> <a href=\"/L/{index}.dat\">l</a>"
+        + "<br><br>\n"
+        + "<div>" + "<p>polar data</p>\n" * (padding // 16) + "</div>"
+        + "</body></html>"
+    ).encode("utf-8")
+
+
+def legacy(body: bytes) -> dict[str, str]:
+    """Extract download links with the previous regex path.
+
+    Args:
+        body (bytes): page contents.
+
+    Returns:
+        dict[str, str]: download links.
+    """
+    data = re.findall(
+        r"<\/div>(<b>.+?<br>)<br>",
+        body.decode("utf-8").replace("\n", ""),
+        FLAGS
+    ).pop()
+
+    return {
+        match.group(1).lower().replace(" ", "-").strip(":"):
+            f"{BASE_URL}{match.group(2)}"
+        for match in re.finditer(
+            r"<b>(.+?)<\/b>.*?href=\"(.+?)\".*?<br>", data, FLAGS
+        )
+    }
+
+
+def streaming(body: bytes, chunk_size: int = 4096) -> dict[str, str]:
+    """Extract download links with `LinksParser`.
+
+    Args:
+        body (bytes): page contents.
+        chunk_size (int): chunk size. Defaults to 4096.
+
+    Returns:
+        dict[str, str]: download links.
+    """
+    parser = LinksParser(BASE_URL)
+    for start in range(0, len(body), chunk_size):
+        if parser.feed(body[start:start + chunk_size]):
+            break
+
+    return parser.links
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("--pages", type=int, default=1000)
+    arguments.add_argument("--padding", type=int, default=32 * 1024)
+    arguments.add_argument("--repeat", type=int, default=5)
+    options = arguments.parse_args()
+
+    pages = [page(i, options.padding) for i in range(options.pages)]
+    assert all(legacy(body) == streaming(body) for body in pages)
+
+    print(
+        f"{options.pages} pages of {len(pages[0])} bytes, best of "
+        + f"{options.repeat}:"
+    )
+    results = {}
+    for name, parse in (("legacy", legacy), ("streaming", streaming)):
+        results[name] = min(timeit.repeat(
+            lambda: [parse(body) for body in pages],
+            number=1,
+            repeat=options.repeat
+        ))
+        print(
+            f"  {name:<10} {results[name] * 1e3:9.2f} ms "
+            + f"({options.pages / results[name]:,.0f} pages/s)"
+        )
+
+    print(f"  speedup    {results['legacy'] / results['streaming']:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
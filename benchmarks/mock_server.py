@@ -0,0 +1,393 @@
+"""Local BigFoil stand-in server.
+
+Serves a synthetic catalogue with the same layout as the real site, so the
+scraper can be measured offline:
+
+- `/bigtable1.json`: data table, one row per airfoil.
+- `/D/{id}_infoDAT.php`: download links page of an airfoil.
+- `/D/{id}.dat`: Selig format contour of an airfoil (NACA 4-digit).
+- `/D/{id}_l.dat`: Lednicer format contour of an airfoil (the Selig one,
+  with a different title).
+
+Every airfoil request is delayed by `latency` plus a uniform random `jitter`
+and fails with a 503 response with probability `error_rate`, or always
+during the first `outage` seconds. Responses carry
+an ETag, so conditional requests are answered with 304. The next `truncated`
+data table responses are cut off halfway through.
+
+Usage:
+    python benchmarks/mock_server.py [--count N] [--latency S] ...
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from aiohttp import web
+
+
+class MockBigFoil:
+    """Synthetic BigFoil server class.
+
+    Attributes:
+        count (int): number of airfoils in the catalogue.
+        latency (float): base response delay in seconds.
+        jitter (float): maximum additional random delay in seconds.
+        error_rate (float): probability of a 503 response.
+        outage (float): seconds after the server starts during which every
+            airfoil request fails with a 503 response.
+        points (int): number of points per contour surface.
+        truncated (int): number of upcoming data table responses that are
+            cut off halfway through.
+        broken (set[int]): indexes of the airfoils whose requests always
+            fail with a 503 response.
+        polars (int): number of filler lines after the download links block
+            of each links page.
+        requests (dict[str, int]): served airfoil responses, by status code.
+        table_requests (dict[str, int]): served data table responses, by
+            status code.
+        ETAG (str): entity tag of every airfoil resource.
+    """
+
+    ETAG = '"bigfoil-v1"'
+
+    def __init__(
+        self,
+        count: int = 1000,
+        latency: float = 0.02,
+        jitter: float = 0.01,
+        error_rate: float = 0.0,
+        points: int = 61,
+        seed: int = 0,
+        outage: float = 0.0
+    ) -> None:
+        """Initialize a MockBigFoil instance.
+
+        Args:
+            count (int): number of airfoils in the catalogue. Defaults to
+                1000.
+            latency (float): base response delay in seconds. Defaults to
+                0.02.
+            jitter (float): maximum additional random delay in seconds.
+                Defaults to 0.01.
+            error_rate (float): probability of a 503 response. Defaults to 0.
+            points (int): number of points per contour surface. Defaults to
+                61.
+            seed (int): random seed. Defaults to 0.
+            outage (float): seconds after the server starts during which
+                every airfoil request fails. Defaults to 0.
+        """
+        self.count = count
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.points = points
+        self.outage = outage
+        self.truncated = 0
+        self.broken: set[int] = set()
+        self.polars = 256
+        self.requests: dict[str, int] = {}
+        self.table_requests: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._base_url = ""
+        self._started = 0.0
+
+    def application(self) -> web.Application:
+        """Build the server application.
+
+        Returns:
+            web.Application: aiohttp application.
+        """
+        app = web.Application()
+        app.router.add_get("/bigtable1.json", self._table)
+        app.router.add_get("/D/{id}_infoDAT.php", self._links)
+        app.router.add_get("/D/{id}.dat", self._dat)
+        return app
+
+    @contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """Run the server on a background thread.
+
+        Args:
+            host (str): bind address. Defaults to "127.0.0.1".
+            port (int): bind port, or 0 for any free port. Defaults to 0.
+
+        Yields:
+            str: server base URL.
+        """
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.application(), access_log=None)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, host, port)
+        loop.run_until_complete(site.start())
+
+        port = runner.addresses[0][1]
+        self._base_url = f"http://{host}:{port}"
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        self._started = time.monotonic()
+
+        try:
+            yield self._base_url
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def contour(self, index: int) -> str:
+        """Build the Selig format contour of an airfoil.
+
+        Args:
+            index (int): airfoil index.
+
+        Returns:
+            str: contour file contents.
+        """
+        camber, position, thickness = self._shape(index)
+        lines = [f"foil-{index}"]
+
+        x = [
+            (1 - math.cos(math.pi * i / (self.points - 1))) / 2
+            for i in range(self.points)
+        ]
+        upper, lower = [], []
+        for xi in x:
+            yt = 5 * thickness * (
+                0.2969 * math.sqrt(xi) - 0.1260 * xi - 0.3516 * xi ** 2
+                + 0.2843 * xi ** 3 - 0.1015 * xi ** 4
+            )
+            yc = (
+                camber / position ** 2 * (2 * position * xi - xi ** 2)
+                if xi < position else
+                camber / (1 - position) ** 2
+                * (1 - 2 * position + 2 * position * xi - xi ** 2)
+            )
+            upper.append(f" {xi:.6f} {yc + yt:.6f}")
+            lower.append(f" {xi:.6f} {yc - yt:.6f}")
+
+        return "\n".join(lines + upper[::-1] + lower[1:]) + "\n"
+
+    def table(self) -> list[dict[str, str]]:
+        """Build the data table.
+
+        Returns:
+            list[dict[str, str]]: table rows.
+        """
+        rows = []
+        for index in range(self.count):
+            camber, position, thickness = self._shape(index)
+            rows.append({
+                "Name": f"Foil {index}",
+                "Family": "NACA",
+                "Link": (
+                    f"<a href=\"{self._base_url}/airfoil.php?"
+                    + f"airfoil=foil-{index}\">Foil {index}</a>"
+                ),
+                "Data Sources": "XFoil JavaFoil",
+                "Thickness": f"{thickness * 100:.1f}",
+                "x Thickness": "30.0",
+                "Camber": f"{camber * 100:.1f}",
+                "LD Max": f"{50 + index % 50}",
+                "Cl Max": "1.4",
+                "CdCl01": "0.006",
+                "CdCl04": "0.008",
+                "CdCl06": "-"
+            })
+
+        return rows
+
+    @staticmethod
+    def _shape(index: int) -> tuple[float, float, float]:
+        """Get the NACA 4-digit parameters of an airfoil.
+
+        Args:
+            index (int): airfoil index.
+
+        Returns:
+            tuple[float, float, float]: maximum camber, its position and
+                maximum thickness, relative to the chord.
+        """
+        return (
+            index % 7 / 100,
+            (2 + index % 5) / 10,
+            (6 + index % 13) / 100
+        )
+
+    def _index(self, request: web.Request) -> int:
+        """Get the airfoil index of a request.
+
+        Args:
+            request (web.Request): request object.
+
+        Returns:
+            int: airfoil index.
+        """
+        try:
+            index = int(
+                request.match_info["id"].removeprefix("foil-").removesuffix(
+                    "_l"
+                )
+            )
+        except ValueError:
+            raise web.HTTPNotFound()
+
+        if not 0 <= index < self.count:
+            raise web.HTTPNotFound()
+
+        return index
+
+    async def _respond(
+        self,
+        request: web.Request,
+        response: web.Response
+    ) -> web.Response:
+        """Delay, fail or revalidate a response.
+
+        Args:
+            request (web.Request): request object.
+            response (web.Response): full response.
+
+        Returns:
+            web.Response: served response.
+        """
+        await asyncio.sleep(
+            self.latency + self._random.uniform(0, self.jitter)
+        )
+
+        if (
+            self._random.random() < self.error_rate
+            or time.monotonic() - self._started < self.outage
+            or self._index(request) in self.broken
+        ):
+            response = web.Response(status=503)
+        elif request.headers.get("If-None-Match") == self.ETAG:
+            response = web.Response(status=304)
+
+        if response.status != 503:
+            response.headers["ETag"] = self.ETAG
+
+        status = str(response.status)
+        self.requests[status] = self.requests.get(status, 0) + 1
+        return response
+
+    async def _table(self, request: web.Request) -> web.StreamResponse:
+        """Serve the data table.
+
+        The table ETag is derived from its contents, so changed tables are
+        served in full.
+
+        Args:
+            request (web.Request): request object.
+
+        Returns:
+            web.StreamResponse: data table response.
+        """
+        body = json.dumps(self.table()).encode("utf-8")
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = web.StreamResponse(status=304)
+        else:
+            response = web.StreamResponse(headers={
+                "Content-Type": "application/json",
+                "Content-Length": str(len(body))
+            })
+        response.headers["ETag"] = etag
+
+        status = str(response.status)
+        self.table_requests[status] = self.table_requests.get(status, 0) + 1
+        await response.prepare(request)
+        if response.status == 304:
+            return response
+
+        if self.truncated:
+            self.truncated -= 1
+            await response.write(body[:len(body) // 2])
+            request.transport.close()
+            return response
+
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+    async def _links(self, request: web.Request) -> web.Response:
+        """Serve a download links page.
+
+        Args:
+            request (web.Request): request object.
+
+        Returns:
+            web.Response: download links page response.
+        """
+        index = self._index(request)
+        return await self._respond(request, web.Response(
+            text=(
+                "<html><head><title>BigFoil</title></head><body>\n"
+                + f"<div class=\"title\">Foil {index}</div>"
+                + f"<b>Selig Format DAT File:</b> <a href=\"/D/foil-{index}"
+                + ".dat\">foil.dat</a><br>\n"
+                + "<b>Lednicer Format DAT File:</b> <a href=\"/D/foil-"
+                + f"{index}_l.dat\">foil_l.dat</a><br><br>\n"
+                + "<div>" + "<p>Polar data.</p>\n" * self.polars + "</div>"
+                + "</body></html>"
+            ),
+            content_type="text/html"
+        ))
+
+    async def _dat(self, request: web.Request) -> web.Response:
+        """Serve a contour file.
+
+        Args:
+            request (web.Request): request object.
+
+        Returns:
+            web.Response: contour file response.
+        """
+        index = self._index(request)
+        contour = self.contour(index)
+        if request.match_info["id"].endswith("_l"):
+            contour = contour.replace(
+                f"foil-{index}", f"foil-{index} (Lednicer)", 1
+            )
+
+        return await self._respond(request, web.Response(text=contour))
+
+
+def main() -> None:
+    """Serve the mock site until interrupted."""
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("--host", default="127.0.0.1")
+    arguments.add_argument("--port", type=int, default=8765)
+    arguments.add_argument("--count", type=int, default=1000)
+    arguments.add_argument("--latency", type=float, default=0.02)
+    arguments.add_argument("--jitter", type=float, default=0.01)
+    arguments.add_argument("--error-rate", type=float, default=0.0)
+    arguments.add_argument("--outage", type=float, default=0.0)
+    arguments.add_argument("--seed", type=int, default=0)
+    options = arguments.parse_args()
+
+    server = MockBigFoil(
+        options.count, options.latency, options.jitter, options.error_rate,
+        seed=options.seed, outage=options.outage
+    )
+    with server.serve(options.host, options.port) as url:
+        print(f"Serving {options.count} airfoils at {url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Record model memory benchmark.
+
+Compares the resident memory and pickled (cache row) size of parsed data
+table entries kept as slotted `Record` instances with the previous nested
+dictionaries, for a synthetic catalogue.
+
+Usage:
+    python benchmarks/records.py [--count N]
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import argparse
+import gc
+import pickle
+import tracemalloc
+from typing import Any, Callable
+
+from bfscraper.scrapers.records import OPTIMIZATIONS, Record
+
+BASE_URL = "http://bigfoil.com"
+FAMILIES = ("NACA", "Eppler", "Göttingen", "Wortmann", "Selig")
+SOURCES = ("XFoil", "JavaFoil", "Wind tunnel")
+
+
+def legacy(index: int) -> dict[str, Any]:
+    """Build a parsed entry as a nested dictionary.
+
+    Args:
+        index (int): airfoil index.
+
+    Returns:
+        dict[str, Any]: parsed entry.
+    """
+    return {
+        "name": f"Foil {index}",
+        # Table cells are distinct strings, even with the same value:
+        "family": "".join(FAMILIES[index % len(FAMILIES)]),
+        "links": {
+            "info": f"{BASE_URL}/airfoil.php?airfoil=foil-{index}",
+            "files": f"{BASE_URL}/D/foil-{index}_infoDAT.php"
+        },
+        "download-links": {},
+        "dat": {},
+        "data-sources": ["".join(source) for source in SOURCES[:2]],
+        "optimizations": {
+            key: float(index % 100 + position)
+            for position, key in enumerate(OPTIMIZATIONS)
+        }
+    }
+
+
+def compact(index: int) -> Record:
+    """Build a parsed entry as a record.
+
+    Args:
+        index (int): airfoil index.
+
+    Returns:
+        Record: parsed entry.
+    """
+    entry = legacy(index)
+    return Record.create(
+        name=entry["name"],
+        family=entry["family"],
+        info=entry["links"]["info"],
+        page=entry["links"]["files"],
+        sources=entry["data-sources"],
+        optimizations=entry["optimizations"]
+    )
+
+
+def measure(build: Callable[[int], Any], count: int) -> tuple[int, int]:
+    """Measure the memory and pickled size of a catalogue.
+
+    Args:
+        build (Callable[[int], Any]): entry factory.
+        count (int): number of entries.
+
+    Returns:
+        tuple[int, int]: allocated bytes and total pickled bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    entries = {f"foil-{index}": build(index) for index in range(count)}
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return allocated, sum(
+        len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        for entry in entries.values()
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("--count", type=int, default=10000)
+    options = arguments.parse_args()
+
+    print(f"{options.count} entries:")
+    results = {}
+    for name, build in (("legacy", legacy), ("records", compact)):
+        results[name] = measure(build, options.count)
+        print(
+            f"  {name:<10} {results[name][0] / 2 ** 20:8.2f} MiB in memory,"
+            + f" {results[name][1] / 2 ** 20:8.2f} MiB pickled"
+        )
+
+    print(
+        f"  reduction  {results['legacy'][0] / results['records'][0]:8.2f}x"
+        + f" in memory, {results['legacy'][1] / results['records'][1]:8.2f}x"
+        + " pickled"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""CLI startup time benchmark.
+
+Runs short CLI invocations (such as `--help`) in fresh interpreters with
+`-X importtime` and reports:
+
+- wall: median wall time of the whole invocation, in milliseconds.
+- imports: median cumulative import time of the CLI module, in
+  milliseconds.
+- slowest: top-level modules imported by the CLI, by cumulative import
+  time.
+- heavy: heavy dependencies (network, parsing and reporting libraries)
+  imported by the invocation, which should be none for these commands.
+
+With `--budget`, the benchmark fails if any median import time exceeds it,
+so it can guard startup time in CI.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--budget MS] [--top N]
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import argparse
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+COMMANDS = {
+    "help": ["--help"],
+    "merge-help": ["merge", "--help"],
+    "cache-help": ["cache", "stats", "--help"]
+}
+ROOT = "bfscraper.cli.interface"
+HEAVY = ("aiohttp", "regex", "tqdm", "colorama", "hurry.filesize", "numpy")
+
+
+def measure(arguments: list[str]) -> tuple[float, dict[str, int]]:
+    """Run the CLI once in a fresh interpreter.
+
+    Args:
+        arguments (list[str]): CLI arguments.
+
+    Returns:
+        tuple[float, dict[str, int]]: wall time in seconds and cumulative
+            import time of every imported module, in microseconds.
+    """
+    start = perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "bfscraper", *arguments],
+        capture_output=True,
+        text=True
+    )
+    elapsed = perf_counter() - start
+
+    if process.returncode:
+        raise RuntimeError(f"bfscraper {' '.join(arguments)} failed.")
+
+    # Lines look like "import time:  self [us] | cumulative | module":
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        modules[module.strip()] = int(cumulative)
+
+    return elapsed, modules
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("--runs", type=int, default=10)
+    arguments.add_argument("--top", type=int, default=5)
+    arguments.add_argument("--budget", type=float, help="milliseconds")
+    options = arguments.parse_args()
+
+    failed = False
+    for name, command in COMMANDS.items():
+        runs = [measure(command) for _ in range(options.runs)]
+        modules = runs[-1][1]
+        imports = median(run[1].get(ROOT, 0) for run in runs) / 1e3
+        heavy = [module for module in HEAVY if module in modules]
+
+        print(
+            f"{name:>10}: wall {median(run[0] for run in runs) * 1e3:6.1f} ms,"
+            + f" imports {imports:6.1f} ms,"
+            + f" heavy: {', '.join(heavy) or 'none'}"
+        )
+        slowest = sorted(
+            (
+                (time, module) for module, time in modules.items()
+                if "." not in module or module.startswith("bfscraper")
+            ),
+            reverse=True
+        )[:options.top]
+        for time, module in slowest:
+            print(f"{'':>12}{time / 1e3:6.1f} ms  {module}")
+
+        if options.budget is not None and imports > options.budget:
+            print(f"{name} exceeds the {options.budget} ms import budget.")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
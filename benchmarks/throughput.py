@@ -0,0 +1,227 @@
+"""Offline scraper throughput benchmark.
+
+Runs `SiteScraper` end to end against a local `MockBigFoil` server for every
+requested simultaneous requests limit. Each run happens in a fresh process
+with an empty cache, and reports:
+
+- entries: scraped airfoils.
+- entries-per-second: scraped airfoils per second of wall time.
+- latency-p50 and latency-p99: airfoil request latency percentiles, in
+  seconds, as seen by the client.
+- peak-rss: peak resident set size of the scraper process, in bytes.
+- cache-io: time spent in cache backend operations, in seconds.
+
+Results are written as JSON, along with the benchmark parameters, so they
+can be compared between revisions.
+
+Usage:
+    python benchmarks/throughput.py [--limits 5,20,50,auto] [--count N] ...
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from functools import wraps
+from statistics import quantiles
+from time import perf_counter
+from typing import Any
+
+import aiohttp
+
+from mock_server import MockBigFoil
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(base_url: str, count: int, limit: int | str) -> dict[str, Any]:
+    """Run the scraper once in the current process and measure it.
+
+    Args:
+        base_url (str): mock server base URL.
+        count (int): number of airfoils to scrape.
+        limit (int | str): simultaneous requests limit, or "auto".
+
+    Returns:
+        dict[str, Any]: run measurements.
+    """
+    from bfscraper.scrapers.async_components import AsyncScraper
+    from bfscraper.scrapers.site_scraper import SiteScraper
+    from bfscraper.scrapers.sources import BigFoil
+    from bfscraper.tools.cache import SQLiteBackend
+
+    BigFoil.BASE_URL = base_url
+    BigFoil.TABLE_URL = f"{base_url}/bigtable1.json"
+
+    latencies: list[float] = []
+    cache_io = [0.0]
+
+    async def on_start(session, context, params) -> None:
+        context.start = perf_counter()
+
+    async def on_end(session, context, params) -> None:
+        latencies.append(perf_counter() - context.start)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_end)
+
+    def create_session(
+        timeout: int,
+        limit: int,
+        registry: Any = None
+    ) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=limit),
+            trace_configs=[trace] + (
+                [registry.trace_config()] if registry else []
+            )
+        )
+
+    def timed(method: Any) -> Any:
+        @wraps(method)
+        def wrap(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                cache_io[0] += perf_counter() - start
+
+        return wrap
+
+    AsyncScraper.create_session = staticmethod(create_session)
+    for name in ("get", "set", "set_many", "delete", "flush"):
+        setattr(SQLiteBackend, name, timed(getattr(SQLiteBackend, name)))
+
+    scraper = SiteScraper(
+        count=count,
+        output="scraped.json",
+        timeout=-1,
+        limit=limit,
+        verbose=False,
+        retries=5
+    )
+    start = perf_counter()
+    scraper.run()
+    elapsed = perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else []
+
+    return {
+        "limit": limit,
+        "entries": scraper._writer.records,
+        "seconds": elapsed,
+        "entries-per-second": scraper._writer.records / elapsed,
+        "requests": len(latencies),
+        "latency-p50": percentiles[49] if percentiles else None,
+        "latency-p99": percentiles[98] if percentiles else None,
+        "peak-rss": rss if sys.platform == "darwin" else rss * 1024,
+        "cache-io": cache_io[0]
+    }
+
+
+def run(base_url: str, count: int, limit: int | str) -> dict[str, Any]:
+    """Run the scraper once in a fresh process and working directory.
+
+    Args:
+        base_url (str): mock server base URL.
+        count (int): number of airfoils to scrape.
+        limit (int | str): simultaneous requests limit, or "auto".
+
+    Returns:
+        dict[str, Any]: run measurements.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        process = subprocess.run(
+            [
+                sys.executable, os.path.join(DIRECTORY, "throughput.py"),
+                "--worker", base_url, "--count", str(count),
+                "--limits", str(limit)
+            ],
+            cwd=directory,
+            capture_output=True,
+            text=True
+        )
+
+    if process.returncode:
+        raise RuntimeError(f"Run with limit {limit} failed:\n{process.stderr}")
+
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("--limits", default="5,20,50,100,auto")
+    arguments.add_argument("--count", type=int, default=500)
+    arguments.add_argument("--latency", type=float, default=0.02)
+    arguments.add_argument("--jitter", type=float, default=0.01)
+    arguments.add_argument("--error-rate", type=float, default=0.0)
+    arguments.add_argument("--seed", type=int, default=0)
+    arguments.add_argument(
+        "--output", default=os.path.join(DIRECTORY, "results.json")
+    )
+    arguments.add_argument("--worker", metavar="BASE_URL", help="internal")
+    options = arguments.parse_args()
+
+    limits = [
+        value if value == "auto" else int(value)
+        for value in options.limits.split(",")
+    ]
+
+    if options.worker is not None:
+        print(json.dumps(measure(options.worker, options.count, limits[0])))
+        return
+
+    server = MockBigFoil(
+        options.count, options.latency, options.jitter, options.error_rate,
+        seed=options.seed
+    )
+    results = []
+    with server.serve() as base_url:
+        for limit in limits:
+            result = run(base_url, options.count, limit)
+            results.append(result)
+            print(
+                f"limit {str(limit):>5}: "
+                + f"{result['entries-per-second']:8.1f} entries/s, "
+                + f"p50 {result['latency-p50'] * 1e3:6.1f} ms, "
+                + f"p99 {result['latency-p99'] * 1e3:6.1f} ms, "
+                + f"peak RSS {result['peak-rss'] / 2 ** 20:6.1f} MiB, "
+                + f"cache I/O {result['cache-io']:.3f} s"
+            )
+
+    with open(options.output, "w") as fp:
+        json.dump({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "count": options.count,
+                "latency": options.latency,
+                "jitter": options.jitter,
+                "error-rate": options.error_rate,
+                "seed": options.seed
+            },
+            "server": server.requests,
+            "results": results
+        }, fp, indent=4)
+
+    print(f"Results written to {options.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,27 @@ and data parsing from several sources.
 Author:
     Paulo Sanchez (@erlete)
 """
+
+
+from typing import Any
+
+__all__ = ["scrape_iter"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public API members on first access.
+
+    The scraping stack is only imported when it is used, so importing the
+    package (as the CLI does) stays fast.
+
+    Args:
+        name (str): attribute name.
+
+    Returns:
+        Any: attribute value.
+    """
+    if name == "scrape_iter":
+        from .api import scrape_iter
+        return scrape_iter
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
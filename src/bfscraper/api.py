@@ -0,0 +1,129 @@
+"""Embeddable scraping API.
+
+Scrapes airfoils on the caller's event loop and yields every record as soon
+as it is complete, so bfscraper can run inside asyncio applications and
+records can be processed (stored, indexed...) while the rest are still being
+downloaded:
+
+    async with aclosing(bfscraper.scrape_iter(count=100)) as records:
+        async for key, record in records:
+            await database.insert(key, record)
+
+Wrapping the iteration in `contextlib.aclosing` cancels the scraping as soon
+as the loop is left, instead of whenever the generator is garbage collected.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator
+
+import aiohttp
+
+from .scrapers.site_scraper import SELIG, SiteScraper
+from .tools.filters import Predicate
+from .tools.shards import Shard
+
+
+async def scrape_iter(
+    count: int = -1,
+    session: aiohttp.ClientSession | None = None,
+    timeout: int = -1,
+    limit: int | str = 20,
+    host_limit: dict[str, int] | None = None,
+    ttl: int = -1,
+    retries: int = 3,
+    min_limit: int = 2,
+    max_limit: int = 100,
+    filter: Predicate | None = None,
+    shard: Shard | None = None,
+    files: str | None = None,
+    formats: tuple[str, ...] | None = SELIG,
+    cache: str = ".bfscrapercache",
+    failed: dict[str, list[str]] | None = None,
+    verbose: bool = False,
+    sites: tuple[str, ...] = ("bigfoil",)
+) -> AsyncIterator[tuple[str, dict]]:
+    """Scrape airfoils and yield their records as they complete.
+
+    Records are the values of the output file (keyed by airfoil ID). Records
+    whose downloads failed are yielded as well, without contour data, and
+    their URLs are added to `failed`. Nothing is printed. The iteration
+    applies backpressure: scraping pauses while the consumer is busy, and
+    stopping the iteration cancels every pending request.
+
+    Args:
+        count (int): number of airfoils to scrape (-1 for all available).
+            Defaults to -1.
+        session (aiohttp.ClientSession | None): session to use, which is
+            left open. Its timeout and connection limits apply instead of
+            `timeout` and `limit`. Defaults to None (a session owned by the
+            iteration).
+        timeout (int): request timeout in seconds (-1 for no timeout).
+            Defaults to -1.
+        limit (int | str): simultaneous requests limit, or "auto" for
+            adaptive concurrency. Defaults to 20.
+        host_limit (dict[str, int] | None): simultaneous requests limit per
+            host. Defaults to None.
+        ttl (int): seconds after which cached entries are revalidated (-1
+            for never). Defaults to -1.
+        retries (int): maximum number of retries per URL. Defaults to 3.
+        min_limit (int): minimum simultaneous requests limit in adaptive
+            mode. Defaults to 2.
+        max_limit (int): maximum simultaneous requests limit in adaptive
+            mode. Defaults to 100.
+        filter (Predicate | None): entry selection predicate, called with
+            the airfoil ID and the parsed entry. Defaults to None.
+        shard (Shard | None): crawl shard. Defaults to None (the whole
+            catalogue).
+        files (str | None): directory to stream downloaded files to, instead
+            of embedding Selig Format contours in the records. Defaults to
+            None.
+        formats (tuple[str, ...] | None): download formats to stream to
+            `files`, or None for every available format. Defaults to the
+            Selig Format DAT file.
+        cache (str): cache file path, which can be shared with CLI runs.
+            Defaults to ".bfscrapercache".
+        failed (dict[str, list[str]] | None): dictionary that failed URLs,
+            grouped by exception name, are added to when the iteration ends.
+            Defaults to None.
+        verbose (bool): whether to display a progress bar and log messages
+            (if enabled in the Logger). Defaults to False.
+        sites (tuple[str, ...]): names of the sources to scrape, in priority
+            order. Records of multi-source runs are yielded once every data
+            table has been read. Defaults to BigFoil only.
+
+    Yields:
+        tuple[str, dict]: airfoil ID and record.
+    """
+    scraper = SiteScraper(
+        count=count,
+        output="",
+        timeout=timeout,
+        limit=limit,
+        verbose=verbose,
+        host_limit=host_limit,
+        ttl=ttl,
+        retries=retries,
+        min_limit=min_limit,
+        max_limit=max_limit,
+        filter=filter,
+        shard=shard,
+        files=files,
+        formats=formats,
+        cache=cache,
+        sites=sites
+    )
+    try:
+        async with aclosing(scraper.records(session)) as records:
+            async for item in records:
+                yield item
+    finally:
+        if failed is not None:
+            for exception, urls in scraper.failed.items():
+                failed.setdefault(exception, []).extend(urls)
+        # Closing commits pending writes and joins the cache thread:
+        await asyncio.to_thread(scraper.cache.close)
@@ -9,5 +9,24 @@ DEFAULTS = {
     "count": -1,
     "output": "scraped.json",
     "timeout": -1,
-    "limit": 20
+    "limit": 20,
+    "ttl": -1,
+    "retries": 3,
+    "min_limit": 2,
+    "max_limit": 100,
+    "format": "json",
+    "dataset": None,
+    "metrics": False,
+    "files": None,
+    "formats": "selig-format-dat-file",
+    "stats": None,
+    "stats_interval": 0,
+    "incremental": False,
+    "resume": False,
+    "sites": ("bigfoil",),
+    "processes": 1,
+    "cache": ".bfscrapercache",
+    "cache_size": None,
+    "cache_age": None,
+    "eviction": "lru"
 }
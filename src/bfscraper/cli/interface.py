@@ -1,17 +1,311 @@
 """Command line interface for bfscraper.
 
+Only lightweight modules are imported here. The scraper and its network,
+parsing and reporting dependencies are imported by the commands that run
+it, so that showing help or validating options stays fast.
+
 Author:
     Paulo Sanchez (@erlete)
 """
 
 
+import os
+from typing import Any
+
 import click
 
-from ..scrapers.site_scraper import SiteScraper
+from ..tools.filters import EntryFilter
+from ..tools.metrics import MetricsRegistry
+from ..tools.output import OutputWriter
+from ..tools.shards import Shard, merge
 from .defaults import DEFAULTS
 
 
-@click.command("bfscraper")
+class LimitType(click.ParamType):
+    """Simultaneous requests limit parameter type (integer or "auto")."""
+
+    name = "INTEGER|auto"
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None
+    ) -> int | str:
+        """Convert a limit option value.
+
+        Args:
+            value (Any): option value.
+            param (click.Parameter | None): option parameter.
+            ctx (click.Context | None): click context.
+
+        Returns:
+            int | str: simultaneous requests limit, or "auto".
+        """
+        if value == "auto":
+            return value
+
+        try:
+            return max(int(value), 1)
+        except (TypeError, ValueError):
+            self.fail(f"\"{value}\" is neither an integer nor \"auto\".")
+
+
+class QuantityType(click.ParamType):
+    """Quantity parameter type, with an optional unit suffix (such as 30d).
+
+    Attributes:
+        UNITS (dict[str, float]): unit multipliers, by suffix.
+    """
+
+    UNITS: dict[str, float] = {}
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None
+    ) -> float:
+        """Convert a quantity option value.
+
+        Args:
+            value (Any): option value.
+            param (click.Parameter | None): option parameter.
+            ctx (click.Context | None): click context.
+
+        Returns:
+            float: quantity, in base units.
+        """
+        if isinstance(value, (int, float)):
+            return value
+
+        number = str(value).strip()
+        unit = number[-1:].upper()
+        if unit in self.UNITS:
+            number = number[:-1]
+
+        try:
+            quantity = float(number) * self.UNITS.get(unit, 1)
+        except ValueError:
+            self.fail(
+                f"\"{value}\" is not a number with an optional"
+                + f" {'/'.join(self.UNITS)} suffix."
+            )
+
+        if quantity < 0:
+            self.fail(f"\"{value}\" is negative.")
+
+        return quantity
+
+
+class SizeType(QuantityType):
+    """Size parameter type, in bytes or with a K, M or G suffix."""
+
+    name = "SIZE"
+    UNITS = {"K": 2 ** 10, "M": 2 ** 20, "G": 2 ** 30}
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None
+    ) -> int:
+        """Convert a size option value.
+
+        Args:
+            value (Any): option value.
+            param (click.Parameter | None): option parameter.
+            ctx (click.Context | None): click context.
+
+        Returns:
+            int: size in bytes.
+        """
+        return int(super().convert(value, param, ctx))
+
+
+class AgeType(QuantityType):
+    """Age parameter type, in seconds or with an s, m, h or d suffix."""
+
+    name = "AGE"
+    UNITS = {"S": 1, "M": 60, "H": 3600, "D": 86400}
+
+
+def _parse_host_limits(values: tuple[str, ...]) -> dict[str, int]:
+    """Parse per-host limit options.
+
+    Args:
+        values (tuple[str, ...]): option values, in HOST=N format.
+
+    Returns:
+        dict[str, int]: simultaneous requests limit per host.
+    """
+    limits = {}
+    for value in values:
+        host, _, limit = value.partition("=")
+        if not host or not limit.isdigit() or int(limit) < 1:
+            raise click.BadParameter(
+                f"\"{value}\" is not in HOST=N format (N >= 1)."
+            )
+        limits[host] = int(limit)
+
+    return limits
+
+
+def _parse_ranges(
+    values: tuple[str, ...]
+) -> dict[str, tuple[float | None, float | None]]:
+    """Parse range filter options.
+
+    Args:
+        values (tuple[str, ...]): option values, in FIELD=MIN:MAX format.
+
+    Returns:
+        dict[str, tuple[float | None, float | None]]: bounds per field.
+    """
+    try:
+        return dict(EntryFilter.parse_range(value) for value in values)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc))
+
+
+def _parse_formats(value: str) -> tuple[str, ...] | None:
+    """Parse a download formats option.
+
+    Args:
+        value (str): option value, as comma-separated download link names,
+            or "all".
+
+    Returns:
+        tuple[str, ...] | None: download formats, or None for all of them.
+    """
+    if value.strip().lower() == "all":
+        return None
+
+    formats = tuple(
+        format.strip().lower() for format in value.split(",")
+        if format.strip()
+    )
+    if not formats:
+        raise click.BadParameter("at least one format is required.")
+
+    return formats
+
+
+def _parse_shard(value: str | None) -> Shard | None:
+    """Parse a shard option.
+
+    Args:
+        value (str | None): option value, in i/N format.
+
+    Returns:
+        Shard | None: shard, if given.
+    """
+    if value is None:
+        return None
+
+    try:
+        return Shard.parse(value)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc))
+
+
+def _scrape(kwargs: dict[str, Any]) -> None:
+    """Run the scraper.
+
+    Defined at module level, so it can also run in shard worker processes.
+
+    Args:
+        kwargs (dict[str, Any]): SiteScraper arguments.
+    """
+    from ..scrapers.site_scraper import SiteScraper
+
+    SiteScraper(**kwargs).run()
+
+
+def _merge_shards(
+    count: int,
+    output: str,
+    format: str,
+    dataset: str | None = None,
+    metrics: bool = False
+) -> None:
+    """Merge shard outputs and datasets into unsharded ones.
+
+    Args:
+        count (int): total number of shards.
+        output (str): unsharded output file path.
+        format (str): output format.
+        dataset (str | None): unsharded dataset directory path. Defaults to
+            None.
+        metrics (bool): whether to compute geometry metrics of the merged
+            dataset. Defaults to False.
+    """
+    from ..tools.logger import Logger
+
+    inputs = [path for path in Shard.paths(output, count) if os.path.exists(
+        path
+    )]
+    if len(inputs) < count:
+        Logger.warning(f"Only {len(inputs)} of {count} shard outputs found.")
+
+    records = merge(inputs, output, format)
+    Logger.success(f"Merged {records} airfoils into {output}.")
+
+    if dataset is None:
+        return
+
+    from ..geometry.dataset import Dataset, DatasetWriter
+
+    with DatasetWriter(dataset) as writer:
+        for path in Shard.paths(dataset, count):
+            if os.path.exists(path):
+                writer.extend(Dataset(path))
+
+    Logger.success(f"Merged {writer.count} contours into {dataset}.")
+    if metrics:
+        from ..scrapers.site_scraper import SiteScraper
+        SiteScraper.analyze_dataset(dataset)
+
+
+def _launch(kwargs: dict[str, Any], processes: int) -> None:
+    """Scrape every shard in its own process and merge the results.
+
+    Args:
+        kwargs (dict[str, Any]): SiteScraper arguments.
+        processes (int): number of shards and worker processes.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    from ..tools.logger import Logger
+
+    Logger.ENABLED = kwargs["verbose"]
+    Logger.info(f"Running {processes} shards in parallel...")
+
+    # Shards are quiet and skip per-shard geometry metrics:
+    shard_kwargs = {**kwargs, "verbose": False, "metrics": False}
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=get_context("spawn")
+    ) as executor:
+        for future in [
+            executor.submit(
+                _scrape, {**shard_kwargs, "shard": Shard(index, processes)}
+            )
+            for index in range(processes)
+        ]:
+            future.result()
+
+    _merge_shards(
+        processes,
+        kwargs["output"],
+        kwargs["format"],
+        kwargs["dataset"],
+        kwargs["metrics"]
+    )
+
+
+@click.group("bfscraper", invoke_without_command=True)
 @click.option(
     "--count",
     "-c",
@@ -20,6 +314,45 @@ from .defaults import DEFAULTS
     type=click.IntRange(min=-1, clamp=True),
     help="Number of airfoils to scrape (-1 for all available)."
 )
+@click.option(
+    "--site",
+    "-S",
+    "sites",
+    multiple=True,
+    default=DEFAULTS["sites"],
+    show_default=True,
+    metavar="NAME",
+    help="Source site to scrape (repeatable, in priority order). Sites are"
+    + " scraped concurrently and airfoils listed by several of them are"
+    + " merged."
+)
+@click.option(
+    "--family",
+    multiple=True,
+    help="Only scrape airfoils of this family (repeatable)."
+)
+@click.option(
+    "--source",
+    multiple=True,
+    help="Only scrape airfoils with this data source, such as XFoil"
+    + " (repeatable)."
+)
+@click.option(
+    "--name",
+    multiple=True,
+    metavar="PATTERN",
+    help="Only scrape airfoils whose name or ID matches this pattern, with"
+    + " shell wildcards (repeatable)."
+)
+@click.option(
+    "--range",
+    "ranges",
+    multiple=True,
+    metavar="FIELD=MIN:MAX",
+    callback=lambda ctx, param, value: _parse_ranges(value),
+    help="Only scrape airfoils with a table value in this range, in table"
+    + " units, such as thickness=10:14 or LD-Max=80: (repeatable)."
+)
 @click.option(
     "--output",
     "-o",
@@ -28,6 +361,67 @@ from .defaults import DEFAULTS
     type=click.Path(exists=False, dir_okay=False, writable=True),
     help="Output file path."
 )
+@click.option(
+    "--format",
+    "-f",
+    default=DEFAULTS["format"],
+    show_default=True,
+    type=click.Choice(OutputWriter.FORMATS),
+    help="Output format (indented JSON, compact JSON or one JSON record per"
+    + " line)."
+)
+@click.option(
+    "--dataset",
+    "-d",
+    default=DEFAULTS["dataset"],
+    type=click.Path(exists=False, file_okay=False, writable=True),
+    help="Also export contours as a memory-mappable binary dataset to this"
+    + " directory (requires NumPy)."
+)
+@click.option(
+    "--metrics",
+    "-m",
+    is_flag=True,
+    default=DEFAULTS["metrics"],
+    help="Compute geometry metrics of the exported dataset and flag entries"
+    + " that disagree with the table (requires --dataset)."
+)
+@click.option(
+    "--files-dir",
+    "files",
+    default=DEFAULTS["files"],
+    type=click.Path(exists=False, file_okay=False, writable=True),
+    help="Stream downloaded files to this directory, named after their"
+    + " contents, and keep their path, size and hash in the output instead"
+    + " of the contours."
+)
+@click.option(
+    "--formats",
+    default=DEFAULTS["formats"],
+    show_default=True,
+    metavar="FORMAT[,FORMAT...]",
+    callback=lambda ctx, param, value: _parse_formats(value),
+    help="Download formats to stream to --files-dir, as download link names"
+    + " (such as lednicer-format-dat-file), or \"all\"."
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=DEFAULTS["incremental"],
+    help="Only scrape entries added or changed since the previous run with"
+    + " the same output file, and patch that file (incompatible with"
+    + " --count and filters)."
+)
+@click.option(
+    "--resume",
+    "-R",
+    is_flag=True,
+    default=DEFAULTS["resume"],
+    help="Resume the previous run with the same output file, which was"
+    + " interrupted or left failed entries: only pending and failed entries"
+    + " are scraped (incompatible with --incremental)."
+)
 @click.option(
     "--timeout",
     "-t",
@@ -41,8 +435,105 @@ from .defaults import DEFAULTS
     "-l",
     default=DEFAULTS["limit"],
     show_default=True,
+    type=LimitType(),
+    help="Simultaneous requests limit (\"auto\" for adaptive concurrency)."
+)
+@click.option(
+    "--min-limit",
+    default=DEFAULTS["min_limit"],
+    show_default=True,
+    type=click.IntRange(min=1, clamp=True),
+    help="Minimum simultaneous requests limit in adaptive mode."
+)
+@click.option(
+    "--max-limit",
+    default=DEFAULTS["max_limit"],
+    show_default=True,
+    type=click.IntRange(min=1, clamp=True),
+    help="Maximum simultaneous requests limit in adaptive mode."
+)
+@click.option(
+    "--host-limit",
+    "-H",
+    multiple=True,
+    metavar="HOST=N",
+    callback=lambda ctx, param, value: _parse_host_limits(value),
+    help="Simultaneous requests limit for a single host (repeatable)."
+)
+@click.option(
+    "--cache",
+    default=DEFAULTS["cache"],
+    show_default=True,
+    type=click.Path(exists=False, dir_okay=False, writable=True),
+    help="Cache file path."
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULTS["cache_size"],
+    type=SizeType(),
+    help="Evict cached entries after the run until the cache is smaller than"
+    + " this size, in bytes or with a K, M or G suffix."
+)
+@click.option(
+    "--cache-age",
+    default=DEFAULTS["cache_age"],
+    type=AgeType(),
+    help="Evict cached entries after the run if they are older than this, in"
+    + " seconds or with an s, m, h or d suffix."
+)
+@click.option(
+    "--eviction",
+    default=DEFAULTS["eviction"],
+    show_default=True,
+    type=click.Choice(("lru", "oldest")),
+    help="Cache eviction order: least recently used or oldest first."
+)
+@click.option(
+    "--ttl",
+    default=DEFAULTS["ttl"],
+    show_default=True,
+    type=click.IntRange(min=-1, clamp=True),
+    help="Seconds after which cached entries are revalidated (-1 for never)."
+)
+@click.option(
+    "--retries",
+    "-r",
+    default=DEFAULTS["retries"],
+    show_default=True,
+    type=click.IntRange(min=0, clamp=True),
+    help="Maximum number of retries per URL on transient errors."
+)
+@click.option(
+    "--stats",
+    "-s",
+    default=DEFAULTS["stats"],
+    type=click.Path(exists=False, dir_okay=False, writable=True),
+    help="Write run metrics (request timings, queue waits, cache usage...)"
+    + " to this file, as JSON (.json) or Prometheus text (.prom, .txt)."
+)
+@click.option(
+    "--stats-interval",
+    default=DEFAULTS["stats_interval"],
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds between run metrics snapshots during the run (0 for a"
+    + " final snapshot only)."
+)
+@click.option(
+    "--shard",
+    metavar="i/N",
+    callback=lambda ctx, param, value: _parse_shard(value),
+    help="Only scrape shard i of N (0 <= i < N), with shard-local output,"
+    + " dataset, metrics and cache files. Merge them with the merge command."
+)
+@click.option(
+    "--processes",
+    "-P",
+    default=DEFAULTS["processes"],
+    show_default=True,
     type=click.IntRange(min=1, clamp=True),
-    help="Simultaneous requests limit."
+    help="Split the catalogue in this many shards, scrape them in parallel"
+    + " processes and merge the results."
 )
 @click.option(
     "--verbose",
@@ -50,19 +541,340 @@ from .defaults import DEFAULTS
     is_flag=True,
     help="Verbose mode."
 )
-def cli(**kwargs):
+@click.pass_context
+def cli(ctx: click.Context, **kwargs):
     """BLASTFOIL scraper CLI
 
     This is the command line interface for the BLASTFOIL scraper, a tool that
     simplifies airfoil database population processes by providing with a
     simple and easy to use interface.
     """
+    if ctx.invoked_subcommand is not None:
+        return
+
     # File format check:
-    if not kwargs["output"].endswith(".json"):
+    if not kwargs["output"].endswith((".json", ".ndjson", ".jsonl")):
         print(
             f"Using default output file path as \"{kwargs['output']}\" is not "
             + "a valid JSON file."
         )
         kwargs["output"] += DEFAULTS["output"]
 
-    SiteScraper(**kwargs).run()
+    if kwargs["metrics"] and kwargs["dataset"] is None:
+        raise click.BadParameter("--metrics requires --dataset.")
+
+    if kwargs["files"] is None and ctx.get_parameter_source(
+        "formats"
+    ) is not click.core.ParameterSource.DEFAULT:
+        raise click.BadParameter("--formats requires --files-dir.")
+
+    if (
+        kwargs["files"] is not None and kwargs["dataset"] is not None
+        and kwargs["formats"] is not None
+        and DEFAULTS["formats"] not in kwargs["formats"]
+    ):
+        raise click.BadParameter(
+            f"--dataset requires the {DEFAULTS['formats']} format."
+        )
+
+    if kwargs["stats"] is not None and not kwargs["stats"].lower().endswith(
+        tuple(MetricsRegistry.FORMATS)
+    ):
+        raise click.BadParameter(
+            "--stats must end in "
+            + f"{', '.join(MetricsRegistry.FORMATS)}."
+        )
+
+    if kwargs["stats_interval"] and kwargs["stats"] is None:
+        raise click.BadParameter("--stats-interval requires --stats.")
+
+    if kwargs["min_limit"] > kwargs["max_limit"]:
+        raise click.BadParameter(
+            "--min-limit must not be greater than --max-limit."
+        )
+
+    # Sources are registered by the scraping stack, only loaded here:
+    from ..scrapers.sources import SourceRegistry
+
+    try:
+        SourceRegistry(kwargs["sites"])
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--site")
+
+    processes = kwargs.pop("processes")
+    if processes > 1 and kwargs["shard"] is not None:
+        raise click.BadParameter("--processes and --shard are exclusive.")
+
+    kwargs["filter"] = EntryFilter(
+        families=kwargs.pop("family"),
+        sources=kwargs.pop("source"),
+        names=kwargs.pop("name"),
+        ranges=kwargs.pop("ranges")
+    ) or None
+
+    # Entries left out by the selection would count as removed:
+    if kwargs["incremental"] and (
+        kwargs["count"] != -1 or kwargs["filter"] is not None
+    ):
+        raise click.BadParameter(
+            "--incremental cannot be combined with --count or filters."
+        )
+
+    if kwargs["incremental"] and kwargs["resume"]:
+        raise click.BadParameter(
+            "--incremental and --resume are exclusive."
+        )
+
+    if processes > 1:
+        _launch(kwargs, processes)
+    else:
+        _scrape(kwargs)
+
+
+@cli.command("merge")
+@click.option(
+    "--shards",
+    "-n",
+    required=True,
+    type=click.IntRange(min=1),
+    help="Total number of shards (N in --shard i/N)."
+)
+@click.option(
+    "--output",
+    "-o",
+    default=DEFAULTS["output"],
+    show_default=True,
+    type=click.Path(exists=False, dir_okay=False, writable=True),
+    help="Unsharded output file path, as given to the shards."
+)
+@click.option(
+    "--format",
+    "-f",
+    default=DEFAULTS["format"],
+    show_default=True,
+    type=click.Choice(OutputWriter.FORMATS),
+    help="Output format of the shards."
+)
+@click.option(
+    "--dataset",
+    "-d",
+    default=DEFAULTS["dataset"],
+    type=click.Path(exists=False, file_okay=False, writable=True),
+    help="Unsharded dataset directory path, as given to the shards."
+)
+@click.option(
+    "--metrics",
+    "-m",
+    is_flag=True,
+    default=DEFAULTS["metrics"],
+    help="Compute geometry metrics of the merged dataset (requires"
+    + " --dataset)."
+)
+def merge_command(**kwargs):
+    """Merge shard outputs.
+
+    Combines the outputs (and datasets) of every shard of a sharded crawl
+    into the unsharded files.
+    """
+    if kwargs["metrics"] and kwargs["dataset"] is None:
+        raise click.BadParameter("--metrics requires --dataset.")
+
+    _merge_shards(
+        kwargs["shards"],
+        kwargs["output"],
+        kwargs["format"],
+        kwargs["dataset"],
+        kwargs["metrics"]
+    )
+
+
+def _cache_option(command: Any) -> Any:
+    """Add the cache file option to a cache command.
+
+    Args:
+        command (Any): command function.
+
+    Returns:
+        Any: decorated command function.
+    """
+    return click.option(
+        "--cache",
+        "-C",
+        default=DEFAULTS["cache"],
+        show_default=True,
+        type=click.Path(exists=True, dir_okay=False, writable=True),
+        help="Cache file path."
+    )(command)
+
+
+@cli.group("cache")
+def cache_group():
+    """Inspect and maintain the cache.
+
+    The cache keeps downloaded pages and their HTTP validators between runs.
+    These commands report its usage and shrink it without scraping again.
+    """
+
+
+@cache_group.command("stats")
+@_cache_option
+def cache_stats(cache: str):
+    """Report cache usage.
+
+    Shows the number and size of cached entries by kind, the size of the
+    cache files on disk, the lookup hit rate over every run and the age of
+    the cached entries.
+    """
+    from datetime import datetime
+
+    from hurry.filesize import alternative, size
+
+    from ..tools.cache import Cache
+
+    instance = Cache(cache)
+    try:
+        stats = instance.stats()
+    finally:
+        instance.close()
+
+    click.echo(f"Cache: {cache}")
+    for kind in ("records", "http", "index"):
+        click.echo(
+            f"  {kind:<8} {stats[kind]['entries']:>8} entries"
+            + f" {size(stats[kind]['bytes'], system=alternative):>8}"
+        )
+    click.echo(
+        f"  {'total':<8} {stats['entries']:>8} entries"
+        + f" {size(stats['bytes'], system=alternative):>8}"
+        + f" ({size(stats['disk'], system=alternative)} on disk)"
+    )
+    click.echo(
+        f"  lookups  {stats['hits']} hits, {stats['misses']} misses"
+        + (
+            f" ({stats['hit-rate']:.1%} hit rate)"
+            if stats["hit-rate"] is not None else ""
+        )
+    )
+    if stats["oldest"] is not None:
+        click.echo(
+            "  written  "
+            + f"{datetime.fromtimestamp(stats['oldest']):%Y-%m-%d %H:%M} to"
+            + f" {datetime.fromtimestamp(stats['newest']):%Y-%m-%d %H:%M}"
+        )
+
+
+@cache_group.command("prune")
+@_cache_option
+@click.option(
+    "--max-size",
+    type=SizeType(),
+    help="Evict entries until the cache is smaller than this size, in bytes"
+    + " or with a K, M or G suffix."
+)
+@click.option(
+    "--max-age",
+    type=AgeType(),
+    help="Evict entries older than this, in seconds or with an s, m, h or d"
+    + " suffix."
+)
+@click.option(
+    "--eviction",
+    default=DEFAULTS["eviction"],
+    show_default=True,
+    type=click.Choice(("lru", "oldest")),
+    help="Eviction order: least recently used or oldest first. Ages are"
+    + " measured since the last use or since the entry was written."
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Also release the freed space on disk."
+)
+def cache_prune(
+    cache: str,
+    max_size: int | None,
+    max_age: float | None,
+    eviction: str,
+    compact: bool
+):
+    """Evict cache entries to fit a budget.
+
+    Evicted entries are downloaded again by the next run that needs them.
+    Table indexes of incremental runs are kept.
+    """
+    if max_size is None and max_age is None:
+        raise click.BadParameter("--max-size or --max-age is required.")
+
+    from hurry.filesize import alternative, size
+
+    from ..tools.cache import Cache
+
+    instance = Cache(cache)
+    try:
+        count, freed = instance.prune(max_size, max_age, eviction)
+        click.echo(
+            f"Evicted {count} entries ({size(freed, system=alternative)})."
+        )
+        if compact:
+            before, after = instance.compact()
+            click.echo(
+                f"Compacted {size(before, system=alternative)} to"
+                + f" {size(after, system=alternative)}."
+            )
+    finally:
+        instance.close()
+
+
+@cache_group.command("compact")
+@_cache_option
+def cache_compact(cache: str):
+    """Release unused space of the cache file.
+
+    Space freed by evicted or replaced entries is only returned to the
+    filesystem by compaction.
+    """
+    from hurry.filesize import alternative, size
+
+    from ..tools.cache import Cache
+
+    instance = Cache(cache)
+    try:
+        before, after = instance.compact()
+    finally:
+        instance.close()
+
+    click.echo(
+        f"Compacted {size(before, system=alternative)} to"
+        + f" {size(after, system=alternative)}."
+    )
+
+
+@cache_group.command("verify")
+@_cache_option
+@click.option(
+    "--repair",
+    is_flag=True,
+    help="Delete entries that cannot be loaded."
+)
+def cache_verify(cache: str, repair: bool):
+    """Check that every cache entry can be loaded.
+
+    Exits with status 1 if unreadable entries are found and not repaired.
+    """
+    from ..tools.cache import Cache
+
+    instance = Cache(cache)
+    try:
+        unreadable = instance.verify(repair)
+    finally:
+        instance.close()
+
+    for key in unreadable:
+        click.echo(f"Unreadable: {key}")
+
+    if not unreadable:
+        click.echo("Every entry can be loaded.")
+    elif repair:
+        click.echo(f"Deleted {len(unreadable)} unreadable entries.")
+    else:
+        raise SystemExit(1)
@@ -0,0 +1,9 @@
+"""Airfoil geometry package.
+
+This package contains parsing and storage utilities for airfoil contours.
+It requires NumPy, which can be installed along with the package through the
+`geometry` extra.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
@@ -0,0 +1,42 @@
+"""Airfoil contour parsing module.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import numpy as np
+
+
+def parse_selig(text: str) -> np.ndarray:
+    """Parse a Selig format airfoil contour.
+
+    The first line holds the airfoil name and every following line holds an
+    x-y coordinate pair, running from the trailing edge over the upper
+    surface to the leading edge and back along the lower surface.
+
+    Args:
+        text (str): Selig format contour.
+
+    Returns:
+        np.ndarray: (N, 2) array of x-y coordinates.
+    """
+    _, _, body = text.partition("\n")
+
+    try:
+        values = np.array(body.split(), dtype=np.float64)
+    except ValueError:
+        values = None
+
+    if values is None or values.size % 2:
+        # Slow path for contours with comments or malformed lines:
+        points = []
+        for line in body.splitlines():
+            fields = line.split()
+            try:
+                points.append((float(fields[0]), float(fields[1])))
+            except (IndexError, ValueError):
+                continue
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    return values.reshape(-1, 2)
@@ -0,0 +1,289 @@
+"""Binary contour dataset module.
+
+A dataset is a directory with three files:
+
+- `coordinates.bin`: every contour's x-y coordinates, one after the other,
+  as a contiguous (P, 2) array.
+- `offsets.bin`: (N + 1) array of row offsets, so that contour `i` is
+  `coordinates[offsets[i]:offsets[i + 1]]`.
+- `metadata.json`: data types, sizes and one column per metadata field
+  (airfoil ID, name, family...), in contour order.
+
+Both binary files are opened with `numpy.memmap`, so contours are only read
+from disk when accessed and never copied. Datasets are written to temporary
+files that only replace the previous ones once complete, so an interrupted
+export leaves the previous dataset intact.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import json
+import os
+from typing import Any, Iterator
+
+import numpy as np
+
+from .contour import parse_selig
+
+
+class DatasetWriter:
+    """Streaming binary contour dataset writer class.
+
+    Attributes:
+        path (str): dataset directory path.
+        count (int): number of written contours.
+        points (int): number of written coordinate pairs.
+        COORDINATES (str): coordinates file name.
+        OFFSETS (str): offsets file name.
+        METADATA (str): metadata file name.
+        DTYPE (str): coordinates data type.
+        OFFSETS_DTYPE (str): offsets data type.
+        SUFFIX (str): temporary file name suffix.
+    """
+
+    COORDINATES = "coordinates.bin"
+    OFFSETS = "offsets.bin"
+    METADATA = "metadata.json"
+    DTYPE = "<f8"
+    OFFSETS_DTYPE = "<i8"
+    SUFFIX = ".tmp"
+
+    def __init__(self, path: str) -> None:
+        """Initialize a DatasetWriter instance.
+
+        Args:
+            path (str): dataset directory path.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.count = 0
+        self.points = 0
+        self._offsets = [0]
+        self._columns: dict[str, list[Any]] = {"id": []}
+        self._fp = open(self._file(self.COORDINATES) + self.SUFFIX, "wb")
+
+    def _file(self, name: str) -> str:
+        """Get the path of a dataset file.
+
+        Args:
+            name (str): file name.
+
+        Returns:
+            str: file path.
+        """
+        return os.path.join(self.path, name)
+
+    def write(
+        self,
+        key: str,
+        contour: np.ndarray,
+        metadata: dict[str, Any] | None = None
+    ) -> None:
+        """Append a contour to the dataset.
+
+        Args:
+            key (str): airfoil ID.
+            contour (np.ndarray): (N, 2) array of x-y coordinates.
+            metadata (dict[str, Any] | None): JSON-serializable metadata
+                fields. Defaults to None.
+        """
+        contour = np.ascontiguousarray(contour, dtype=self.DTYPE)
+        self._fp.write(contour.tobytes())
+
+        self.points += len(contour)
+        self._offsets.append(self.points)
+
+        # Keep every column aligned with the contour index:
+        self._columns["id"].append(key)
+        for field, value in (metadata or {}).items():
+            column = self._columns.setdefault(field, [None] * self.count)
+            column.append(value)
+        for column in self._columns.values():
+            if len(column) == self.count:
+                column.append(None)
+
+        self.count += 1
+
+    def write_record(self, key: str, record: dict[str, Any]) -> bool:
+        """Append a scraped record's contour to the dataset.
+
+        Args:
+            key (str): airfoil ID.
+            record (dict[str, Any]): scraped airfoil data.
+
+        Returns:
+            bool: True if the record had a contour to write.
+        """
+        if not isinstance(record.get("dat"), str) or not record["dat"]:
+            return False
+
+        contour = parse_selig(record["dat"])
+        if not len(contour):
+            return False
+
+        optimizations = record.get("optimizations", {})
+        self.write(key, contour, {
+            "name": record.get("name"),
+            "family": record.get("family"),
+            "thickness": optimizations.get("thickness"),
+            "x-thickness": optimizations.get("x-thickness"),
+            "camber": optimizations.get("camber")
+        })
+        return True
+
+    def extend(self, dataset: "Dataset") -> None:
+        """Append every contour of another dataset.
+
+        Args:
+            dataset (Dataset): source dataset.
+        """
+        fields = [field for field in dataset.columns if field != "id"]
+        for index, (key, contour) in enumerate(dataset):
+            self.write(key, contour, {
+                field: dataset.columns[field][index] for field in fields
+            })
+
+    def close(self) -> None:
+        """Write offsets and metadata and replace the previous dataset."""
+        if self._fp.closed:
+            return
+
+        self._fp.close()
+        np.asarray(self._offsets, dtype=self.OFFSETS_DTYPE).tofile(
+            self._file(self.OFFSETS) + self.SUFFIX
+        )
+
+        with open(self._file(self.METADATA) + self.SUFFIX, "w") as fp:
+            json.dump({
+                "version": 1,
+                "dtype": self.DTYPE,
+                "offsets-dtype": self.OFFSETS_DTYPE,
+                "count": self.count,
+                "points": self.points,
+                "columns": self._columns
+            }, fp)
+
+        # Metadata goes last, as it defines the shape of the binary files:
+        for name in (self.COORDINATES, self.OFFSETS, self.METADATA):
+            os.replace(self._file(name) + self.SUFFIX, self._file(name))
+
+    def discard(self) -> None:
+        """Delete the written files, keeping the previous dataset."""
+        self._fp.close()
+        for name in (self.COORDINATES, self.OFFSETS, self.METADATA):
+            if os.path.exists(self._file(name) + self.SUFFIX):
+                os.remove(self._file(name) + self.SUFFIX)
+
+    def __enter__(self) -> "DatasetWriter":
+        """Enter the writer context.
+
+        Returns:
+            DatasetWriter: writer instance.
+        """
+        return self
+
+    def __exit__(self, exc_type: type | None, *args: Any) -> None:
+        """Exit the writer context, closing the dataset.
+
+        Args:
+            exc_type (type | None): raised exception type, if any. Datasets
+                are discarded if an exception was raised.
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class Dataset:
+    """Memory-mapped binary contour dataset class.
+
+    Attributes:
+        path (str): dataset directory path.
+        coordinates (np.memmap): (P, 2) array of all contour coordinates.
+        offsets (np.memmap): (N + 1) array of contour row offsets.
+        columns (dict[str, list[Any]]): metadata columns.
+        ids (list[str]): airfoil IDs, in contour order.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open a dataset.
+
+        Args:
+            path (str): dataset directory path.
+        """
+        with open(os.path.join(path, DatasetWriter.METADATA)) as fp:
+            header = json.load(fp)
+
+        self.path = path
+        self.columns: dict[str, list[Any]] = header["columns"]
+        self.ids: list[str] = self.columns["id"]
+        self._index = {key: index for index, key in enumerate(self.ids)}
+
+        self.offsets = np.memmap(
+            os.path.join(path, DatasetWriter.OFFSETS),
+            dtype=header["offsets-dtype"],
+            mode="r",
+            shape=(header["count"] + 1,)
+        )
+        # Zero-sized memory maps are not supported:
+        self.coordinates = np.memmap(
+            os.path.join(path, DatasetWriter.COORDINATES),
+            dtype=header["dtype"],
+            mode="r",
+            shape=(header["points"], 2)
+        ) if header["points"] else np.empty((0, 2), dtype=header["dtype"])
+
+    def contour(self, index: int) -> np.ndarray:
+        """Get a contour by position.
+
+        Args:
+            index (int): contour position.
+
+        Returns:
+            np.ndarray: (N, 2) view of the contour coordinates.
+        """
+        return self.coordinates[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, key: str | int) -> np.ndarray:
+        """Get a contour by airfoil ID or position.
+
+        Args:
+            key (str | int): airfoil ID or contour position.
+
+        Returns:
+            np.ndarray: (N, 2) view of the contour coordinates.
+        """
+        return self.contour(self._index[key] if isinstance(key, str) else key)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether an airfoil is in the dataset.
+
+        Args:
+            key (str): airfoil ID.
+
+        Returns:
+            bool: True if the airfoil is in the dataset.
+        """
+        return key in self._index
+
+    def __len__(self) -> int:
+        """Get the number of contours.
+
+        Returns:
+            int: number of contours.
+        """
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[tuple[str, np.ndarray]]:
+        """Iterate over airfoil IDs and contours.
+
+        Returns:
+            Iterator[tuple[str, np.ndarray]]: ID and contour pairs.
+        """
+        return (
+            (key, self.contour(index)) for index, key in enumerate(self.ids)
+        )
@@ -0,0 +1,241 @@
+"""Batch airfoil geometry metrics module.
+
+Every contour is normalized to unit chord and its surfaces are resampled to
+a common cosine-spaced chordwise grid, so that shape metrics are computed
+for the whole catalogue at once with array operations.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import os
+
+import numpy as np
+
+from .dataset import Dataset
+
+# Table fields checked against the computed geometry:
+CHECKED = ("thickness", "x-thickness", "camber")
+METRICS = "metrics.npz"
+
+
+def grid(points: int = 201) -> np.ndarray:
+    """Get a cosine-spaced chordwise grid, refined at both edges.
+
+    Args:
+        points (int): number of grid points. Defaults to 201.
+
+    Returns:
+        np.ndarray: chordwise positions from 0 to 1.
+    """
+    return (1 - np.cos(np.linspace(0, np.pi, points))) / 2
+
+
+def _resample(
+    keys: np.ndarray,
+    values: np.ndarray,
+    count: int,
+    x: np.ndarray
+) -> np.ndarray:
+    """Linearly interpolate every segment of a flat array on a common grid.
+
+    Segment `i` spans keys in [2i, 2i + 1], so a single sorted array and a
+    single binary search serve all segments at once.
+
+    Args:
+        keys (np.ndarray): segment offset plus normalized x of each point.
+        values (np.ndarray): y of each point.
+        count (int): number of segments.
+        x (np.ndarray): chordwise grid.
+
+    Returns:
+        np.ndarray: (count, len(x)) resampled values, NaN for segments with
+            fewer than two points.
+    """
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+
+    base = 2.0 * np.arange(count)
+    start = np.searchsorted(keys, base, side="left")
+    end = np.searchsorted(keys, base + 1.5, side="left")
+
+    queries = base[:, None] + x[None, :]
+    position = np.searchsorted(keys, queries.ravel()).reshape(queries.shape)
+    position = np.clip(
+        position, (start + 1)[:, None], np.maximum(end - 1, start + 1)[:, None]
+    )
+    position = np.minimum(position, len(keys) - 1)
+
+    x0, x1 = keys[position - 1], keys[position]
+    y0, y1 = values[position - 1], values[position]
+    span = np.where(x1 > x0, x1 - x0, 1.0)
+    weight = np.clip((queries - x0) / span, 0.0, 1.0)
+
+    result = y0 + weight * (y1 - y0)
+    result[end - start < 2] = np.nan
+    return result
+
+
+def compute(
+    coordinates: np.ndarray,
+    offsets: np.ndarray,
+    points: int = 201
+) -> dict[str, np.ndarray]:
+    """Compute shape metrics for a batch of contours.
+
+    Contours are expected in Selig order (trailing edge, upper surface,
+    leading edge, lower surface, trailing edge). Their leading edge is the
+    point of minimum x.
+
+    Args:
+        coordinates (np.ndarray): (P, 2) array of all contour coordinates.
+        offsets (np.ndarray): (N + 1) array of contour row offsets.
+        points (int): number of chordwise grid points. Defaults to 201.
+
+    Returns:
+        dict[str, np.ndarray]: one array of N values per metric: thickness,
+            x-thickness, camber, x-camber, le-radius and te-gap, all relative
+            to the chord.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    count = len(counts)
+    if not count:
+        return {key: np.empty(0) for key in (
+            "thickness", "x-thickness", "camber", "x-camber", "le-radius",
+            "te-gap"
+        )}
+
+    valid = counts > 0
+    starts = np.minimum(offsets[:-1], max(len(coordinates) - 1, 0))
+    index = np.repeat(np.arange(count), counts)
+    local = np.arange(len(coordinates)) - offsets[:-1][index]
+    x, y = coordinates[:, 0], coordinates[:, 1]
+
+    # Leading edge (first point of minimum x) and chord of every contour:
+    x_min = np.full(count, np.nan)
+    x_max = np.full(count, np.nan)
+    x_min[valid] = np.minimum.reduceat(x, starts[valid])
+    x_max[valid] = np.maximum.reduceat(x, starts[valid])
+    chord = np.where(x_max > x_min, x_max - x_min, np.nan)
+
+    candidates = np.flatnonzero(x == x_min[index])
+    _, first = np.unique(index[candidates], return_index=True)
+    leading = np.zeros(count, dtype=np.int64)
+    leading[valid] = local[candidates[first]]
+    y_le = np.zeros(count)
+    y_le[valid] = y[offsets[:-1][valid] + leading[valid]]
+
+    xn = (x - x_min[index]) / chord[index]
+    yn = (y - y_le[index]) / chord[index]
+    keys = 2.0 * index + xn
+
+    x_grid = grid(points)
+    upper = local <= leading[index]
+    lower = local >= leading[index]
+    y_upper = _resample(keys[upper], yn[upper], count, x_grid)
+    y_lower = _resample(keys[lower], yn[lower], count, x_grid)
+
+    thickness = y_upper - y_lower
+    camber = (y_upper + y_lower) / 2
+    invalid = np.isnan(thickness).all(axis=1)
+    thickness[invalid] = camber[invalid] = 0.0
+
+    t_index = np.nanargmax(np.nan_to_num(thickness, nan=-np.inf), axis=1)
+    c_index = np.nanargmax(np.abs(np.nan_to_num(camber)), axis=1)
+    rows = np.arange(count)
+
+    # Leading edge radius from the half-thickness of a parabolic nose,
+    # h(x) = sqrt(2 r x), averaged over the first percent of chord:
+    nose = (x_grid > 0) & (x_grid <= 0.01)
+    le_radius = np.nanmean(
+        (thickness[:, nose] / 2) ** 2 / (2 * x_grid[nose]), axis=1
+    )
+
+    last = offsets[1:] - 1
+    te_gap = np.hypot(
+        x[starts] - x[np.maximum(last, 0)],
+        y[starts] - y[np.maximum(last, 0)]
+    ) / chord
+
+    metrics = {
+        "thickness": thickness[rows, t_index],
+        "x-thickness": x_grid[t_index],
+        "camber": camber[rows, c_index],
+        "x-camber": x_grid[c_index],
+        "le-radius": le_radius,
+        "te-gap": te_gap
+    }
+    for values in metrics.values():
+        values[invalid | ~valid] = np.nan
+
+    return metrics
+
+
+def compare(
+    metrics: dict[str, np.ndarray],
+    table: dict[str, list[float | None]],
+    tolerance: float = 0.01
+) -> np.ndarray:
+    """Flag contours whose metrics disagree with the table values.
+
+    Table values are percentages of chord, whatever their magnitude.
+
+    Args:
+        metrics (dict[str, np.ndarray]): computed metrics.
+        table (dict[str, list[float | None]]): table values per field, in
+            contour order. Missing fields and None values are not checked.
+        tolerance (float): maximum absolute difference, relative to the
+            chord. Defaults to 0.01.
+
+    Returns:
+        np.ndarray: (N, len(CHECKED)) boolean array, True where the metric
+            disagrees with the table, with columns in CHECKED order.
+    """
+    count = len(next(iter(metrics.values())))
+    flags = np.zeros((count, len(CHECKED)), dtype=bool)
+
+    for column, field in enumerate(CHECKED):
+        if field not in table:
+            continue
+
+        expected = np.array(
+            [np.nan if value is None else value for value in table[field]],
+            dtype=np.float64
+        ) / 100
+        computed = metrics[field]
+        if field == "camber":
+            computed, expected = np.abs(computed), np.abs(expected)
+
+        # Comparisons with NaN are False, so missing values are not flagged:
+        flags[:, column] = np.abs(computed - expected) > tolerance
+
+    return flags
+
+
+def analyze(
+    dataset: Dataset,
+    points: int = 201,
+    tolerance: float = 0.01
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Compute, check and store the shape metrics of a contour dataset.
+
+    Results are saved to the dataset directory as `metrics.npz`, with one
+    array per metric plus the `flags` array returned by `compare`.
+
+    Args:
+        dataset (Dataset): contour dataset.
+        points (int): number of chordwise grid points. Defaults to 201.
+        tolerance (float): maximum absolute difference with the table
+            values, relative to the chord. Defaults to 0.01.
+
+    Returns:
+        tuple[dict[str, np.ndarray], np.ndarray]: computed metrics and
+            disagreement flags.
+    """
+    metrics = compute(dataset.coordinates, dataset.offsets, points)
+    flags = compare(metrics, dataset.columns, tolerance)
+
+    np.savez(os.path.join(dataset.path, METRICS), flags=flags, **metrics)
+    return metrics, flags
@@ -9,7 +9,13 @@ Author:
 
 
 import asyncio
-from typing import Any
+import json
+import os
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import replace
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
 
 import aiohttp
 import regex as re
@@ -17,6 +23,14 @@ from colorama import Fore, Style
 from tqdm.asyncio import tqdm_asyncio
 
 from ..tools.cache import Cache
+from ..tools.files import ContentWriter
+from ..tools.metrics import MetricsRegistry
+from .html import LinksParser
+from .records import Record
+from .retry import CircuitBreaker, CircuitOpen, Failed, Retry, RetryPolicy
+from .scheduler import (AdaptiveLimiter, HostLimiter, SingleFlight,
+                        WorkerPool)
+from .table import TableParser
 
 
 class AsyncScraper:
@@ -28,21 +42,48 @@ class AsyncScraper:
         timeout (int): timeout for each request.
         limit (int): maximum number of concurrent requests.
         progress_bar (bool): whether to display a progress bar.
+        hosts (HostLimiter): per-host concurrency limiter.
+        retry (RetryPolicy): retry policy.
+        breaker (CircuitBreaker): per-host circuit breaker.
+        limiter (AdaptiveLimiter | None): adaptive concurrency controller.
+        registry (MetricsRegistry): metrics registry.
+        flights (SingleFlight): request coalescer, shared by the stages
+            that fetch the same URLs.
+        retried (dict[str, int]): URLs that succeeded after being retried,
+            along with their number of retries.
         REGEX_FLAGS (int): regex flags.
-        BASE_URL (str): base site URL.
-        TABLE_URL (str): data table URL.
+        CHUNK_SIZE (int): response streaming chunk size, in bytes.
+        DRAIN_LIMIT (int): maximum number of unread response bytes that are
+            drained to keep the connection reusable.
+        BAR_FORMAT (str): progress bar format.
     """
 
     REGEX_FLAGS = re.IGNORECASE | re.DOTALL
-    BASE_URL = "https://bigfoil.com"
-    TABLE_URL = f"{BASE_URL}/bigtable1.json"
+
+    CHUNK_SIZE = 4096
+    DRAIN_LIMIT = 64 * 1024
+    BAR_FORMAT = (
+        Style.BRIGHT + Fore.YELLOW
+        + ":: {percentage:3.0f}% :: "
+        + Style.RESET_ALL
+        + "{bar}"
+        + Style.BRIGHT + Fore.YELLOW
+        + " (ETA: {remaining}) "
+    )
 
     def __init__(
         self,
         cache: Cache,
         timeout: int,
         limit: int,
-        progress_bar: bool = True
+        progress_bar: bool = True,
+        session: aiohttp.ClientSession | None = None,
+        hosts: HostLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        registry: MetricsRegistry | None = None,
+        flights: SingleFlight | None = None
     ) -> None:
         """Initialize an AsyncScraper instance.
 
@@ -52,15 +93,102 @@ class AsyncScraper:
             limit (int): maximum number of concurrent requests.
             progress_bar (bool): whether to display a progress bar. Defaults
                 to True.
+            session (aiohttp.ClientSession | None): shared session to use.
+                If None, a session owned by the scraper is opened on each
+                `scrape` call. Defaults to None.
+            hosts (HostLimiter | None): per-host concurrency limiter.
+                Defaults to None (no per-host limits).
+            retry (RetryPolicy | None): retry policy. Defaults to None (the
+                default RetryPolicy).
+            breaker (CircuitBreaker | None): per-host circuit breaker.
+                Defaults to None (the default CircuitBreaker).
+            limiter (AdaptiveLimiter | None): adaptive concurrency
+                controller. If given, `limit` is the maximum number of
+                concurrent requests. Defaults to None.
+            registry (MetricsRegistry | None): metrics registry. Defaults to
+                None (a registry owned by the scraper).
+            flights (SingleFlight | None): request coalescer. Defaults to
+                None (a coalescer owned by the scraper).
         """
         self.cache = cache
+        self.timeout = timeout
+        self.limit = limit
         self.progress_bar = progress_bar
+        self.hosts = hosts if hosts is not None else HostLimiter()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.limiter = limiter
+        self.registry = registry if registry is not None \
+            else MetricsRegistry()
+        self.flights = flights if flights is not None else SingleFlight()
         self._failed: dict[str, list[str]] = {}
-        self._session = aiohttp.ClientSession(
+        self._attempts: dict[str, int] = {}
+        self._retried: dict[str, int] = {}
+        self._session = session
+
+    @staticmethod
+    def create_session(
+        timeout: int,
+        limit: int,
+        registry: MetricsRegistry | None = None
+    ) -> aiohttp.ClientSession:
+        """Create an aiohttp session with a bounded connection pool.
+
+        Must be called from within a running event loop.
+
+        Args:
+            timeout (int): timeout for each request.
+            limit (int): maximum number of concurrent requests.
+            registry (MetricsRegistry | None): registry to record request
+                metrics in. Defaults to None (no request metrics).
+
+        Returns:
+            aiohttp.ClientSession: aiohttp session.
+        """
+        return aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=timeout),
-            connector=aiohttp.TCPConnector(limit=limit)
+            connector=aiohttp.TCPConnector(limit=limit),
+            trace_configs=[registry.trace_config()] if registry else None
         )
 
+    @staticmethod
+    def report(
+        failed: dict[str, list[str]],
+        retried: dict[str, int] | None = None
+    ) -> None:
+        """Print retried URLs count and failed URLs grouped by error type.
+
+        Args:
+            failed (dict[str, list[str]]): failed URLs.
+            retried (dict[str, int] | None): URLs that succeeded after being
+                retried. Defaults to None.
+        """
+        if retried:
+            print(
+                f"{Style.BRIGHT}{Fore.YELLOW}WARNING: {len(retried)} URLs "
+                + f"were scraped after {sum(retried.values())} retries."
+                + Style.RESET_ALL
+            )
+
+        if not failed:
+            return
+
+        print(
+            f"{Style.BRIGHT}{Fore.RED}ERROR: "
+            + f"{sum(len(value) for value in failed.values())} "
+            + f"URLs could not be scraped due to {len(failed)} "
+            + f"error types:{Style.RESET_ALL}"
+        )
+
+        print("\n".join(
+            f"{Fore.RED}{Style.BRIGHT}> {exception}:\n"
+            + Style.RESET_ALL + "\n".join(
+                f"{Fore.YELLOW}{' ' * 2}> {url}{Style.RESET_ALL}"
+                for url in urls
+            )
+            for exception, urls in failed.items()
+        ) + "\n")
+
     @property
     def progress_bar(self) -> bool:
         """Get progress bar flag.
@@ -113,14 +241,233 @@ class AsyncScraper:
         return self._failed
 
     @property
-    def session(self) -> aiohttp.ClientSession:
+    def retried(self) -> dict[str, int]:
+        """Get URLs that succeeded after being retried.
+
+        Returns:
+            dict[str, int]: retried URLs and their number of retries.
+        """
+        return self._retried
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
         """Get aiohttp session.
 
         Returns:
-            aiohttp.ClientSession: aiohttp session.
+            aiohttp.ClientSession | None: aiohttp session, if open.
         """
         return self._session
 
+    def _fail(self, exc: Exception, url: str) -> None:
+        """Register a failed URL.
+
+        Args:
+            exc (Exception): raised exception.
+            url (str): failed URL.
+        """
+        self._failed.setdefault(exc.__class__.__name__, []).append(url)
+
+    def _handle_error(self, exc: Exception, url: str) -> None:
+        """Schedule a failed URL for retrying or register it as failed.
+
+        Requests rejected by an open circuit are retried once the circuit
+        allows them, without counting as attempts, until as many probes to
+        their host as retries have failed.
+
+        Args:
+            exc (Exception): raised exception.
+            url (str): failed URL.
+
+        Raises:
+            Retry: if the URL should be requested again.
+        """
+        if not self.retry.is_retryable(exc):
+            self._attempts.pop(url, None)
+            self._fail(exc, url)
+            return
+
+        # No request was sent, so the rejection does not use up a retry:
+        if isinstance(exc, CircuitOpen):
+            if exc.probes > self.retry.retries:
+                self._attempts.pop(url, None)
+                self._fail(exc, url)
+                return
+
+            raise Retry(self.retry.delay(self._attempts.get(url, 0), exc))
+
+        self.breaker.failure(url)
+        attempt = self._attempts.get(url, 0) + 1
+        if attempt > self.retry.retries:
+            self._attempts.pop(url, None)
+            self._fail(exc, url)
+            return
+
+        self._attempts[url] = attempt
+        raise Retry(self.retry.delay(attempt, exc))
+
+    @asynccontextmanager
+    async def _request(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Perform a GET request within the URL's host concurrency slot.
+
+        Args:
+            url (str): request URL.
+            headers (dict[str, str] | None): request headers. Defaults to
+                None.
+
+        Raises:
+            CircuitOpen: if the URL's host circuit is open.
+            aiohttp.ClientResponseError: if the response status is an error.
+
+        Yields:
+            aiohttp.ClientResponse: response object.
+        """
+        self.breaker.check(url)
+
+        try:
+            async with (
+                self.limiter.slot() if self.limiter is not None
+                else nullcontext()
+            ), self.hosts.slot(url):
+                async with self._session.get(
+                    url=url,
+                    headers=headers
+                ) as response:
+                    if response.status not in self.retry.STATUSES:
+                        self.breaker.success(url)
+                    response.raise_for_status()
+                    try:
+                        with self.registry.histogram(
+                            "bfscraper_request_body_seconds",
+                            "Response body handling time."
+                        ).time(host=response.url.host):
+                            yield response
+                    finally:
+                        self.registry.counter(
+                            "bfscraper_response_bytes_total",
+                            "Received response body bytes."
+                        ).inc(
+                            response.content.total_bytes,
+                            host=response.url.host
+                        )
+        finally:
+            self.breaker.release(url)
+
+        if url in self._attempts:
+            self._retried[url] = self._attempts.pop(url)
+
+    async def _coalesce(
+        self,
+        url: str,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """Fetch a URL once, however many entries request it.
+
+        Concurrent fetches of the same URL by the same stage share a single
+        request, and completed fetches are reused by later entries. Failures
+        are handled once, by the call that sent the request: the entries
+        that shared it are retried along with it, without using up retries,
+        or fail along with it.
+
+        Args:
+            url (str): request URL.
+            fetch (Callable[[], Awaitable[Any]]): URL fetching coroutine
+                function.
+
+        Raises:
+            Retry: if the URL should be requested again.
+            Failed: if the URL has failed for good.
+
+        Returns:
+            tuple[Any, bool]: fetched value, and whether this call fetched
+                it (rather than another entry's call).
+        """
+        fetched = False
+
+        async def attempt() -> Any:
+            nonlocal fetched
+            fetched = True
+            try:
+                return await fetch()
+            except Exception as exc:
+                self._handle_error(exc, url)
+                raise Failed(url) from exc
+
+        return await self.flights.do(
+            (self.__class__.__name__, url), attempt
+        ), fetched
+
+    @staticmethod
+    def _outdated(value: Any, cached: Any, fetched: bool) -> bool:
+        """Check whether an entry's cached value must be updated.
+
+        Entries served by another entry's fetch are not cached, as they cost
+        nothing to fetch again along with it, unless they have an outdated
+        cached value that would otherwise be revalidated as current.
+
+        Args:
+            value (Any): fetched value.
+            cached (Any): cached value, or None.
+            fetched (bool): whether the entry fetched the value itself.
+
+        Returns:
+            bool: True if the cached value must be updated.
+        """
+        return value != cached and (fetched or cached is not None)
+
+    async def _drain(self, response: aiohttp.ClientResponse) -> None:
+        """Discard the unread part of a response if it is small.
+
+        Fully read responses return their connection to the pool, while
+        partially read ones close it. Draining a few kilobytes is cheaper
+        than opening a new connection, but not so for larger leftovers.
+
+        Args:
+            response (aiohttp.ClientResponse): response object.
+        """
+        remaining = (response.content_length or 0) \
+            - response.content.total_bytes
+        if response.content_length is None or remaining > self.DRAIN_LIMIT:
+            return
+
+        while await response.content.read(self.CHUNK_SIZE):
+            pass
+
+    async def _revalidation(
+        self,
+        url: str,
+        cached: bool
+    ) -> dict[str, str] | None:
+        """Decide how to refresh a URL whose data may be cached.
+
+        Args:
+            url (str): request URL.
+            cached (bool): whether the URL's data is cached.
+
+        Returns:
+            dict[str, str] | None: None if the cached data is still fresh,
+                otherwise the headers to request the URL with (conditional
+                if validators are known).
+        """
+        lookups = self.registry.counter(
+            "bfscraper_cache_lookups_total",
+            "Cache lookups, by result (hit, stale or miss)."
+        )
+        if not cached:
+            lookups.inc(result="miss")
+            return {}
+
+        metadata = await self.cache.call(self.cache.metadata, url)
+        if self.cache.is_fresh(metadata):
+            lookups.inc(result="hit")
+            return None
+
+        lookups.inc(result="stale")
+        return self.cache.conditional_headers(metadata)
+
     async def _process(self, entry: Any, collection: Any) -> None:
         """Individual asynchronous process.
 
@@ -130,46 +477,53 @@ class AsyncScraper:
         """
         pass
 
-    async def _gather(self, collection: Any) -> None:
-        """Asyncio gather wrapper.
+    async def _gather(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | None = None
+    ) -> None:
+        """Process entries with a bounded pool of workers.
 
         Args:
             collection (Any): collection to be processed.
+            entries (Iterable[Any] | None): entries of the collection to
+                process, possibly a generator. Defaults to all of them.
         """
-        async with self._session as _:
-            await tqdm_asyncio.gather(
-                *[self._process(item, collection) for item in collection],
+        entries = collection if entries is None else entries
+        owned = self._session is None
+        if owned:
+            self._session = self.create_session(
+                self.timeout, self.limit, self.registry
+            )
+
+        try:
+            with tqdm_asyncio(
+                total=len(entries) if hasattr(entries, "__len__") else None,
                 disable=not self._progress_bar,
                 smoothing=0.01,
                 colour="YELLOW",
-                bar_format=(
-                    Style.BRIGHT + Fore.YELLOW
-                    + ":: {percentage:3.0f}% :: "
-                    + Style.RESET_ALL
-                    + "{bar}"
-                    + Style.BRIGHT + Fore.YELLOW
-                    + " (ETA: {remaining}) "
+                bar_format=self.BAR_FORMAT
+            ) as progress:
+                await WorkerPool(
+                    workers=self.limit,
+                    on_error=lambda entry, exc: self._fail(exc, str(entry))
+                ).run(
+                    entries,
+                    lambda entry: self._process(entry, collection),
+                    progress
                 )
-            )
+        finally:
+            if owned:
+                await self._session.close()
+                self._session = None
 
-            if self._failed:
-                print(
-                    f"{Style.BRIGHT}{Fore.RED}ERROR: "
-                    + f"{sum(len(value) for value in self._failed.values())} "
-                    + f"URLs could not be scraped due to {len(self._failed)} "
-                    + f"error types:{Style.RESET_ALL}"
-                )
-
-                print("\n".join(
-                    f"{Fore.RED}{Style.BRIGHT}> {exception}:\n"
-                    + Style.RESET_ALL + "\n".join(
-                        f"{Fore.YELLOW}{' ' * 2}> {url}{Style.RESET_ALL}"
-                        for url in urls
-                    )
-                    for exception, urls in self._failed.items()
-                ) + "\n")
+        self.report(self._failed, self._retried)
 
-    def scrape(self, collection: Any) -> None:
+    def scrape(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | None = None
+    ) -> None:
         """Scrape URLs asynchronously.
 
         This method contains the asyncio event loop that runs the asynchronous
@@ -177,13 +531,20 @@ class AsyncScraper:
 
         Args:
             collection (Any): collection to be processed.
+            entries (Iterable[Any] | None): entries of the collection to
+                process, possibly a generator. Defaults to all of them.
         """
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._gather(collection=collection))
+        asyncio.run(self._gather(collection=collection, entries=entries))
 
 
 class DownloadLinksExtractor(AsyncScraper):
-    """Download links extractor class."""
+    """Download links extractor class.
+
+    Links are resolved against the site of the download links page, so the
+    extractor serves every source with the same page layout. Entries whose
+    download links are already known, such as those of a resumed run, are
+    not processed again.
+    """
 
     async def _process(self, entry: Any, collection: Any) -> None:
         """Individual asynchronous process.
@@ -192,46 +553,91 @@ class DownloadLinksExtractor(AsyncScraper):
             entry (Any): data entry.
             collection (Any): collection to be processed.
         """
-        data_target = "files"
+        record = collection[entry]
 
         # Prevent errors in case the download links are not available:
-        if not collection[entry]["links"].get(data_target):
+        if not record.page or record.download_links:
             return
 
-        url = collection[entry]["links"][data_target]
-
-        if self.cache.get(entry, {}).get("download-links"):
-            collection[entry]["download-links"] = self.cache.get(
-                entry
-            )["download-links"]
+        url = record.page
+        cached = Record.load(await self.cache.aget(entry))
+        previous = cached and cached.download_links or None
+        headers = await self._revalidation(url, previous is not None)
+        if headers is None:
+            record.download_links = previous
             return
 
         try:
-            async with self.session.get(url=url) as response:
-                data = re.findall(
-                    r"<\/div>(<b>.+?<br>)<br>",
-                    (await response.read()).decode("utf-8").replace("\n", ""),
-                    flags=AsyncScraper.REGEX_FLAGS
-                ).pop()
+            links, fetched = await self._coalesce(
+                url, lambda: self._fetch(url, headers, previous)
+            )
+        except Failed:
+            return
 
-                collection[entry]["download-links"].update({
-                    match.group(1).lower().replace(" ", "-").strip(":"):
-                        f"{AsyncScraper.BASE_URL}{match.group(2)}"
-                    for match in re.finditer(
-                        r"<b>(.+?)<\/b>.*?href=\"(.+?)\".*?<br>",
-                        data,
-                        flags=AsyncScraper.REGEX_FLAGS
-                    )
-                })
+        record.download_links.update(links)
+        if self._outdated(links, previous, fetched):
+            # Keep previously downloaded data, so it can be revalidated:
+            if cached is not None:
+                record = replace(
+                    record,
+                    dat=cached.dat,
+                    files=cached.files if cached.files is not None
+                    else record.files
+                )
+            await self.cache.aset(entry, record)
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        cached: dict[str, str] | None
+    ) -> dict[str, str]:
+        """Fetch and parse a download links page.
+
+        Args:
+            url (str): download links page URL.
+            headers (dict[str, str]): request headers.
+            cached (dict[str, str] | None): cached download links.
+
+        Returns:
+            dict[str, str]: download links, by format.
+        """
+        async with self._request(url, headers) as response:
+            await self.cache.call(
+                self.cache.set_metadata, url, response.headers
+            )
+            if response.status == 304:
+                return cached
+
+            site = urlsplit(url)
+            parser = LinksParser(f"{site.scheme}://{site.netloc}")
+            parsing = 0.0
+            async for chunk in response.content.iter_chunked(
+                self.CHUNK_SIZE
+            ):
+                start = perf_counter()
+                done = parser.feed(chunk)
+                parsing += perf_counter() - start
+                if done:
+                    break
+
+            self.registry.histogram(
+                "bfscraper_parse_seconds", "Response parsing time."
+            ).observe(parsing, stage="links")
 
-                self.cache.set(entry, collection[entry])
+            if not parser.done:
+                raise ValueError("Download links block not found.")
 
-        except Exception as exc:
-            self.failed.setdefault(exc.__class__.__name__, []).append(url)
+            await self._drain(response)
+            return parser.links
 
 
 class DownloadDataExtractor(AsyncScraper):
-    """Download data extractor class."""
+    """Download data extractor class.
+
+    Entries whose DAT file is already known, such as those of a resumed
+    run, are not processed again.
+    """
 
     async def _process(self, entry: Any, collection: Any) -> None:
         """Individual asynchronous process.
@@ -241,23 +647,331 @@ class DownloadDataExtractor(AsyncScraper):
             collection (Any): collection to be processed.
         """
         data_target = "selig-format-dat-file"
+        record = collection[entry]
 
         # Prevent errors in case the dat file download link is not available:
-        if not collection[entry]["download-links"].get(data_target):
+        if record.dat is not None or not record.download_links.get(
+            data_target
+        ):
             return
 
-        url = collection[entry]["download-links"][data_target]
-        if self.cache.get(entry, {}).get("dat"):
-            collection[entry]["dat"] = self.cache.get(entry)["dat"]
+        url = record.download_links[data_target]
+        cached = Record.load(await self.cache.aget(entry))
+        previous = cached and cached.dat or None
+        headers = await self._revalidation(url, previous is not None)
+        if headers is None:
+            record.dat = previous
             return
 
         try:
-            async with self.session.get(url=url) as response:
-                collection[entry]["dat"] = (
-                    await response.read()
-                ).decode("utf-8")
+            record.dat, fetched = await self._coalesce(
+                url, lambda: self._fetch(url, headers, previous)
+            )
+        except Failed:
+            return
+
+        if self._outdated(record.dat, previous, fetched):
+            await self.cache.aset(entry, record)
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        cached: str | None
+    ) -> str:
+        """Fetch a Selig Format DAT file.
+
+        Args:
+            url (str): DAT file URL.
+            headers (dict[str, str]): request headers.
+            cached (str | None): cached DAT file contents.
+
+        Returns:
+            str: DAT file contents.
+        """
+        async with self._request(url, headers) as response:
+            await self.cache.call(
+                self.cache.set_metadata, url, response.headers
+            )
+            if response.status == 304:
+                return cached
+
+            body = await response.read()
+            with self.registry.histogram(
+                "bfscraper_parse_seconds", "Response parsing time."
+            ).time(stage="dat"):
+                return body.decode("utf-8")
+
+
+class DownloadFilesExtractor(AsyncScraper):
+    """Download files extractor class.
 
-                self.cache.set(entry, collection[entry])
+    Streams the selected download formats of every entry to content-addressed
+    files, one chunk at a time, and stores their path, size and hash under
+    the entry's "files" key. Memory use does not depend on file sizes.
 
-        except Exception as exc:
-            self.failed.setdefault(exc.__class__.__name__, []).append(url)
+    Attributes:
+        DIRECTORY (str): files directory path.
+        FORMATS (tuple[str, ...] | None): download formats to fetch, or None
+            for every available format.
+    """
+
+    DIRECTORY = "files"
+    FORMATS: tuple[str, ...] | None = ("selig-format-dat-file",)
+
+    @classmethod
+    def configure(
+        cls,
+        directory: str,
+        formats: tuple[str, ...] | None
+    ) -> type["DownloadFilesExtractor"]:
+        """Create a stage class with its own directory and formats.
+
+        Args:
+            directory (str): files directory path.
+            formats (tuple[str, ...] | None): download formats to fetch, or
+                None for every available format.
+
+        Returns:
+            type[DownloadFilesExtractor]: configured stage class.
+        """
+        return type(cls.__name__, (cls,), {
+            "DIRECTORY": directory,
+            "FORMATS": formats
+        })
+
+    async def _process(self, entry: Any, collection: Any) -> None:
+        """Individual asynchronous process.
+
+        Args:
+            entry (Any): data entry.
+            collection (Any): collection to be processed.
+        """
+        links = collection[entry].download_links
+        files = collection[entry].files
+        cached = Record.load(await self.cache.aget(entry))
+        cached = {} if cached is None else cached.files or {}
+        for format in self.FORMATS if self.FORMATS is not None else links:
+            # Prevent errors in case the format is not available:
+            if links.get(format) and format not in files:
+                await self._download(
+                    entry, collection, format, links[format], cached
+                )
+
+    async def _download(
+        self,
+        entry: Any,
+        collection: Any,
+        format: str,
+        url: str,
+        files: dict[str, dict[str, Any]]
+    ) -> None:
+        """Download a single format of an entry.
+
+        Every downloaded file is cached on its own, so retried entries do not
+        download their completed formats again. Cached formats that have not
+        been processed yet are kept.
+
+        Args:
+            entry (Any): data entry.
+            collection (Any): collection to be processed.
+            format (str): download format.
+            url (str): download URL.
+            files (dict[str, dict[str, Any]]): cached file records of the
+                entry, by format.
+        """
+        cached = files.get(format)
+        # Files deleted since they were cached are downloaded again:
+        if cached is not None and not os.path.exists(
+            os.path.join(self.DIRECTORY, cached["path"])
+        ):
+            cached = None
+
+        headers = await self._revalidation(url, cached is not None)
+        if headers is None:
+            collection[entry].files[format] = cached
+            return
+
+        try:
+            file, fetched = await self._coalesce(
+                url, lambda: self._fetch(url, headers, cached)
+            )
+        except Failed:
+            return
+
+        collection[entry].files[format] = file
+        if self._outdated(file, cached, fetched):
+            await self.cache.aset(entry, replace(
+                collection[entry],
+                files={**files, **collection[entry].files}
+            ))
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        cached: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        """Stream a download to a content-addressed file.
+
+        Args:
+            url (str): download URL.
+            headers (dict[str, str]): request headers.
+            cached (dict[str, Any] | None): cached file record.
+
+        Returns:
+            dict[str, Any]: file path, size and hash.
+        """
+        async with self._request(url, headers) as response:
+            await self.cache.call(
+                self.cache.set_metadata, url, response.headers
+            )
+            if response.status == 304:
+                return cached
+
+            with ContentWriter(
+                self.DIRECTORY, os.path.splitext(response.url.path)[1]
+            ) as writer:
+                async for chunk in response.content.iter_chunked(
+                    self.CHUNK_SIZE
+                ):
+                    writer.write(chunk)
+
+                return writer.commit()
+
+
+class TableExtractor(AsyncScraper):
+    """Data table extractor class.
+
+    Streams the data table rows as they are received. The table is requested
+    conditionally when it has been fetched before, so an unchanged table is
+    served from cache.
+
+    Attributes:
+        TABLE_URL (str): data table URL, set by the source the extractor is
+            configured for.
+    """
+
+    TABLE_URL = ""
+
+    @classmethod
+    def configure(cls, url: str) -> type["TableExtractor"]:
+        """Create an extractor class for the data table of a source.
+
+        Args:
+            url (str): data table URL.
+
+        Returns:
+            type[TableExtractor]: configured extractor class.
+        """
+        return type(cls.__name__, (cls,), {"TABLE_URL": url})
+
+    async def rows(self) -> AsyncIterator[dict[str, Any]]:
+        """Fetch the data table rows.
+
+        The table is read by a background task as fast as it is received, so
+        slow consumers never keep its connection (and concurrency slots)
+        busy. Consumers that stop early cancel the download.
+
+        Raises:
+            Exception: if the table cannot be fetched.
+
+        Yields:
+            dict[str, Any]: data table row.
+        """
+        rows: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read(rows))
+        try:
+            while (row := await rows.get()) is not None:
+                yield row
+
+            # Raise the reader error, if any:
+            await reader
+        finally:
+            reader.cancel()
+
+    async def _read(self, rows: asyncio.Queue) -> None:
+        """Read the data table rows into a queue, followed by None.
+
+        Transient errors are retried according to the retry policy. Rows
+        received before an error are not queued again.
+
+        Args:
+            rows (asyncio.Queue): row queue.
+
+        Raises:
+            Exception: if the table cannot be fetched.
+        """
+        url = self.TABLE_URL
+        received = 0
+        try:
+            while True:
+                try:
+                    async for row in self._rows(url, received):
+                        received += 1
+                        rows.put_nowait(row)
+                    return
+                except Exception as exc:
+                    try:
+                        self._handle_error(exc, url)
+                    except Retry as retry:
+                        await asyncio.sleep(retry.delay)
+                        continue
+
+                    raise
+        finally:
+            rows.put_nowait(None)
+
+    async def _rows(
+        self,
+        url: str,
+        skip: int = 0
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Fetch the data table rows once.
+
+        The table body is only cached once it has been read completely, so
+        consumers that stop early leave the previous cached table in place.
+
+        Args:
+            url (str): data table URL.
+            skip (int): number of leading rows not to yield. Defaults to 0.
+
+        Yields:
+            dict[str, Any]: data table row.
+        """
+        metadata = await self.cache.call(self.cache.metadata, url)
+        cached = metadata is not None and metadata.get("body") is not None
+
+        async with self._request(
+            url, self.cache.conditional_headers(metadata) if cached else {}
+        ) as response:
+            if response.status == 304:
+                await self.cache.call(
+                    self.cache.set_metadata, url, response.headers
+                )
+                for row in json.loads(metadata["body"])[skip:]:
+                    yield row
+                return
+
+            parser = TableParser()
+            body = bytearray()
+            parsing = 0.0
+            async for chunk in response.content.iter_chunked(
+                self.CHUNK_SIZE
+            ):
+                body += chunk
+                start = perf_counter()
+                rows = parser.feed(chunk)
+                parsing += perf_counter() - start
+                for row in rows[skip:]:
+                    yield row
+                skip = max(skip - len(rows), 0)
+
+            parser.close()
+            self.registry.histogram(
+                "bfscraper_parse_seconds", "Response parsing time."
+            ).observe(parsing, stage="table")
+
+            await self.cache.call(
+                self.cache.set_metadata, url, response.headers, bytes(body)
+            )
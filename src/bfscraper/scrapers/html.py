@@ -0,0 +1,87 @@
+"""Incremental HTML extraction components.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import regex as re
+
+
+class LinksParser:
+    """Incremental download links block parser.
+
+    Consumes a links page as raw byte chunks and extracts the download links
+    block: the `<b>Label:</b> ... href="url" ... <br>` items that follow a
+    closing `</div>`, up to the first empty line break (`<br><br>`). Bytes
+    before the block are discarded as they are scanned, and parsing stops as
+    soon as the block is complete, so callers can stop reading the response.
+    BigFoil links pages carry a single download links block.
+
+    Attributes:
+        links (dict[str, str]): extracted download links, by format.
+        done (bool): whether the download links block has been parsed.
+        BLOCK_START (re.Pattern): download links block start pattern.
+        BLOCK_END (re.Pattern): download links block end pattern.
+        ITEM (re.Pattern): download link item pattern.
+    """
+
+    BLOCK_START = re.compile(rb"</div>\n*<b>", re.IGNORECASE)
+    BLOCK_END = re.compile(rb"<br>\n*<br>", re.IGNORECASE)
+    ITEM = re.compile(
+        rb"<b>(.+?)</b>.*?href=\"(.+?)\".*?<br>",
+        re.IGNORECASE | re.DOTALL
+    )
+
+    # Longest partial block start that can be split across chunks:
+    _TAIL = 64
+
+    def __init__(self, base_url: str) -> None:
+        """Initialize a LinksParser instance.
+
+        Args:
+            base_url (str): base URL prepended to every link.
+        """
+        self.base_url = base_url
+        self.links: dict[str, str] = {}
+        self.done = False
+        self._buffer = bytearray()
+        self._in_block = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk of the page.
+
+        Args:
+            chunk (bytes): page chunk.
+
+        Returns:
+            bool: True once the download links block has been parsed.
+        """
+        if self.done:
+            return True
+
+        self._buffer += chunk
+
+        if not self._in_block:
+            start = self.BLOCK_START.search(self._buffer)
+            if start is None:
+                del self._buffer[:-self._TAIL]
+                return False
+
+            del self._buffer[:start.end() - len(b"<b>")]
+            self._in_block = True
+
+        end = self.BLOCK_END.search(self._buffer)
+        if end is None:
+            return False
+
+        block = bytes(self._buffer[:end.start() + len(b"<br>")])
+        for match in self.ITEM.finditer(block.replace(b"\n", b"")):
+            label, href = match.group(1, 2)
+            self.links[
+                label.decode("utf-8").lower().replace(" ", "-").strip(":")
+            ] = f"{self.base_url}{href.decode('utf-8')}"
+
+        self._buffer.clear()
+        self.done = True
+        return True
@@ -0,0 +1,390 @@
+"""Streaming scraping pipeline.
+
+This module chains several asynchronous scrapers so that every entry moves
+to the next stage as soon as the previous one is done with it, instead of
+waiting for the whole collection to finish each stage.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import asyncio
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+
+import aiohttp
+from tqdm.asyncio import tqdm_asyncio
+
+from ..tools.cache import Cache
+from ..tools.metrics import MetricsRegistry
+from .async_components import AsyncScraper
+from .retry import CircuitBreaker, Retry, RetryPolicy
+from .scheduler import (AdaptiveLimiter, HostLimiter, SingleFlight,
+                        WorkerPool, drain)
+
+
+class Pipeline:
+    """Streaming pipeline class.
+
+    All stages share a single aiohttp session (and thus a single connection
+    pool) and are connected through bounded queues. Each stage runs its own
+    worker pool, so total run time approaches that of the slowest stage
+    rather than the sum of all of them.
+
+    Attributes:
+        stages (list[type[AsyncScraper]]): scraper classes, in order.
+        cache (Cache): cache instance.
+        timeout (int): timeout for each request.
+        limit (int): maximum number of concurrent requests.
+        progress_bar (bool): whether to display a progress bar.
+        hosts (HostLimiter): per-host concurrency limiter.
+        retry (RetryPolicy): retry policy.
+        breaker (CircuitBreaker): per-host circuit breaker shared by all
+            stages.
+        limiter (AdaptiveLimiter | None): adaptive concurrency controller.
+        registry (MetricsRegistry): metrics registry shared by all stages.
+        flights (SingleFlight): request coalescer shared by all stages, so
+            entries pointing to the same URL fetch it once.
+        on_complete (Callable[[Any], None] | None): callback for every entry
+            that leaves the last stage.
+        failed (dict[str, list[str]]): failed URLs of all stages.
+        retried (dict[str, int]): URLs of all stages that succeeded after
+            being retried, along with their number of retries.
+        Source (type): entry source type (see `scrape`).
+    """
+
+    _DONE = object()
+
+    Source = Callable[
+        [Callable[[type[AsyncScraper]], AsyncScraper]], AsyncIterable[Any]
+    ]
+
+    def __init__(
+        self,
+        stages: list[type[AsyncScraper]],
+        cache: Cache,
+        timeout: int,
+        limit: int,
+        progress_bar: bool = True,
+        hosts: HostLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        on_complete: Callable[[Any], None] | None = None,
+        registry: MetricsRegistry | None = None,
+        on_stage: Callable[[int, Any], None] | None = None
+    ) -> None:
+        """Initialize a Pipeline instance.
+
+        Args:
+            stages (list[type[AsyncScraper]]): scraper classes, in order.
+            cache (Cache): cache instance.
+            timeout (int): timeout for each request.
+            limit (int): maximum number of concurrent requests.
+            progress_bar (bool): whether to display a progress bar. Defaults
+                to True.
+            hosts (HostLimiter | None): per-host concurrency limiter shared
+                by all stages. Defaults to None (no per-host limits).
+            retry (RetryPolicy | None): retry policy. Defaults to None (the
+                default RetryPolicy).
+            limiter (AdaptiveLimiter | None): adaptive concurrency
+                controller shared by all stages. If given, `limit` is the
+                maximum number of concurrent requests. Defaults to None.
+            on_complete (Callable[[Any], None] | None): callback for every
+                entry that leaves the last stage. Defaults to None.
+            registry (MetricsRegistry | None): metrics registry shared by
+                all stages. Defaults to None (a registry owned by the
+                pipeline).
+            on_stage (Callable[[int, Any], None] | None): callback for every
+                entry that leaves a stage other than the last, called with
+                the stage index and the entry. Defaults to None.
+        """
+        if not stages:
+            raise ValueError("stages must contain at least one scraper.")
+
+        self.stages = stages
+        self.cache = cache
+        self.timeout = timeout
+        self.limit = limit
+        self.progress_bar = progress_bar
+        self.hosts = hosts if hosts is not None else HostLimiter()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.limiter = limiter
+        self.on_complete = on_complete
+        self.on_stage = on_stage
+        self.registry = registry if registry is not None \
+            else MetricsRegistry()
+        coalesced = self.registry.counter(
+            "bfscraper_coalesced_requests_total",
+            "Requests served by another entry's request to the same URL."
+        )
+        self.flights = SingleFlight(
+            on_shared=lambda key: coalesced.inc(stage=key[0])
+        )
+        self.failed: dict[str, list[str]] = {}
+        self.retried: dict[str, int] = {}
+
+    async def _stage(
+        self,
+        scraper: AsyncScraper,
+        entries: Iterable[Any] | AsyncIterable[Any],
+        target: asyncio.Queue | None,
+        collection: Any,
+        progress: tqdm_asyncio | None,
+        index: int = 0
+    ) -> None:
+        """Run a stage over its input and forward every processed entry.
+
+        Args:
+            scraper (AsyncScraper): stage scraper.
+            entries (Iterable[Any] | AsyncIterable[Any]): stage input.
+            target (asyncio.Queue | None): next stage (or output) input
+                queue, or None for the last stage.
+            collection (Any): collection to be processed.
+            progress (tqdm_asyncio | None): progress bar, for the last stage.
+            index (int): stage index. Defaults to 0.
+        """
+        last = index == len(self.stages) - 1
+
+        async def handle(entry: Any) -> None:
+            forward = True
+            try:
+                await scraper._process(entry, collection)
+            except (Retry, asyncio.CancelledError):
+                forward = False
+                raise
+            finally:
+                # Entries are forwarded once, after their last attempt, and
+                # never by a cancelled run:
+                if forward and not last and self.on_stage is not None:
+                    self.on_stage(index, entry)
+                if forward and target is not None:
+                    await target.put(entry)
+                elif forward and self.on_complete is not None:
+                    self.on_complete(entry)
+
+        wait = self.registry.histogram(
+            "bfscraper_queue_wait_seconds",
+            "Time entries wait in a stage queue before being processed."
+        )
+        stage = scraper.__class__.__name__
+
+        await WorkerPool(
+            workers=self.limit,
+            on_error=lambda entry, exc: scraper._fail(exc, str(entry)),
+            on_wait=lambda seconds: wait.observe(seconds, stage=stage)
+        ).run(entries, handle, progress)
+
+        if target is not None:
+            await target.put(self._DONE)
+
+    def _scraper(
+        self,
+        stage: type[AsyncScraper],
+        session: aiohttp.ClientSession
+    ) -> AsyncScraper:
+        """Build a scraper that shares the pipeline session and components.
+
+        Args:
+            stage (type[AsyncScraper]): scraper class.
+            session (aiohttp.ClientSession): pipeline session.
+
+        Returns:
+            AsyncScraper: scraper instance.
+        """
+        return stage(
+            cache=self.cache,
+            timeout=self.timeout,
+            limit=self.limit,
+            progress_bar=False,
+            session=session,
+            hosts=self.hosts,
+            retry=self.retry,
+            breaker=self.breaker,
+            limiter=self.limiter,
+            registry=self.registry,
+            flights=self.flights
+        )
+
+    @staticmethod
+    async def _count(
+        entries: Iterable[Any] | AsyncIterable[Any],
+        progress: tqdm_asyncio
+    ) -> AsyncIterator[Any]:
+        """Grow the progress bar total as entries are produced.
+
+        Args:
+            entries (Iterable[Any] | AsyncIterable[Any]): entries of unknown
+                length.
+            progress (tqdm_asyncio): progress bar.
+
+        Yields:
+            Any: entry.
+        """
+        if isinstance(entries, AsyncIterable):
+            async for entry in entries:
+                progress.total += 1
+                yield entry
+        else:
+            for entry in entries:
+                progress.total += 1
+                yield entry
+
+    async def _run(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | Source | None = None,
+        session: aiohttp.ClientSession | None = None,
+        output: asyncio.Queue | None = None
+    ) -> None:
+        """Run every stage over the collection.
+
+        Args:
+            collection (Any): collection to be processed.
+            entries (Iterable[Any] | Source | None): entries of the
+                collection to process, possibly a generator, or a source.
+                Defaults to all of them.
+            session (aiohttp.ClientSession | None): session to use, which is
+                left open. Defaults to None (a session owned by the run).
+            output (asyncio.Queue | None): queue that receives every entry
+                that leaves the last stage, followed by the end-of-stream
+                marker, instead of `on_complete`. Defaults to None.
+        """
+        try:
+            await self._stages(collection, entries, session, output)
+        finally:
+            # Cancelled runs have no consumer left to stop:
+            if output is not None and not asyncio.current_task().cancelling():
+                await output.put(self._DONE)
+
+    async def _stages(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | Source | None,
+        session: aiohttp.ClientSession | None,
+        output: asyncio.Queue | None
+    ) -> None:
+        """Run every stage over the collection (see `_run`).
+
+        Args:
+            collection (Any): collection to be processed.
+            entries (Iterable[Any] | Source | None): entries of the
+                collection to process, possibly a generator, or a source.
+            session (aiohttp.ClientSession | None): session to use.
+            output (asyncio.Queue | None): last stage output queue.
+        """
+        # Snapshot the keys, as completed entries may leave the collection:
+        entries = list(collection) if entries is None else entries
+
+        async with (
+            nullcontext(session) if session is not None
+            else AsyncScraper.create_session(
+                self.timeout, self.limit, self.registry
+            )
+        ) as session:
+            if callable(entries):
+                entries = entries(partial(self._scraper, session=session))
+
+            scrapers = [self._scraper(stage, session) for stage in self.stages]
+            queues: list[asyncio.Queue] = [
+                asyncio.Queue(maxsize=self.limit * 2)
+                for _ in scrapers[1:]
+            ]
+
+            with tqdm_asyncio(
+                total=len(entries) if hasattr(entries, "__len__") else 0,
+                disable=not self.progress_bar,
+                smoothing=0.01,
+                colour="YELLOW",
+                bar_format=AsyncScraper.BAR_FORMAT
+            ) as progress:
+                if not hasattr(entries, "__len__"):
+                    entries = self._count(entries, progress)
+
+                async with asyncio.TaskGroup() as group:
+                    for index, scraper in enumerate(scrapers):
+                        group.create_task(self._stage(
+                            scraper,
+                            entries if index == 0
+                            else drain(queues[index - 1], self._DONE),
+                            queues[index] if index < len(queues) else output,
+                            collection,
+                            progress if index == len(queues) else None,
+                            index
+                        ))
+
+        for scraper in scrapers:
+            for exception, urls in scraper.failed.items():
+                self.failed.setdefault(exception, []).extend(urls)
+            self.retried.update(scraper.retried)
+
+    def scrape(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | Source | None = None
+    ) -> None:
+        """Scrape the collection through every stage.
+
+        Entries can also be produced while the pipeline runs by a source: a
+        function that is called with a scraper factory and returns an
+        asynchronous iterable of entries. The factory builds scrapers of the
+        given class that share the pipeline session, limiters, retry policy
+        and metrics. Sources must add each entry to the collection before
+        yielding it.
+
+        Args:
+            collection (Any): collection to be processed.
+            entries (Iterable[Any] | Source | None): entries of the
+                collection to process, possibly a generator, or a source.
+                Defaults to all of them.
+        """
+        asyncio.run(self._run(collection, entries))
+        AsyncScraper.report(self.failed, self.retried)
+
+    async def iterate(
+        self,
+        collection: Any,
+        entries: Iterable[Any] | Source | None = None,
+        session: aiohttp.ClientSession | None = None
+    ) -> AsyncIterator[Any]:
+        """Scrape the collection on the running event loop.
+
+        Entries are yielded as soon as they leave the last stage, through a
+        bounded queue: while the consumer is busy, the last stage stops once
+        the queue is full, and so do the earlier ones in turn. Stopping the
+        iteration cancels the pipeline. `on_complete` is not called, and
+        failed URLs are only gathered in `failed`, not printed.
+
+        Args:
+            collection (Any): collection to be processed.
+            entries (Iterable[Any] | Source | None): entries of the
+                collection to process, possibly a generator, or a source.
+                Defaults to all of them.
+            session (aiohttp.ClientSession | None): session to use, which is
+                left open. Its timeout and connection limits apply instead
+                of the pipeline ones, and request timings are not recorded.
+                Defaults to None (a session owned by the pipeline).
+
+        Yields:
+            Any: processed entry.
+        """
+        output: asyncio.Queue = asyncio.Queue(maxsize=self.limit * 2)
+        run = asyncio.create_task(
+            self._run(collection, entries, session, output)
+        )
+        finished = False
+        try:
+            async for entry in drain(output, self._DONE):
+                yield entry
+            finished = True
+        finally:
+            # The run is only cancelled if the consumer stops early:
+            if not finished:
+                run.cancel()
+            try:
+                await run
+            except asyncio.CancelledError:
+                if not run.cancelled():
+                    raise
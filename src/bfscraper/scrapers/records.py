@@ -0,0 +1,231 @@
+"""Airfoil record model.
+
+Every airfoil is kept as a slotted `Record` while it is scraped and cached,
+instead of a nested dictionary: optimization values are stored in a float
+array and families and data sources are interned, since they repeat across
+the whole catalogue. Records are only converted to dictionaries at the
+output boundary, with the same layout as before.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import math
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any
+
+OPTIMIZATIONS = (
+    "thickness", "x-thickness", "camber", "LD-Max", "Cl-Max", "CdCl01",
+    "CdCl04", "CdCl06"
+)
+
+
+@dataclass(slots=True)
+class Record:
+    """Airfoil record class.
+
+    Attributes:
+        name (str): airfoil name.
+        family (str): airfoil family (interned).
+        info (str): airfoil information page URL.
+        page (str): download links page URL.
+        sources (tuple[str, ...]): data sources (interned).
+        optimizations (array): optimization values, in OPTIMIZATIONS order
+            (NaN if not available).
+        download_links (dict[str, str]): download links, by format.
+        dat (str | None): Selig Format DAT file contents, if downloaded.
+        files (dict[str, dict[str, Any]] | None): downloaded file records,
+            by format, or None if files are not streamed to disk.
+        origin (str): name of the source that scrapes the record, or an
+            empty string for the first enabled source. Not output.
+    """
+
+    name: str
+    family: str
+    info: str
+    page: str
+    sources: tuple[str, ...]
+    optimizations: array
+    download_links: dict[str, str] = field(default_factory=dict)
+    dat: str | None = None
+    files: dict[str, dict[str, Any]] | None = None
+    origin: str = ""
+
+    def __getstate__(self) -> tuple:
+        """Get the pickled state of the record.
+
+        Optimization values are pickled as raw bytes, which is several times
+        smaller than a pickled array.
+
+        Returns:
+            tuple: record state.
+        """
+        return (
+            self.name, self.family, self.info, self.page, self.sources,
+            self.optimizations.tobytes(), self.download_links, self.dat,
+            self.files, self.origin
+        )
+
+    def __setstate__(self, state: tuple) -> None:
+        """Restore the record from its pickled state.
+
+        States pickled by previous versions have no origin.
+
+        Args:
+            state (tuple): record state.
+        """
+        (
+            self.name, family, self.info, self.page, sources, optimizations,
+            self.download_links, self.dat, self.files
+        ) = state[:9]
+        self.origin = sys.intern(state[9]) if len(state) > 9 else ""
+        self.family = sys.intern(family)
+        self.sources = tuple(sys.intern(source) for source in sources)
+        self.optimizations = array("d")
+        self.optimizations.frombytes(optimizations)
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        family: str,
+        info: str,
+        page: str,
+        sources: list[str],
+        optimizations: dict[str, float | None],
+        files: bool = False,
+        origin: str = ""
+    ) -> "Record":
+        """Create a record from parsed table values.
+
+        Args:
+            name (str): airfoil name.
+            family (str): airfoil family.
+            info (str): airfoil information page URL.
+            page (str): download links page URL.
+            sources (list[str]): data sources.
+            optimizations (dict[str, float | None]): optimization values, by
+                field.
+            files (bool): whether files are streamed to disk. Defaults to
+                False.
+            origin (str): name of the source that scrapes the record.
+                Defaults to "" (the first enabled source).
+
+        Returns:
+            Record: new record.
+        """
+        return cls(
+            name=name,
+            family=sys.intern(family),
+            info=info,
+            page=page,
+            sources=tuple(sys.intern(source) for source in sources),
+            optimizations=array("d", (
+                math.nan if optimizations.get(key) is None
+                else optimizations[key]
+                for key in OPTIMIZATIONS
+            )),
+            files={} if files else None,
+            origin=sys.intern(origin)
+        )
+
+    @classmethod
+    def load(cls, value: Any) -> "Record | None":
+        """Load a cached record.
+
+        Caches written by previous versions store records as dictionaries,
+        which are converted.
+
+        Args:
+            value (Any): cached value, or None.
+
+        Returns:
+            Record | None: cached record, or None if not cached.
+        """
+        if value is None or isinstance(value, cls):
+            return value
+
+        return cls.from_dict(value)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Record":
+        """Create a record from its dictionary form.
+
+        Args:
+            data (dict[str, Any]): record dictionary.
+
+        Returns:
+            Record: record.
+        """
+        record = cls.create(
+            name=data["name"],
+            family=data["family"],
+            info=data["links"].get("info", ""),
+            page=data["links"].get("files", ""),
+            sources=data["data-sources"],
+            optimizations=data["optimizations"],
+            files="files" in data
+        )
+        record.download_links = dict(data["download-links"])
+        if isinstance(data.get("dat"), str):
+            record.dat = data["dat"]
+        if "files" in data:
+            record.files = dict(data["files"])
+
+        return record
+
+    def merge(self, other: "Record") -> None:
+        """Merge the table data of the same airfoil listed by another source.
+
+        Values of this record take precedence: only data sources and
+        optimization values that this record lacks are taken from `other`.
+
+        Args:
+            other (Record): record of the same airfoil.
+        """
+        self.sources += tuple(
+            source for source in other.sources if source not in self.sources
+        )
+        for index, value in enumerate(other.optimizations):
+            if math.isnan(self.optimizations[index]):
+                self.optimizations[index] = value
+
+    def optimization(self, key: str) -> float | None:
+        """Get an optimization value.
+
+        Args:
+            key (str): optimization field, one of OPTIMIZATIONS.
+
+        Returns:
+            float | None: value, or None if not available.
+        """
+        value = self.optimizations[OPTIMIZATIONS.index(key)]
+        return None if math.isnan(value) else value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the record to its output dictionary.
+
+        DAT files that were not downloaded are output as empty dictionaries,
+        as in previous versions.
+
+        Returns:
+            dict[str, Any]: record dictionary.
+        """
+        return {
+            "name": self.name,
+            "family": self.family,
+            "links": {"info": self.info, "files": self.page},
+            "download-links": dict(self.download_links),
+            **(
+                {"dat": {} if self.dat is None else self.dat}
+                if self.files is None else {"files": dict(self.files)}
+            ),
+            "data-sources": list(self.sources),
+            "optimizations": {
+                key: None if math.isnan(value) else value
+                for key, value in zip(OPTIMIZATIONS, self.optimizations)
+            }
+        }
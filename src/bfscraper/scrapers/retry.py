@@ -0,0 +1,276 @@
+"""Request retry components.
+
+This module contains the retry policy and per-host circuit breaker used by
+the asynchronous scrapers to recover from transient network errors without
+overloading failing servers.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class Retry(Exception):
+    """Request to process an item again after a delay.
+
+    Raised by item handlers so that the worker pool can reschedule the item
+    without keeping a worker busy while it waits.
+
+    Attributes:
+        delay (float): seconds to wait before the next attempt.
+    """
+
+    def __init__(self, delay: float) -> None:
+        """Initialize a Retry instance.
+
+        Args:
+            delay (float): seconds to wait before the next attempt.
+        """
+        super().__init__(f"retry in {delay:.2f}s")
+        self.delay = delay
+
+
+class Failed(Exception):
+    """Exception raised when a URL has failed for good.
+
+    The failure has already been registered, so handlers only need to stop
+    processing the item.
+
+    Attributes:
+        url (str): failed URL.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialize a Failed instance.
+
+        Args:
+            url (str): failed URL.
+        """
+        super().__init__(f"{url} failed")
+        self.url = url
+
+
+class CircuitOpen(Exception):
+    """Exception raised when a request targets a host with an open circuit.
+
+    Attributes:
+        host (str): target host.
+        wait (float): seconds until the circuit allows a new request.
+        probes (int): probe requests to the host that have failed since the
+            circuit opened.
+    """
+
+    def __init__(self, host: str, wait: float, probes: int = 0) -> None:
+        """Initialize a CircuitOpen instance.
+
+        Args:
+            host (str): target host.
+            wait (float): seconds until the circuit allows a new request.
+            probes (int): probe requests to the host that have failed since
+                the circuit opened. Defaults to 0.
+        """
+        super().__init__(f"circuit open for {host} ({wait:.2f}s left)")
+        self.host = host
+        self.wait = wait
+        self.probes = probes
+
+
+class RetryPolicy:
+    """Retry policy class.
+
+    Delays grow exponentially with the number of attempts and are randomized
+    with full jitter. A `Retry-After` header sent by the server takes
+    precedence over the computed delay.
+
+    Attributes:
+        retries (int): maximum number of retries per URL.
+        backoff (float): base delay in seconds.
+        max_backoff (float): maximum delay in seconds.
+        STATUSES (set[int]): retryable HTTP status codes.
+    """
+
+    STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0
+    ) -> None:
+        """Initialize a RetryPolicy instance.
+
+        Args:
+            retries (int): maximum number of retries per URL. Defaults to 3.
+            backoff (float): base delay in seconds. Defaults to 0.5.
+            max_backoff (float): maximum delay in seconds. Defaults to 60.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def is_retryable(cls, exc: Exception) -> bool:
+        """Check whether an exception is caused by a transient error.
+
+        Args:
+            exc (Exception): raised exception.
+
+        Returns:
+            bool: True if the request may succeed when retried.
+        """
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status in cls.STATUSES
+
+        return isinstance(exc, (
+            CircuitOpen,
+            asyncio.TimeoutError,
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientPayloadError
+        ))
+
+    @staticmethod
+    def retry_after(exc: Exception) -> float | None:
+        """Get the delay requested by the server, if any.
+
+        Args:
+            exc (Exception): raised exception.
+
+        Returns:
+            float | None: `Retry-After` delay in seconds, or None.
+        """
+        headers = getattr(exc, "headers", None)
+        value = headers.get("Retry-After") if headers else None
+
+        if not value:
+            return None
+
+        if value.isdigit():
+            return float(value)
+
+        try:
+            return max(
+                parsedate_to_datetime(value).timestamp() - time.time(),
+                0.0
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, exc: Exception) -> float:
+        """Compute the delay before the next attempt.
+
+        Args:
+            attempt (int): number of failed attempts so far.
+            exc (Exception): raised exception.
+
+        Returns:
+            float: seconds to wait.
+        """
+        if isinstance(exc, CircuitOpen):
+            return exc.wait + random.uniform(0, self.backoff)
+
+        requested = self.retry_after(exc)
+        if requested is not None:
+            return min(requested, self.max_backoff)
+
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker class.
+
+    After `threshold` consecutive transient failures, requests to a host are
+    rejected for `cooldown` seconds. Then a single probe request is let
+    through: its success closes the circuit and its failure opens it again.
+    Rejections report how many probes have failed, so that callers can give
+    up on a host that stays down.
+
+    Attributes:
+        threshold (int): consecutive failures that open the circuit.
+        cooldown (float): seconds the circuit stays open.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        """Initialize a CircuitBreaker instance.
+
+        Args:
+            threshold (int): consecutive failures that open the circuit.
+                Defaults to 5.
+            cooldown (float): seconds the circuit stays open. Defaults to 30.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: dict[str, int] = {}
+        self._opened: dict[str, float] = {}
+        self._probing: set[str] = set()
+        self._probes: dict[str, int] = {}
+
+    def check(self, url: str) -> None:
+        """Check whether a request to a URL is allowed.
+
+        Args:
+            url (str): request URL.
+
+        Raises:
+            CircuitOpen: if the URL's host circuit is open.
+        """
+        host = urlsplit(url).hostname or ""
+        if self._failures.get(host, 0) < self.threshold:
+            return
+
+        probes = self._probes.get(host, 0)
+        elapsed = time.monotonic() - self._opened[host]
+        if elapsed < self.cooldown:
+            raise CircuitOpen(host, self.cooldown - elapsed, probes)
+
+        # The probe in flight has not failed yet:
+        if host in self._probing:
+            raise CircuitOpen(host, 1.0, probes - 1)
+
+        self._probing.add(host)
+        self._probes[host] = probes + 1
+
+    def release(self, url: str) -> None:
+        """Let another probe through once a request has finished.
+
+        Requests that end without an outcome, such as cancelled ones, would
+        otherwise keep their host's probe slot forever.
+
+        Args:
+            url (str): request URL.
+        """
+        self._probing.discard(urlsplit(url).hostname or "")
+
+    def success(self, url: str) -> None:
+        """Register a successful request.
+
+        Args:
+            url (str): request URL.
+        """
+        host = urlsplit(url).hostname or ""
+        self._failures.pop(host, None)
+        self._opened.pop(host, None)
+        self._probing.discard(host)
+        self._probes.pop(host, None)
+
+    def failure(self, url: str) -> None:
+        """Register a transient request failure.
+
+        Args:
+            url (str): request URL.
+        """
+        host = urlsplit(url).hostname or ""
+        self._failures[host] = self._failures.get(host, 0) + 1
+        self._probing.discard(host)
+
+        if self._failures[host] >= self.threshold:
+            self._opened[host] = time.monotonic()
@@ -0,0 +1,494 @@
+"""Asynchronous work scheduling components.
+
+This module contains a bounded worker pool, a per-host concurrency limiter,
+an adaptive concurrency controller and a call coalescer, used by the
+asynchronous scrapers to keep both memory usage and server load under
+control.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import asyncio
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager, nullcontext
+from time import monotonic
+from typing import (Any, AsyncIterable, AsyncIterator, Awaitable, Callable,
+                    Hashable, Iterable)
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .retry import CircuitOpen, Retry, RetryPolicy
+
+
+class HostLimiter:
+    """Per-host concurrency limiter.
+
+    Attributes:
+        limits (dict[str, int]): maximum concurrent requests per host.
+        default (int | None): maximum concurrent requests for hosts not in
+            `limits`, or None for no limit.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int] | None = None,
+        default: int | None = None
+    ) -> None:
+        """Initialize a HostLimiter instance.
+
+        Args:
+            limits (dict[str, int] | None): maximum concurrent requests per
+                host. Defaults to None.
+            default (int | None): maximum concurrent requests for hosts not
+                in `limits`, or None for no limit. Defaults to None.
+        """
+        self.limits = dict(limits or {})
+        self.default = default
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, url: str) -> asyncio.Semaphore | nullcontext:
+        """Get the concurrency slot for a URL.
+
+        Args:
+            url (str): request URL.
+
+        Returns:
+            asyncio.Semaphore | nullcontext: async context manager that
+                holds a slot of the URL's host while active.
+        """
+        host = urlsplit(url).hostname or ""
+        limit = self.limits.get(host, self.default)
+
+        if limit is None:
+            return nullcontext()
+
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(limit)
+
+        return self._semaphores[host]
+
+
+class AdaptiveLimiter:
+    """Adaptive (AIMD) concurrency controller.
+
+    The number of simultaneous requests starts at `minimum` and doubles
+    every round trip (slow start) until the first congestion signal. After
+    that, it grows by one request per round trip. Timeouts, 429 and 5xx
+    responses and a latency increase beyond `tolerance` times the best
+    observed latency are treated as congestion and cut the limit by
+    `backoff`, at most once per round trip: the round trip time is smoothed
+    over every request (failed ones included) and, unlike the latency
+    window used to detect congestion, is kept across decreases, so a burst
+    of simultaneous failures cuts the limit only once.
+
+    Attributes:
+        minimum (int): minimum number of simultaneous requests.
+        maximum (int): maximum number of simultaneous requests.
+        backoff (float): multiplicative decrease factor.
+        tolerance (float): latency increase factor treated as congestion.
+        limit (int): current number of simultaneous requests.
+        peak (int): highest limit reached.
+        increases (int): number of limit increases.
+        decreases (list[tuple[float, int, int, str]]): limit decreases, as
+            (elapsed seconds, previous limit, new limit, reason) tuples.
+    """
+
+    WARMUP = 10
+
+    def __init__(
+        self,
+        minimum: int = 2,
+        maximum: int = 100,
+        backoff: float = 0.5,
+        tolerance: float = 2.0
+    ) -> None:
+        """Initialize an AdaptiveLimiter instance.
+
+        Args:
+            minimum (int): minimum number of simultaneous requests. Defaults
+                to 2.
+            maximum (int): maximum number of simultaneous requests. Defaults
+                to 100.
+            backoff (float): multiplicative decrease factor. Defaults to 0.5.
+            tolerance (float): latency increase factor treated as
+                congestion. Defaults to 2.
+        """
+        if not 1 <= minimum <= maximum:
+            raise ValueError("limits must satisfy 1 <= minimum <= maximum.")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.limit = minimum
+        self.peak = minimum
+        self.increases = 0
+        self.decreases: list[tuple[float, int, int, str]] = []
+        self._active = 0
+        self._successes = 0
+        self._samples = 0
+        self._slow_start = True
+        self._latency: float | None = None
+        self._rtt: float | None = None
+        self._baseline: float | None = None
+        self._last_decrease = float("-inf")
+        self._start = monotonic()
+        self._condition: asyncio.Condition | None = None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a request slot, measuring the request outcome.
+
+        Yields:
+            None: while the slot is held.
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+        start = monotonic()
+        try:
+            yield
+        except Exception as exc:
+            if RetryPolicy.is_retryable(exc) and not isinstance(
+                exc, CircuitOpen
+            ):
+                self._decrease(self._reason(exc), monotonic() - start)
+            else:
+                self._success(monotonic() - start)
+            raise
+        else:
+            self._success(monotonic() - start)
+        finally:
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def summary(self) -> str:
+        """Summarize controller decisions.
+
+        Returns:
+            str: human-readable summary.
+        """
+        reasons = Counter(reason for *_, reason in self.decreases)
+        return (
+            f"Adaptive limit ended at {self.limit} (peak {self.peak}, bounds "
+            + f"{self.minimum}-{self.maximum}) after {self.increases} "
+            + f"increases and {len(self.decreases)} decreases"
+            + (
+                " (" + ", ".join(
+                    f"{reason}: {count}" for reason, count in reasons.items()
+                ) + ")"
+                if reasons else ""
+            )
+            + "."
+        )
+
+    @staticmethod
+    def _reason(exc: Exception) -> str:
+        """Describe a congestion signal.
+
+        Args:
+            exc (Exception): raised exception.
+
+        Returns:
+            str: congestion reason.
+        """
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return f"HTTP {exc.status}"
+
+        return exc.__class__.__name__
+
+    def _success(self, latency: float) -> None:
+        """Register a successful request.
+
+        Args:
+            latency (float): request duration in seconds.
+        """
+        self._samples += 1
+        self._latency = (
+            latency if self._latency is None
+            else 0.9 * self._latency + 0.1 * latency
+        )
+        self._measure(latency)
+
+        if self._samples >= self.WARMUP:
+            self._baseline = (
+                self._latency if self._baseline is None
+                else min(self._baseline, self._latency)
+            )
+
+            if self._latency > self.tolerance * self._baseline:
+                self._decrease("latency")
+                return
+
+        self._successes += 1
+        if self._slow_start or self._successes >= self.limit:
+            self._successes = 0
+            self._set(self.limit + 1)
+
+    def _measure(self, latency: float) -> None:
+        """Update the smoothed round trip time.
+
+        Args:
+            latency (float): request duration in seconds.
+        """
+        self._rtt = (
+            latency if self._rtt is None
+            else 0.875 * self._rtt + 0.125 * latency
+        )
+
+    def _decrease(self, reason: str, latency: float | None = None) -> None:
+        """Cut the limit after a congestion signal.
+
+        Only the latency window is reset: the smoothed round trip time keeps
+        guarding against further cuts within the same round trip.
+
+        Args:
+            reason (str): congestion reason.
+            latency (float | None): duration of the failed request in
+                seconds, if any. Defaults to None.
+        """
+        if latency is not None:
+            self._measure(latency)
+
+        now = monotonic()
+        if now - self._last_decrease < (self._rtt or 0.0):
+            return
+
+        previous = self.limit
+        self._slow_start = False
+        self._successes = 0
+        self._latency = None
+        self._samples = 0
+        self._last_decrease = now
+        self._set(int(self.limit * self.backoff))
+
+        if self.limit != previous:
+            self.decreases.append(
+                (now - self._start, previous, self.limit, reason)
+            )
+
+    def _set(self, limit: int) -> None:
+        """Set the limit within bounds.
+
+        Args:
+            limit (int): new limit.
+        """
+        limit = max(self.minimum, min(self.maximum, limit))
+        if limit > self.limit:
+            self.increases += 1
+
+        self.limit = limit
+        self.peak = max(self.peak, limit)
+
+
+class SingleFlight:
+    """Call coalescing class.
+
+    Concurrent calls with the same key share a single execution: the first
+    one runs, and the rest await its result (or exception). Successful
+    results are also kept, up to `size` of them (the least recently used
+    are dropped first), so later calls with the same key return at once.
+
+    Attributes:
+        size (int): maximum number of kept results.
+        on_shared (Callable[[Hashable], None] | None): callback for every
+            call served by another call's execution, with its key.
+    """
+
+    def __init__(
+        self,
+        size: int = 4096,
+        on_shared: Callable[[Hashable], None] | None = None
+    ) -> None:
+        """Initialize a SingleFlight instance.
+
+        Args:
+            size (int): maximum number of kept results. Defaults to 4096.
+            on_shared (Callable[[Hashable], None] | None): callback for every
+                call served by another call's execution. Defaults to None.
+        """
+        self.size = size
+        self.on_shared = on_shared
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        self._results: OrderedDict[Hashable, Any] = OrderedDict()
+
+    async def do(
+        self,
+        key: Hashable,
+        function: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run a call, unless one with the same key is running or done.
+
+        Args:
+            key (Hashable): call key.
+            function (Callable[[], Awaitable[Any]]): call.
+
+        Returns:
+            Any: call result.
+        """
+        if key in self._results:
+            self._results.move_to_end(key)
+            self._shared(key)
+            return self._results[key]
+
+        if key in self._flights:
+            self._shared(key)
+            # Waiters being cancelled must not cancel the shared call:
+            return await asyncio.shield(self._flights[key])
+
+        flight = self._flights[key] = asyncio.get_running_loop(
+        ).create_future()
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exc:
+            flight.set_exception(exc)
+            # Mark the exception as retrieved, even without waiters:
+            flight.exception()
+            raise
+        finally:
+            del self._flights[key]
+
+        flight.set_result(result)
+        if self.size > 0:
+            self._results[key] = result
+            if len(self._results) > self.size:
+                self._results.popitem(last=False)
+
+        return result
+
+    def _shared(self, key: Hashable) -> None:
+        """Report a call served by another call's execution.
+
+        Args:
+            key (Hashable): call key.
+        """
+        if self.on_shared is not None:
+            self.on_shared(key)
+
+
+class WorkerPool:
+    """Bounded worker pool class.
+
+    A fixed number of workers pull items from a bounded queue, which is fed
+    lazily from the input iterable. Memory usage is therefore independent of
+    the number of items, and generators are consumed one item at a time.
+
+    Handlers may raise `Retry` to have an item queued again after a delay.
+    Workers do not wait for the delay, so other items keep being processed.
+
+    Attributes:
+        workers (int): number of workers.
+        on_error (Callable[[Any, Exception], None] | None): callback for
+            exceptions raised while handling an item.
+        on_wait (Callable[[float], None] | None): callback for the time
+            each item waited in the queue, in seconds.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        workers: int,
+        on_error: Callable[[Any, Exception], None] | None = None,
+        on_wait: Callable[[float], None] | None = None
+    ) -> None:
+        """Initialize a WorkerPool instance.
+
+        Args:
+            workers (int): number of workers.
+            on_error (Callable[[Any, Exception], None] | None): callback for
+                exceptions raised while handling an item. If None, they are
+                propagated. Defaults to None.
+            on_wait (Callable[[float], None] | None): callback for the time
+                each item waited in the queue, in seconds. Defaults to None.
+        """
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+
+        self.workers = workers
+        self.on_error = on_error
+        self.on_wait = on_wait
+
+    async def run(
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        handler: Callable[[Any], Awaitable[None]],
+        progress: Any = None
+    ) -> None:
+        """Handle every item with the pool workers.
+
+        Args:
+            items (Iterable[Any] | AsyncIterable[Any]): items to handle.
+            handler (Callable[[Any], Awaitable[None]]): item handler.
+            progress (Any): progress bar to update after each item. Defaults
+                to None.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+
+        async def produce() -> None:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queue.put((item, monotonic()))
+            else:
+                for item in items:
+                    await queue.put((item, monotonic()))
+
+            # Wait for pending items, including delayed retries:
+            await queue.join()
+            for _ in range(self.workers):
+                await queue.put(self._DONE)
+
+        async def requeue(item: Any, delay: float) -> None:
+            await asyncio.sleep(delay)
+            await queue.put((item, monotonic()))
+            queue.task_done()
+
+        async def work() -> None:
+            while (queued := await queue.get()) is not self._DONE:
+                item, enqueued = queued
+                if self.on_wait is not None:
+                    self.on_wait(monotonic() - enqueued)
+
+                try:
+                    await handler(item)
+                except Retry as retry:
+                    group.create_task(requeue(item, retry.delay))
+                    continue
+                except Exception as exc:
+                    if self.on_error is None:
+                        raise
+                    self.on_error(item, exc)
+
+                if progress is not None:
+                    progress.update(1)
+                queue.task_done()
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce())
+            for _ in range(self.workers):
+                group.create_task(work())
+
+
+async def drain(queue: asyncio.Queue, sentinel: Any) -> AsyncIterable[Any]:
+    """Yield items from a queue until a sentinel is found.
+
+    Args:
+        queue (asyncio.Queue): source queue.
+        sentinel (Any): end-of-stream marker.
+
+    Yields:
+        Any: queued items.
+    """
+    while (item := await queue.get()) is not sentinel:
+        yield item
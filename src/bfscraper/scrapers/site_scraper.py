@@ -5,20 +5,33 @@ Author:
 """
 
 
-import json
-import sys
-from functools import wraps
+import asyncio
+import os
+from contextlib import aclosing, nullcontext
+from functools import partial, wraps
 from time import perf_counter
-from typing import Any
+from typing import Any, AsyncIterator, Callable
 
-import regex as re
-import requests
+import aiohttp
 from hurry.filesize import size
 
 from ..tools.cache import Cache
+from ..tools.checkpoint import Checkpoint
+from ..tools.filters import Predicate, describe
+from ..tools.index import diff, digest
 from ..tools.logger import Logger
-from .async_components import (AsyncScraper, DownloadDataExtractor,
-                               DownloadLinksExtractor)
+from ..tools.metrics import MetricsExporter, MetricsRegistry
+from ..tools.output import OutputWriter
+from ..tools.shards import Shard
+from .async_components import AsyncScraper
+from .pipeline import Pipeline
+from .records import Record
+from .retry import RetryPolicy
+from .scheduler import AdaptiveLimiter, HostLimiter
+from .sources import BigFoil, SourceRegistry
+
+
+SELIG = ("selig-format-dat-file",)
 
 
 class SiteScraper:
@@ -34,12 +47,44 @@ class SiteScraper:
         your own risk.
 
     Attributes:
-        count (int): number of airfoils to scrape (-1 for all available).
+        count (int): number of airfoils to scrape (-1 for all available),
+            in the shard if any.
         output (str): output file path.
         timeout (int): request timeout in seconds (-1 for no timeout).
-        limit (int): simultaneous requests limit.
+        limit (int | str): simultaneous requests limit, or "auto" for
+            adaptive concurrency.
         verbose (bool): verbose mode.
+        host_limit (dict[str, int]): simultaneous requests limit per host.
+        ttl (int): seconds after which cached entries are revalidated (-1 for
+            never).
+        retries (int): maximum number of retries per URL.
+        min_limit (int): minimum simultaneous requests limit in adaptive mode.
+        max_limit (int): maximum simultaneous requests limit in adaptive mode.
+        format (str): output format (json, compact or ndjson).
+        dataset (str | None): binary contour dataset directory path.
+        metrics (bool): whether to compute geometry metrics of the exported
+            dataset.
+        stats (str | None): run metrics file path (.json, .prom or .txt).
+        stats_interval (float): seconds between run metrics snapshots (0 for
+            a final snapshot only).
+        incremental (bool): whether to only scrape entries that were added
+            or changed since the previous run, and patch the previous output.
+        filter (Predicate | None): entry selection predicate, called with
+            the airfoil ID and the parsed entry record.
+        shard (Shard | None): crawl shard, if only a part of the catalogue
+            is scraped. Output, dataset, metrics and cache paths are then
+            shard-local.
+        files (str | None): directory downloaded files are streamed to, or
+            None to embed Selig Format contours in the output.
+        formats (tuple[str, ...] | None): download formats streamed to
+            `files`, or None for every available format.
+        resume (bool): whether to resume the previous run with the same
+            output file from its checkpoint.
+        sources (SourceRegistry): enabled sources.
+        registry (MetricsRegistry): run metrics registry.
         cache (Cache): cache instance.
+        failed (dict[str, list[str]]): URLs that failed during `records`,
+            grouped by exception name.
     """
 
     def __init__(
@@ -47,8 +92,29 @@ class SiteScraper:
         count: int,
         output: str,
         timeout: int,
-        limit: int,
-        verbose: bool
+        limit: int | str,
+        verbose: bool,
+        host_limit: dict[str, int] | None = None,
+        ttl: int = -1,
+        retries: int = 3,
+        min_limit: int = 2,
+        max_limit: int = 100,
+        format: str = "json",
+        dataset: str | None = None,
+        metrics: bool = False,
+        stats: str | None = None,
+        stats_interval: float = 0,
+        incremental: bool = False,
+        filter: Predicate | None = None,
+        shard: Shard | None = None,
+        files: str | None = None,
+        formats: tuple[str, ...] | None = SELIG,
+        cache: str = ".bfscrapercache",
+        cache_size: int | None = None,
+        cache_age: float | None = None,
+        eviction: str = "lru",
+        resume: bool = False,
+        sites: tuple[str, ...] = (BigFoil.NAME,)
     ) -> None:
         """Initialize a SiteScraper instance.
 
@@ -56,18 +122,128 @@ class SiteScraper:
             count (int): number of airfoils to scrape (-1 for all available).
             output (str): output file path.
             timeout (int): request timeout in seconds (-1 for no timeout).
-            limit (int): simultaneous requests limit.
+            limit (int | str): simultaneous requests limit, or "auto" for
+                adaptive concurrency.
             verbose (bool): verbose mode.
+            host_limit (dict[str, int] | None): simultaneous requests limit
+                per host. Defaults to None.
+            ttl (int): seconds after which cached entries are revalidated
+                (-1 for never). Defaults to -1.
+            retries (int): maximum number of retries per URL. Defaults to 3.
+            min_limit (int): minimum simultaneous requests limit in adaptive
+                mode. Defaults to 2.
+            max_limit (int): maximum simultaneous requests limit in adaptive
+                mode. Defaults to 100.
+            format (str): output format (json, compact or ndjson). Defaults
+                to "json".
+            dataset (str | None): binary contour dataset directory path, or
+                None to skip the export. Defaults to None.
+            metrics (bool): whether to compute geometry metrics of the
+                exported dataset. Defaults to False.
+            stats (str | None): run metrics file path (.json, .prom or
+                .txt), or None to skip the export. Defaults to None.
+            stats_interval (float): seconds between run metrics snapshots (0
+                for a final snapshot only). Defaults to 0.
+            incremental (bool): whether to only scrape entries that were
+                added or changed since the previous run, and patch the
+                previous output. Incompatible with `count` and `filter`, as
+                unselected entries would count as removed. Defaults to
+                False.
+            filter (Predicate | None): entry selection predicate (such as
+                an EntryFilter), called with the airfoil ID and the parsed
+                entry before any of its pages is requested. `count` applies
+                to the selected entries. Defaults to None (all entries).
+            shard (Shard | None): crawl shard. If given, only the airfoils of
+                the shard are scraped, `count` is split across the shards
+                and the output, dataset, metrics and cache paths are made
+                shard-local. Defaults to None (the whole catalogue).
+            files (str | None): directory to stream downloaded files to,
+                named after their contents. Records then keep the path, size
+                and hash of every file under "files" instead of the Selig
+                Format contour under "dat". Defaults to None.
+            formats (tuple[str, ...] | None): download formats (download
+                link names) to stream to `files`, or None for every
+                available format. Defaults to the Selig Format DAT file.
+            cache (str): cache file path, made shard-local along with the
+                output. Defaults to ".bfscrapercache".
+            cache_size (int | None): maximum size of the cached values in
+                bytes, enforced when the cache is closed. Defaults to None
+                (no limit).
+            cache_age (float | None): seconds after which cached values are
+                evicted. Defaults to None (no limit).
+            eviction (str): cache eviction order, "lru" or "oldest".
+                Defaults to "lru".
+            resume (bool): whether to resume the previous run with the same
+                output file, which was interrupted or left failed entries,
+                from its checkpoint. Completed entries are written as they
+                were, and only the pending and failed ones are scraped.
+                Incompatible with `incremental`. Defaults to False.
+            sites (tuple[str, ...]): names of the sources to scrape, in
+                priority order. Their tables are read concurrently, their
+                entries share one pipeline and airfoils listed by several
+                of them are scraped once, by the first source that lists
+                them, with the table data of all of them. Defaults to
+                BigFoil only.
         """
+        if incremental and (count != -1 or filter is not None):
+            raise ValueError(
+                "incremental runs must select every entry (no count or"
+                " filter)."
+            )
+        if incremental and resume:
+            raise ValueError("incremental runs cannot be resumed.")
+
         self.count = count
         self.output = output
         self.timeout = timeout
         self.limit = limit
         self.verbose = verbose
-
-        self.cache = Cache(".bfscrapercache")
-
-        Logger.ENABLED = self.verbose
+        self.host_limit = host_limit or {}
+        self.ttl = ttl
+        self.retries = retries
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.format = format
+        self.dataset = dataset
+        self.metrics = metrics
+        self.stats = stats
+        self.stats_interval = stats_interval
+        self.incremental = incremental
+        self.filter = filter
+        self.shard = shard
+        self.files = files
+        self.formats = formats
+        self.resume = resume
+        self.sources = SourceRegistry(sites)
+        if shard is not None:
+            self.count = shard.share(count)
+            self.output = shard.path(output)
+            self.dataset = dataset and shard.path(dataset)
+            self.stats = stats and shard.path(stats)
+        self.registry = MetricsRegistry()
+        self._limiter: AdaptiveLimiter | None = None
+        self._writer: OutputWriter | None = None
+        self._dataset: Any = None
+        self._data_bytes = 0
+        self._index: dict[str, str] = {}
+        self._previous: dict[str, str] = {}
+        self._delta: tuple[set[str], set[str], set[str]] | None = None
+        self._incomplete: set[str] = set()
+        self._carried = 0
+        self._checkpoint: Checkpoint | None = None
+        self._pending: dict[str, Record] = {}
+        self._selecting = False
+        self._held: list[str] = []
+
+        self.failed: dict[str, list[str]] = {}
+
+        self.cache = Cache(
+            cache if shard is None else shard.path(cache),
+            ttl=self.ttl,
+            max_size=cache_size,
+            max_age=cache_age,
+            eviction=eviction
+        )
 
     def timing(method: Any) -> Any:
         """Timing decorator.
@@ -89,185 +265,654 @@ class SiteScraper:
             result = method(self, *args, **kw)
             te = perf_counter()
 
+            self.registry.histogram(
+                "bfscraper_stage_seconds", "Scraping stage duration."
+            ).observe(te - ts, stage=method.__name__.strip("_"))
             Logger.success(f"Elapsed: {te - ts:.2f}s")
             return result
 
         return wrap
 
-    @staticmethod
-    def get_file_url(url_id: str) -> str:
-        """Get file URL from airfoil ID.
-
-        Args:
-            url_id (str): airfoil URL ID.
+    @property
+    def _index_key(self) -> str:
+        """Get the cache key of the output file's table index.
 
         Returns:
-            str: airfoil data URL.
+            str: table index cache key.
         """
-        return f"{AsyncScraper.BASE_URL}/D/{url_id}_infoDAT.php"
+        return Cache.INDEX_PREFIX + os.path.abspath(self.output)
 
-    @staticmethod
-    def parseFloat(string: str) -> float | None:
-        """Parse a string to a float.
+    @timing
+    def _diff_entries(self, data: dict[str, Record]) -> dict[str, Record]:
+        """Select the parsed entries that changed since the previous run.
+
+        Every entry is hashed and compared with the table index stored in
+        the cache by the previous run with the same output file. Cached data
+        of changed and removed entries is dropped, so they are downloaded
+        again.
 
         Args:
-            string (str): string to parse.
+            data (dict[str, Record]): parsed data.
 
         Returns:
-            float | None: parsed float or None if the string is not a float.
+            dict[str, Record]: added and changed parsed entries.
         """
-        try:
-            return float(string)
-        except Exception:
-            return None
+        Logger.info("Comparing database entries with the previous run...")
+        # Entries are hashed in their output form, as in previous versions:
+        self._index = {
+            key: digest(entry.to_dict()) for key, entry in data.items()
+        }
+        # Without the previous output there is nothing to patch:
+        self._previous = self.cache.get(
+            self._index_key, {}
+        ) if os.path.exists(self.output) else {}
+
+        added, changed, removed = self._delta = diff(
+            self._previous, self._index
+        )
+        for key in changed | removed:
+            self.cache.delete(key)
+
+        Logger.info(
+            f"{len(added)} added, {len(changed)} changed, {len(removed)}"
+            f" removed and {len(self._index) - len(added) - len(changed)}"
+            " unchanged entries."
+        )
+        return {
+            key: entry for key, entry in data.items()
+            if key in added or key in changed
+        }
 
     @timing
-    def _fetch_entries(self) -> requests.Response:
-        """Fetch database entries.
+    def _fetch_entries(self) -> dict[str, Record]:
+        """Fetch, parse and select every database entry.
 
         Returns:
-            requests.Response: response object.
+            dict[str, Record]: parsed data.
         """
         Logger.info("Fetching database entries...")
-        return requests.get(AsyncScraper.TABLE_URL)
+        return asyncio.run(self._collect_entries())
+
+    async def _collect_entries(self) -> dict[str, Record]:
+        """Fetch, parse and select every database entry over a new session.
+
+        Returns:
+            dict[str, Record]: parsed data.
+        """
+        tables = len(self.sources.sources)
+        async with AsyncScraper.create_session(
+            self.timeout, tables, self.registry
+        ) as session:
+            retry = RetryPolicy(retries=self.retries)
+            return {
+                key: entry async for key, entry in self._select_entries(
+                    self.sources.entries(lambda stage: stage(
+                        cache=self.cache,
+                        timeout=self.timeout,
+                        limit=tables,
+                        progress_bar=False,
+                        session=session,
+                        retry=retry,
+                        registry=self.registry
+                    ), self.files is not None)
+                )
+            }
+
+    async def _stream_entries(
+        self,
+        scraper: Callable[[type[AsyncScraper]], AsyncScraper],
+        data: dict[str, Record]
+    ) -> AsyncIterator[str]:
+        """Feed database entries to the pipeline as they are received.
+
+        Args:
+            scraper (Callable[[type[AsyncScraper]], AsyncScraper]): pipeline
+                scraper factory.
+            data (dict[str, Record]): parsed data, to which every entry is
+                added.
+
+        Entries left pending by a resumed run are fed first. The data tables
+        are then only fetched if the resumed run had not received all of
+        them, and entries it already selected are skipped. Completed entries
+        of multi-source runs are held until every table has been read, so
+        that no table data is merged into an entry after it is output.
+
+        Yields:
+            str: airfoil ID.
+        """
+        checkpoint = self._checkpoint
+        for key in list(self._pending):
+            data[key] = self._pending.pop(key)
+            yield key
+
+        if checkpoint is None:
+            seen = set()
+        elif checkpoint.meta.get("table"):
+            return
+        else:
+            seen = {key for key, _, _ in checkpoint.entries()}
+
+        self._selecting = True
+        try:
+            async for key, entry in self._select_entries(
+                self.sources.entries(scraper, self.files is not None), seen
+            ):
+                data[key] = entry
+                if checkpoint is not None:
+                    checkpoint.update(key, Checkpoint.PARSED, entry)
+                yield key
+        finally:
+            self._selecting = False
+
+        if checkpoint is not None:
+            checkpoint.set_meta(table=True)
+
+    async def _select_entries(
+        self,
+        entries: AsyncIterator[tuple[str, Record]],
+        seen: set[str] | None = None
+    ) -> AsyncIterator[tuple[str, Record]]:
+        """Select parsed database entries as they are received.
+
+        Entries rejected by the shard or the filter are dropped here, so they
+        never cost a cache lookup or a request. Entries repeating an airfoil
+        key are dropped as well, since entries are keyed by it. The table
+        downloads stop as soon as `count` entries are selected.
+
+        Args:
+            entries (AsyncIterator[tuple[str, Record]]): parsed database
+                entries.
+            seen (set[str] | None): airfoil IDs selected by a previous run,
+                which are skipped and count towards `count`. Defaults to
+                None.
+
+        Yields:
+            tuple[str, Record]: airfoil ID and parsed entry.
+        """
+        seen = set() if seen is None else seen
+        selected = len(seen)
+        async with aclosing(entries):
+            while selected != self.count:
+                item = await anext(entries, None)
+                if item is None:
+                    break
+
+                if item[0] in seen:
+                    continue
+                seen.add(item[0])
+                if self.shard is not None and not self.shard(*item):
+                    continue
+                if self.filter is not None and not self.filter(*item):
+                    continue
+
+                selected += 1
+                yield item
+
+        if self.filter is not None and self.verbose:
+            Logger.info(f"{selected} entries match the filter.")
 
     @timing
-    def _parse_entries(self, request: requests.Response) -> dict:
-        """Parse database entries.
+    def _scrape_airfoils(
+        self,
+        data: dict[str, Record] | None = None
+    ) -> None:
+        """Scrape airfoil data asynchronously and save it as it completes.
+
+        Both stages run as a single streaming pipeline over one session, so
+        each airfoil is downloaded as soon as its download links are known,
+        and written to the output file (and released from memory) as soon as
+        it is downloaded. Without parsed data, the data table is fetched over
+        the same session and its entries are fed to the pipeline as they are
+        received.
+
+        Streamed runs keep a checkpoint next to the output file, with the
+        state of every entry, so that they can be resumed if they are
+        interrupted or some of their entries fail.
 
         Args:
-            request (requests.Response): response object.
+            data (dict[str, Record] | None): parsed data. Defaults to None
+                (stream the data table).
+        """
+        if data is None:
+            Logger.info("Scraping airfoils as database entries arrive...")
+            data = {}
+            entries = partial(self._stream_entries, data=data)
+            self._checkpoint = self._open_checkpoint()
+        else:
+            Logger.info(f"Scraping {len(data)} airfoils...")
+            entries = None
+
+        if self.dataset is not None:
+            # NumPy is an optional dependency, only needed for this export:
+            from ..geometry.dataset import DatasetWriter
+            self._dataset = DatasetWriter(self.dataset)
+
+        # The output is built next to the previous one and only moved over it
+        # once the run succeeds, so failed runs leave it untouched:
+        output = f"{self.output}.tmp"
+        try:
+            with OutputWriter(output, self.format) as self._writer:
+                if self._checkpoint is not None:
+                    self._restore_records()
+                self._pipeline(
+                    on_complete=lambda entry: self._save_records(
+                        self._release(entry), data
+                    ),
+                    on_stage=lambda _, entry: self._checkpoint.update(
+                        entry, Checkpoint.LINKS, data[entry]
+                    ) if self._checkpoint is not None else None
+                ).scrape(data, entries)
+                self._save_records(self._release(), data)
+
+                if self._delta is not None:
+                    self._carry_records()
+        except BaseException:
+            if os.path.exists(output):
+                os.remove(output)
+            if self._dataset is not None:
+                self._dataset.discard()
+            # The checkpoint is kept, so the run can be resumed:
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+            raise
+
+        os.replace(output, self.output)
+        if self._checkpoint is not None:
+            self._close_checkpoint()
+        if self._delta is not None:
+            self._save_index()
+
+        if self._dataset is not None:
+            self._dataset.close()
+        with self.registry.histogram(
+            "bfscraper_cache_save_seconds", "Cache save duration."
+        ).time():
+            self.cache.save()
+
+    def _open_checkpoint(self) -> Checkpoint:
+        """Open the checkpoint of the run.
+
+        Resumed runs keep the stored progress, unless there is none or it
+        belongs to a run with different settings, including a different
+        selection of entries.
 
         Returns:
-            dict: parsed data.
+            Checkpoint: run checkpoint.
         """
-        Logger.info("Parsing database entries...")
-        return {
-            (
-                # Get airfoil ID from URL content:
-                id_ := re.findall(
-                    r"airfoil=([\d\w-]+)",
-                    entry["Link"],
-                    flags=AsyncScraper.REGEX_FLAGS
-                )[0]
-            ): {
-                "name": entry["Name"],
-                "family": entry["Family"],
-                # Process info and file download links:
-                "links": {
-                    "info": re.findall(
-                        r"(http.+?)\"",
-                        entry["Link"],
-                        flags=AsyncScraper.REGEX_FLAGS
-                    )[0],
-                    "files": self.get_file_url(id_)
-                },
-                # Add containers for next step's download links and data:
-                "download-links": {},
-                "dat": {},
-                "data-sources": [
-                    source.strip() for source in
-                    entry["Data Sources"].split(" ")
-                ],
-                # Extract top-level data directly from the table:
-                "optimizations": {
-                    "thickness": self.parseFloat(entry["Thickness"]),
-                    "x-thickness": self.parseFloat(entry["x Thickness"]),
-                    "camber": self.parseFloat(entry["Camber"]),
-                    "LD-Max": self.parseFloat(entry["LD Max"]),
-                    "Cl-Max": self.parseFloat(entry["Cl Max"]),
-                    "CdCl01": self.parseFloat(entry["CdCl01"]),
-                    "CdCl04": self.parseFloat(entry["CdCl04"]),
-                    "CdCl06": self.parseFloat(entry["CdCl06"])
-                }
-            }
-            # Limit the number of entries to parse:
-            for entry in (
-                request.json()[:self.count]
-                if self.count >= 0
-                else request.json()
-            )
+        filename = f"{self.output}.checkpoint"
+        settings = {
+            "count": self.count, "files": self.files, "formats": self.formats,
+            "sites": self.sources.names,
+            "filter": None if self.filter is None else describe(self.filter),
+            "shard": None if self.shard is None else str(self.shard)
         }
+        resume = self.resume and os.path.exists(filename)
+        if self.resume and not resume:
+            Logger.warning(
+                f"No checkpoint found at {filename}, starting over."
+            )
 
-    @timing
-    def _scrape_urls(self, data: dict) -> dict:
-        """Scrape download URLs asynchronously.
+        checkpoint = Checkpoint(filename, resume)
+        if resume and {
+            key: checkpoint.meta.get(key) for key in settings
+        } != settings:
+            Logger.warning(
+                f"{filename} belongs to a run with different settings,"
+                " starting over."
+            )
+            checkpoint.discard()
+            checkpoint = Checkpoint(filename)
+
+        checkpoint.set_meta(**settings)
+        checkpoint.flush()
+        return checkpoint
+
+    def _restore_records(self) -> None:
+        """Restore the progress of a resumed run from its checkpoint.
+
+        Completed records are written to the output file as they were, and
+        the rest are kept to be fed to the pipeline first.
+        """
+        failed = []
+        for entry, state, record in self._checkpoint.entries():
+            if state == Checkpoint.DONE:
+                self._write_record(entry, record)
+                continue
+
+            if state == Checkpoint.FAILED:
+                failed.append(entry)
+            self._pending[entry] = record
+
+        if not self._writer.records and not self._pending:
+            return
+
+        Logger.info(
+            f"Resuming run: {self._writer.records} entries done and"
+            f" {len(self._pending)} pending."
+        )
+        if failed:
+            Logger.info(
+                f"Retrying {len(failed)} failed entries: {', '.join(failed)}."
+            )
+
+    def _close_checkpoint(self) -> None:
+        """Close the checkpoint of a completed run.
+
+        The checkpoint is only kept if some entries failed, so that they can
+        be retried by resuming the run.
+        """
+        if not self._incomplete:
+            self._checkpoint.discard()
+            return
+
+        self._checkpoint.close()
+        Logger.warning(
+            f"{len(self._incomplete)} entries failed. Run again with"
+            " --resume to retry them."
+        )
+
+    def _pipeline(
+        self,
+        on_complete: Callable[[str], None] | None = None,
+        on_stage: Callable[[int, str], None] | None = None
+    ) -> Pipeline:
+        """Build the airfoil scraping pipeline.
+
+        The stages of every enabled source share the pipeline, and thus its
+        session, scheduler and limits. Every source host gets a concurrency
+        budget of `limit` (unless set in `host_limit`), and the connection
+        pool grows with the number of sources.
 
         Args:
-            data (dict): parsed data.
+            on_complete (Callable[[str], None] | None): callback for every
+                scraped airfoil ID. Defaults to None.
+            on_stage (Callable[[int, str], None] | None): callback for every
+                airfoil ID that leaves a stage other than the last, with the
+                stage index. Defaults to None.
 
         Returns:
-            dict: scraped data.
+            Pipeline: scraping pipeline.
         """
-        Logger.info(f"Scraping {len(data)} URLs...")
-        DownloadLinksExtractor(
+        if self.limit == "auto":
+            self._limiter = AdaptiveLimiter(self.min_limit, self.max_limit)
+
+        limit = self.max_limit if self._limiter else self.limit
+        return Pipeline(
+            stages=self.sources.stages(self.files, self.formats),
             cache=self.cache,
             timeout=self.timeout,
-            limit=self.limit,
-            progress_bar=self.verbose
-        ).scrape(data)
-        self.cache.save()
-        return data
+            limit=limit * len(self.sources.sources),
+            progress_bar=self.verbose,
+            hosts=HostLimiter({
+                **self.sources.budgets(limit), **self.host_limit
+            }),
+            retry=RetryPolicy(retries=self.retries),
+            limiter=self._limiter,
+            on_complete=on_complete,
+            registry=self.registry,
+            on_stage=on_stage
+        )
 
-    @timing
-    def _download_airfoils(self, data: dict) -> dict:
-        """Download all fetched and parsed airfoil data asynchronously.
+    async def records(
+        self,
+        session: aiohttp.ClientSession | None = None
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """Scrape airfoils on the running event loop and yield them.
+
+        Records are yielded as soon as they are scraped, with backpressure:
+        scraping pauses while the consumer is busy and more than a few
+        records are waiting. Nothing is written to the output file or the
+        dataset, failed URLs are gathered in `failed` instead of printed,
+        and the cache is saved (but not closed) when the iteration ends.
+
+        Args:
+            session (aiohttp.ClientSession | None): session to use, which is
+                left open. Defaults to None (a session owned by the
+                scraper).
+
+        Yields:
+            tuple[str, dict]: airfoil ID and record.
+        """
+        data: dict[str, Record] = {}
+        pipeline = self._pipeline()
+        try:
+            async with aclosing(pipeline.iterate(
+                data, partial(self._stream_entries, data=data), session
+            )) as entries:
+                async for entry in entries:
+                    for key in self._release(entry):
+                        yield key, data.pop(key).to_dict()
+
+            for key in self._release():
+                yield key, data.pop(key).to_dict()
+        finally:
+            for exception, urls in pipeline.failed.items():
+                self.failed.setdefault(exception, []).extend(urls)
+            await self.cache.call(self.cache.save)
+
+    def _release(self, entry: str | None = None) -> list[str]:
+        """Get the completed entries that can be output.
+
+        Completed entries are held while a multi-source run is still reading
+        data tables, since other sources may list them too.
 
         Args:
-            data (dict): scraped data.
+            entry (str | None): completed airfoil ID. Defaults to None.
 
         Returns:
-            dict: downloaded data.
+            list[str]: airfoil IDs to output, in completion order.
         """
-        Logger.info(f"Downloading {len(data)} airfoils...")
-        DownloadDataExtractor(
-            cache=self.cache,
-            timeout=self.timeout,
-            limit=self.limit,
-            progress_bar=self.verbose
-        ).scrape(data)
-        self.cache.save()
-        return data
+        if entry is not None:
+            self._held.append(entry)
+        if self._selecting and len(self.sources.sources) > 1:
+            return []
 
-    @timing
-    def _save_data(self, data: dict) -> None:
-        """Save downloaded data to a JSON file.
+        released, self._held = self._held, []
+        return released
+
+    def _save_records(
+        self,
+        entries: list[str],
+        data: dict[str, Record]
+    ) -> None:
+        """Write completed records to the output file and checkpoint them.
 
         Args:
-            data (dict): downloaded data.
+            entries (list[str]): airfoil IDs.
+            data (dict[str, Record]): parsed data.
         """
-        Logger.info("Saving data...")
-        with open(self.output, "w") as f:
-            json.dump(data, f, indent=4)
+        for entry in entries:
+            self._save_record(entry, data)
+
+    def _save_record(self, entry: str, data: dict[str, Record]) -> None:
+        """Write a completed record to the output file and checkpoint it.
+
+        Args:
+            entry (str): airfoil ID.
+            data (dict[str, Record]): parsed data.
+        """
+        record = data.pop(entry)
+        self._write_record(entry, record)
+        complete = self._is_complete(record)
+        if not complete:
+            self._incomplete.add(entry)
+
+        if self._checkpoint is not None:
+            self._checkpoint.update(
+                entry,
+                Checkpoint.DONE if complete else Checkpoint.FAILED,
+                record
+            )
 
-    def _print_summary(self, data: dict) -> None:
-        """Print scraping summary.
+    def _write_record(self, entry: str, record: Record) -> None:
+        """Write a record to the output file and the dataset.
 
         Args:
-            data (dict): downloaded data.
+            entry (str): airfoil ID.
+            record (Record): airfoil data.
         """
-        data_bytes = sum(
-            sys.getsizeof(entry["dat"])
-            for entry in data.values()
+        self._data_bytes += sum(
+            file["size"] for file in record.files.values()
+        ) if record.files is not None else len(record.dat or "")
+        self._writer.write(entry, record.to_dict())
+
+        if self._dataset is not None:
+            self._export_contour(entry, record)
+
+    def _is_complete(self, record: Record) -> bool:
+        """Check whether every requested download of a record succeeded.
+
+        Args:
+            record (Record): airfoil data.
+
+        Returns:
+            bool: True if the record is complete.
+        """
+        if record.files is None:
+            return record.dat is not None
+
+        links = record.download_links
+        return bool(links) and all(
+            format in record.files
+            for format in (links if self.formats is None else self.formats)
+            if links.get(format)
         )
-        metadata_bytes = sys.getsizeof(json.dumps(data, indent=4))
 
+    def _export_contour(self, entry: str, record: Record) -> None:
+        """Write the contour of a record to the dataset.
+
+        Args:
+            entry (str): airfoil ID.
+            record (Record): airfoil data.
+        """
+        if record.files is not None:
+            selig = record.files.get(SELIG[0])
+            if selig is None:
+                return
+
+            with open(
+                os.path.join(self.files, selig["path"]), encoding="utf-8"
+            ) as fp:
+                self._dataset.write_record(
+                    entry, {**record.to_dict(), "dat": fp.read()}
+                )
+            return
+
+        self._dataset.write_record(entry, record.to_dict())
+
+    def _carry_records(self) -> None:
+        """Copy unchanged records from the previous output."""
+        added, changed, _ = self._delta
+        if not os.path.exists(self.output):
+            return
+
+        scraped = added | changed
+        for entry, record in OutputWriter.read(self.output, self.format):
+            if entry in self._index and entry not in scraped:
+                self._writer.write(entry, record)
+                self._carried += 1
+                if self._dataset is not None:
+                    self._export_contour(entry, record)
+
+    def _save_index(self) -> None:
+        """Store the table index for the next incremental run.
+
+        Entries that could not be scraped keep their previous hash (or none,
+        if they are new), so they are selected again by the next run.
+        """
+        index = dict(self._index)
+        for entry in self._incomplete:
+            if entry in self._previous:
+                index[entry] = self._previous[entry]
+            else:
+                index.pop(entry, None)
+
+        self.cache.set(self._index_key, index)
+
+    @timing
+    def _analyze_dataset(self) -> None:
+        """Compute and check geometry metrics of the exported dataset."""
+        self.analyze_dataset(self.dataset)
+
+    @staticmethod
+    def analyze_dataset(path: str) -> None:
+        """Compute and check geometry metrics of a dataset.
+
+        Args:
+            path (str): dataset directory path.
+        """
+        from ..geometry.dataset import Dataset
+        from ..geometry.metrics import CHECKED, analyze
+
+        Logger.info("Computing geometry metrics...")
+        dataset = Dataset(path)
+        _, flags = analyze(dataset)
+
+        for index in flags.any(axis=1).nonzero()[0]:
+            Logger.warning(
+                f"{dataset.ids[index]}: computed "
+                + ", ".join(
+                    field for field, flag in zip(CHECKED, flags[index])
+                    if flag
+                )
+                + " disagree with the table."
+            )
+
+    def _print_summary(self) -> None:
+        """Print scraping summary."""
         Logger.success(
-            f"Scraped {len(data)} airfoils with a total size of"
-            f" {size(data_bytes)} ({size(metadata_bytes)} including metadata)."
+            f"Scraped {self._writer.records} airfoils with a total size of"
+            f" {size(self._data_bytes)} ({size(self._writer.bytes)} including"
+            " metadata)."
         )
 
+        if self._delta is not None:
+            scraped = self._writer.records - self._carried
+            Logger.info(
+                f"Patched {self.output}: {scraped} entries scraped,"
+                f" {self._carried} kept and {len(self._delta[2])} removed."
+            )
+
+        if self._dataset is not None:
+            Logger.info(
+                f"Exported {self._dataset.count} contours"
+                f" ({self._dataset.points} points) to {self.dataset}."
+            )
+
+        if self._limiter is not None:
+            Logger.info(self._limiter.summary())
+
     def run(self) -> None:
         """Run the scraper.
 
         This method is responsible for performing every step of the scraping
         process, from fetching the database entries to saving the downloaded
-        data to a JSON file.
+        data to the output file.
         """
+        Logger.ENABLED = self.verbose
         Logger.info("Running scraper...")
-        request = self._fetch_entries()
-        data = self._parse_entries(request)
-        data = self._scrape_urls(data)
-        data = self._download_airfoils(data)
-        self._save_data(data)
-        self._print_summary(data)
+        with (
+            MetricsExporter(self.registry, self.stats, self.stats_interval)
+            if self.stats is not None else nullcontext()
+        ):
+            try:
+                # Incremental runs need the whole table to find removed
+                # entries:
+                if self.incremental:
+                    self._scrape_airfoils(self._diff_entries(
+                        self._fetch_entries()
+                    ))
+                else:
+                    self._scrape_airfoils()
+                if self.dataset is not None and self.metrics:
+                    self._analyze_dataset()
+                self._print_summary()
+            finally:
+                # Failed and interrupted runs keep their pending writes too:
+                with self.registry.histogram(
+                    "bfscraper_cache_save_seconds", "Cache save duration."
+                ).time():
+                    self.cache.close()
+
+        if self.stats is not None:
+            Logger.info(f"Run metrics written to {self.stats}.")
@@ -0,0 +1,496 @@
+"""Scraping sources module.
+
+A source is a plugin that describes one site: where its data table is, how
+every table row is parsed into a record keyed by a canonical airfoil key,
+and which extractors scrape every entry. BigFoil is the only built-in
+source, and other sites are added as plugins. Sources are registered by name,
+either with the `register` decorator or through the "bfscraper.sources"
+entry point group of an installed package:
+
+    @register
+    class Mirror(BigFoil):
+        NAME = "mirror"
+        BASE_URL = "https://mirror.example.com"
+        TABLE_URL = f"{BASE_URL}/bigtable1.json"
+
+A `SourceRegistry` runs the enabled sources together: their tables are read
+concurrently and merged by airfoil key, and their entries go through a
+single pipeline, so every source shares one scheduler and connection pool.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import asyncio
+from importlib.metadata import entry_points
+from typing import Any, AsyncIterator, Callable, Iterable
+from urllib.parse import urlsplit
+
+import regex as re
+
+from .async_components import (AsyncScraper, DownloadDataExtractor,
+                               DownloadFilesExtractor, DownloadLinksExtractor,
+                               TableExtractor)
+from .records import Record
+
+SOURCES: dict[str, type["Source"]] = {}
+ENTRY_POINTS = "bfscraper.sources"
+
+
+def register(source: type["Source"]) -> type["Source"]:
+    """Register a source class under its name.
+
+    Args:
+        source (type[Source]): source class.
+
+    Returns:
+        type[Source]: registered source class.
+    """
+    SOURCES[source.NAME] = source
+    return source
+
+
+class Source:
+    """Base scraping source class.
+
+    Attributes:
+        NAME (str): source name.
+        BASE_URL (str): base site URL.
+        TABLE_URL (str): data table URL.
+    """
+
+    NAME = ""
+    BASE_URL = ""
+    TABLE_URL = ""
+
+    @property
+    def hosts(self) -> set[str]:
+        """Get the hosts the source sends requests to.
+
+        Returns:
+            set[str]: host names.
+        """
+        return {
+            urlsplit(url).hostname or ""
+            for url in (self.BASE_URL, self.TABLE_URL)
+        }
+
+    @staticmethod
+    def canonical(identifier: str) -> str:
+        """Get the canonical airfoil key of an identifier.
+
+        Keys are lowercase, with every run of other characters than word
+        characters and hyphens replaced by a hyphen, so that sources naming
+        the same airfoil differently are merged. BigFoil (and AirfoilTools)
+        airfoil IDs are canonical keys already.
+
+        Args:
+            identifier (str): airfoil identifier.
+
+        Returns:
+            str: canonical airfoil key.
+        """
+        return re.sub(r"[^\w-]+", "-", identifier.strip().lower())
+
+    def table(self) -> type[TableExtractor]:
+        """Get the data table fetcher of the source.
+
+        Returns:
+            type[TableExtractor]: data table extractor class.
+        """
+        return TableExtractor.configure(self.TABLE_URL)
+
+    def stages(
+        self,
+        files: str | None,
+        formats: tuple[str, ...] | None
+    ) -> list[type[AsyncScraper]]:
+        """Get the per-entry extractors of the source, in order.
+
+        Args:
+            files (str | None): directory to stream downloaded files to, or
+                None to embed Selig Format contours in the records.
+            formats (tuple[str, ...] | None): download formats to stream to
+                `files`, or None for every available format.
+
+        Returns:
+            list[type[AsyncScraper]]: extractor classes.
+        """
+        return [
+            DownloadLinksExtractor,
+            DownloadDataExtractor if files is None
+            else DownloadFilesExtractor.configure(files, formats)
+        ]
+
+    def parse(
+        self,
+        row: dict[str, Any],
+        files: bool = False
+    ) -> tuple[str, Record]:
+        """Parse a data table row.
+
+        Args:
+            row (dict[str, Any]): data table row.
+            files (bool): whether files are streamed to disk. Defaults to
+                False.
+
+        Returns:
+            tuple[str, Record]: canonical airfoil key and parsed entry.
+        """
+        raise NotImplementedError
+
+
+@register
+class BigFoil(Source):
+    """BigFoil source class.
+
+    Its data table also covers the AirfoilTools catalogue.
+    """
+
+    NAME = "bigfoil"
+    BASE_URL = "https://bigfoil.com"
+    TABLE_URL = f"{BASE_URL}/bigtable1.json"
+
+    def get_file_url(self, url_id: str) -> str:
+        """Get file URL from airfoil ID.
+
+        Args:
+            url_id (str): airfoil URL ID.
+
+        Returns:
+            str: airfoil data URL.
+        """
+        return f"{self.BASE_URL}/D/{url_id}_infoDAT.php"
+
+    @staticmethod
+    def get_entry_id(entry: dict[str, str]) -> str:
+        """Get airfoil ID from a database entry.
+
+        Args:
+            entry (dict[str, str]): database table row.
+
+        Returns:
+            str: airfoil ID.
+        """
+        return re.findall(
+            r"airfoil=([\d\w-]+)",
+            entry["Link"],
+            flags=AsyncScraper.REGEX_FLAGS
+        )[0]
+
+    @staticmethod
+    def parseFloat(string: str) -> float | None:
+        """Parse a string to a float.
+
+        Args:
+            string (str): string to parse.
+
+        Returns:
+            float | None: parsed float or None if the string is not a float.
+        """
+        try:
+            return float(string)
+        except Exception:
+            return None
+
+    def parse(
+        self,
+        row: dict[str, Any],
+        files: bool = False
+    ) -> tuple[str, Record]:
+        """Parse a data table row.
+
+        Args:
+            row (dict[str, Any]): data table row.
+            files (bool): whether files are streamed to disk. Defaults to
+                False.
+
+        Returns:
+            tuple[str, Record]: canonical airfoil key and parsed entry.
+        """
+        # Get airfoil ID from URL content:
+        id_ = self.get_entry_id(row)
+        return self.canonical(id_), Record.create(
+            name=row["Name"],
+            family=row["Family"],
+            # Process info and file download links:
+            info=re.findall(
+                r"(http.+?)\"",
+                row["Link"],
+                flags=AsyncScraper.REGEX_FLAGS
+            )[0],
+            page=self.get_file_url(id_),
+            sources=[
+                source.strip() for source in
+                row["Data Sources"].split(" ")
+            ],
+            # Extract top-level data directly from the table:
+            optimizations={
+                "thickness": self.parseFloat(row["Thickness"]),
+                "x-thickness": self.parseFloat(row["x Thickness"]),
+                "camber": self.parseFloat(row["Camber"]),
+                "LD-Max": self.parseFloat(row["LD Max"]),
+                "Cl-Max": self.parseFloat(row["Cl Max"]),
+                "CdCl01": self.parseFloat(row["CdCl01"]),
+                "CdCl04": self.parseFloat(row["CdCl04"]),
+                "CdCl06": self.parseFloat(row["CdCl06"])
+            },
+            files=files,
+            origin=self.NAME
+        )
+
+
+class SourceStage(AsyncScraper):
+    """Pipeline stage that hands every entry to the extractor of its source.
+
+    Attributes:
+        STAGES (dict[str, type[AsyncScraper]]): extractor classes, by
+            source name.
+        DEFAULT (str): name of the source of entries without an origin.
+        scrapers (dict[str, AsyncScraper]): extractors, by source name.
+    """
+
+    STAGES: dict[str, type[AsyncScraper]] = {}
+    DEFAULT = ""
+
+    @classmethod
+    def configure(
+        cls,
+        stages: dict[str, type[AsyncScraper]],
+        default: str
+    ) -> type["SourceStage"]:
+        """Create a stage class over the extractors of several sources.
+
+        The class is named after the extractor of the default source, so
+        stage metrics keep their labels.
+
+        Args:
+            stages (dict[str, type[AsyncScraper]]): extractor classes, by
+                source name.
+            default (str): name of the source of entries without an origin.
+
+        Returns:
+            type[SourceStage]: configured stage class.
+        """
+        return type(stages[default].__name__, (cls,), {
+            "STAGES": stages,
+            "DEFAULT": default
+        })
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize a SourceStage instance.
+
+        Args:
+            **kwargs (Any): AsyncScraper arguments, shared by the extractors
+                of every source.
+        """
+        super().__init__(**kwargs)
+        self.scrapers = {
+            name: stage(**kwargs) for name, stage in self.STAGES.items()
+        }
+
+    @property
+    def failed(self) -> dict[str, list[str]]:
+        """Get failed URLs of every source.
+
+        Returns:
+            dict[str, list[str]]: failed URLs.
+        """
+        failed = {key: list(urls) for key, urls in self._failed.items()}
+        for scraper in self.scrapers.values():
+            for exception, urls in scraper.failed.items():
+                failed.setdefault(exception, []).extend(urls)
+
+        return failed
+
+    @property
+    def retried(self) -> dict[str, int]:
+        """Get URLs of every source that succeeded after being retried.
+
+        Returns:
+            dict[str, int]: retried URLs and their number of retries.
+        """
+        retried = dict(self._retried)
+        for scraper in self.scrapers.values():
+            retried.update(scraper.retried)
+
+        return retried
+
+    async def _process(self, entry: Any, collection: Any) -> None:
+        """Individual asynchronous process.
+
+        Args:
+            entry (Any): data entry.
+            collection (Any): collection to be processed.
+        """
+        await self.scrapers[
+            collection[entry].origin or self.DEFAULT
+        ]._process(entry, collection)
+
+
+class SourceRegistry:
+    """Registry of the sources enabled for a run.
+
+    Attributes:
+        sources (list[Source]): enabled sources, in priority order. The
+            first one is the default source.
+    """
+
+    def __init__(self, names: Iterable[str] = (BigFoil.NAME,)) -> None:
+        """Initialize a SourceRegistry instance.
+
+        Args:
+            names (Iterable[str]): names of the enabled sources, in priority
+                order. Defaults to BigFoil only.
+
+        Raises:
+            ValueError: if no source or an unknown source is given.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            raise ValueError("at least one source must be enabled.")
+
+        if any(name not in SOURCES for name in names):
+            self.load_plugins()
+        unknown = [name for name in names if name not in SOURCES]
+        if unknown:
+            raise ValueError(
+                f"unknown sources: {', '.join(unknown)} (available:"
+                f" {', '.join(sorted(SOURCES))})."
+            )
+
+        self.sources = [SOURCES[name]() for name in names]
+
+    @staticmethod
+    def load_plugins() -> None:
+        """Register the sources of installed plugin packages."""
+        for entry_point in entry_points(group=ENTRY_POINTS):
+            register(entry_point.load())
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Get the names of the enabled sources.
+
+        Returns:
+            tuple[str, ...]: source names, in priority order.
+        """
+        return tuple(source.NAME for source in self.sources)
+
+    def budgets(self, limit: int) -> dict[str, int]:
+        """Get the concurrency budget of every source host.
+
+        Every host of a multi-source run gets `limit` simultaneous requests
+        of its own, so that adding a source adds throughput instead of
+        sharing the same budget. Single-source runs need no budgets.
+
+        Args:
+            limit (int): simultaneous requests limit per source.
+
+        Returns:
+            dict[str, int]: simultaneous requests limit, by host.
+        """
+        if len(self.sources) == 1:
+            return {}
+
+        return {
+            host: limit for source in self.sources for host in source.hosts
+        }
+
+    def stages(
+        self,
+        files: str | None,
+        formats: tuple[str, ...] | None
+    ) -> list[type[AsyncScraper]]:
+        """Get the pipeline stages of the enabled sources.
+
+        Sources with fewer extractors than the others skip the last stages.
+
+        Args:
+            files (str | None): directory to stream downloaded files to, or
+                None to embed Selig Format contours in the records.
+            formats (tuple[str, ...] | None): download formats to stream to
+                `files`, or None for every available format.
+
+        Returns:
+            list[type[AsyncScraper]]: stage classes, in order.
+        """
+        stages = {
+            source.NAME: source.stages(files, formats)
+            for source in self.sources
+        }
+        if len(stages) == 1:
+            return next(iter(stages.values()))
+
+        return [
+            SourceStage.configure({
+                name: extractors[index] if index < len(extractors)
+                else AsyncScraper
+                for name, extractors in stages.items()
+            }, self.sources[0].NAME)
+            for index in range(max(map(len, stages.values())))
+        ]
+
+    async def entries(
+        self,
+        scraper: Callable[[type[AsyncScraper]], AsyncScraper],
+        files: bool = False
+    ) -> AsyncIterator[tuple[str, Record]]:
+        """Fetch and parse the data tables of every source concurrently.
+
+        Entries are yielded as soon as they are received, from any table.
+        An airfoil listed by several sources is yielded once, by the first
+        source that lists it, and the table data of the others is merged
+        into its record (until the record is released by the caller).
+        Consumers that stop early cancel every table download.
+
+        Args:
+            scraper (Callable[[type[AsyncScraper]], AsyncScraper]): factory
+                of scrapers that share the run session and components.
+            files (bool): whether files are streamed to disk. Defaults to
+                False.
+
+        Raises:
+            Exception: if a data table cannot be fetched, once the others
+                have been read.
+
+        Yields:
+            tuple[str, Record]: canonical airfoil key and parsed entry.
+        """
+        entries: asyncio.Queue = asyncio.Queue()
+
+        async def read(source: Source) -> None:
+            try:
+                async for row in scraper(source.table()).rows():
+                    entries.put_nowait(source.parse(row, files))
+            finally:
+                entries.put_nowait(None)
+
+        readers = [
+            asyncio.create_task(read(source)) for source in self.sources
+        ]
+        listed: dict[str, Record] = {}
+        try:
+            pending = len(readers)
+            while pending:
+                item = await entries.get()
+                if item is None:
+                    pending -= 1
+                    continue
+
+                key, record = item
+                # Single-source runs have nothing to merge:
+                if len(readers) == 1:
+                    yield item
+                elif key not in listed:
+                    listed[key] = record
+                    yield item
+                elif listed[key].origin != record.origin:
+                    listed[key].merge(record)
+
+            # Raise the reader errors, if any:
+            for reader in readers:
+                await reader
+        finally:
+            for reader in readers:
+                reader.cancel()
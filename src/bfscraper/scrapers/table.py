@@ -0,0 +1,96 @@
+"""Incremental data table parsing components.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import codecs
+import json
+from typing import Any
+
+import regex as re
+
+
+class TableParser:
+    """Incremental data table parser.
+
+    Consumes the data table (a JSON array of row objects) as raw byte chunks
+    and returns every row as soon as it is complete, so rows can be
+    processed while the rest of the table is still being received. Parsed
+    text is discarded along the way.
+
+    Attributes:
+        rows (int): number of parsed rows.
+        done (bool): whether the end of the table has been parsed.
+        WHITESPACE (re.Pattern): JSON whitespace pattern.
+    """
+
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self) -> None:
+        """Initialize a TableParser instance."""
+        self.rows = 0
+        self.done = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """Parse a chunk of the table.
+
+        Args:
+            chunk (bytes): table chunk.
+
+        Raises:
+            ValueError: if the table is not a JSON array of objects.
+
+        Returns:
+            list[dict[str, Any]]: rows completed by the chunk.
+        """
+        buffer = self._buffer + self._decoder.decode(chunk)
+        position = 0
+        rows = []
+
+        while not self.done:
+            position = self.WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+
+            token = buffer[position]
+            if not self._started:
+                if token != "[":
+                    raise ValueError("The data table is not a JSON array.")
+                self._started = True
+                position += 1
+            elif token == "]":
+                self.done = True
+                position += 1
+            elif token == ",":
+                position += 1
+            else:
+                try:
+                    row, position = self._json.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # The row is incomplete, wait for the next chunk:
+                    break
+
+                if not isinstance(row, dict):
+                    raise ValueError("The data table rows must be objects.")
+                rows.append(row)
+                self.rows += 1
+
+        self._buffer = buffer[position:]
+        return rows
+
+    def close(self) -> None:
+        """Check that the whole table has been parsed.
+
+        Raises:
+            ValueError: if the table is incomplete or malformed.
+        """
+        if not self.done:
+            raise ValueError(
+                f"The data table is incomplete after {self.rows} rows."
+            )
@@ -0,0 +1,509 @@
+"""Indexed scraped output store module.
+
+A store indexes an output file, so it can be queried without loading or
+scanning it. The indexes are kept in a directory next to the output file
+(`scraped.json.store` for `scraped.json`):
+
+- `offsets.bin`: (N, 2) array with the start and end byte offsets of every
+  record in the output file, so single records can be read on their own.
+- `values.bin`: (F, N) array with every optimization field value, in record
+  order (NaN for missing values).
+- `order.bin`: (F, N) array of record positions, sorted by field value, with
+  missing values last.
+- `sorted.bin`: (F, N) array of field values, in `order.bin` order.
+- `metadata.json`: data types, sizes, airfoil IDs, the family hash index and
+  the size and modification time of the indexed output file.
+
+Binary files are opened with `numpy.memmap`. Range queries are answered by
+binary search over the sorted columns, and combined conditions by vectorized
+masks over the value columns. The store requires NumPy, which can be
+installed along with the package through the `store` extra.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import json
+import os
+import re
+from typing import Any, Iterator
+
+import numpy as np
+
+from .tools.filters import EntryFilter
+from .tools.output import OutputWriter
+
+
+class Store:
+    """Indexed scraped output store class.
+
+    Attributes:
+        filename (str): indexed output file path.
+        format (str): output file format.
+        path (str): index directory path.
+        ids (list[str]): airfoil IDs, in record order.
+        families (dict[str, list[int]]): record positions by lowercase
+            family.
+        offsets (np.ndarray): (N, 2) record byte offsets.
+        values (np.ndarray): (F, N) field values, in record order.
+        order (np.ndarray): (F, N) record positions, by field value.
+        sorted (np.ndarray): (F, N) field values, in `order` order.
+        valid (dict[str, int]): number of non-missing values by field.
+        FIELDS (tuple[str, ...]): indexed optimization fields.
+        SUFFIX (str): index directory suffix.
+        METADATA (str): metadata file name.
+        DTYPE (str): field values data type.
+        INDEX_DTYPE (str): offsets and positions data type.
+        ARRAYS (dict[str, str]): binary file names by attribute.
+    """
+
+    FIELDS = EntryFilter.FIELDS
+    SUFFIX = ".store"
+    METADATA = "metadata.json"
+    DTYPE = "<f8"
+    INDEX_DTYPE = "<i8"
+    ARRAYS = {
+        "offsets": "offsets.bin",
+        "values": "values.bin",
+        "order": "order.bin",
+        "sorted": "sorted.bin"
+    }
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, filename: str, path: str | None = None) -> None:
+        """Open the store of an output file.
+
+        Args:
+            filename (str): indexed output file path.
+            path (str | None): index directory path. Defaults to the output
+                file path with the `SUFFIX` suffix.
+        """
+        path = self.default_path(filename) if path is None else path
+        with open(os.path.join(path, self.METADATA)) as fp:
+            header = json.load(fp)
+
+        self.filename = filename
+        self.format: str = header["format"]
+        self.path = path
+        self.ids: list[str] = header["ids"]
+        self.families: dict[str, list[int]] = header["families"]
+        self.valid: dict[str, int] = header["valid"]
+        self._source = header["source"]
+        self._index = {key: index for index, key in enumerate(self.ids)}
+
+        count = len(self.ids)
+        shapes = {
+            "offsets": (count, 2),
+            "values": (len(self.FIELDS), count),
+            "order": (len(self.FIELDS), count),
+            "sorted": (len(self.FIELDS), count)
+        }
+        for name, shape in shapes.items():
+            dtype = self.DTYPE if name in ("values", "sorted") else (
+                self.INDEX_DTYPE
+            )
+            # Zero-sized memory maps are not supported:
+            setattr(self, name, np.memmap(
+                os.path.join(path, self.ARRAYS[name]),
+                dtype=dtype,
+                mode="r",
+                shape=shape
+            ) if count else np.empty(shape, dtype=dtype))
+
+    @classmethod
+    def default_path(cls, filename: str) -> str:
+        """Get the default index directory path of an output file.
+
+        Args:
+            filename (str): output file path.
+
+        Returns:
+            str: index directory path.
+        """
+        return filename + cls.SUFFIX
+
+    @classmethod
+    def open(
+        cls,
+        filename: str,
+        format: str = "json",
+        path: str | None = None
+    ) -> "Store":
+        """Open the store of an output file, indexing it if needed.
+
+        The output file is indexed again if it changed since it was last
+        indexed.
+
+        Args:
+            filename (str): output file path.
+            format (str): output file format. Defaults to "json".
+            path (str | None): index directory path. Defaults to None.
+
+        Returns:
+            Store: store instance.
+        """
+        try:
+            store = cls(filename, path)
+        except FileNotFoundError:
+            return cls.build(filename, format, path)
+
+        if store.format != format or store.stale:
+            return cls.build(filename, format, path)
+
+        return store
+
+    @classmethod
+    def build(
+        cls,
+        filename: str,
+        format: str = "json",
+        path: str | None = None
+    ) -> "Store":
+        """Index an output file.
+
+        Args:
+            filename (str): output file path.
+            format (str): output file format. Defaults to "json".
+            path (str | None): index directory path. Defaults to None.
+
+        Returns:
+            Store: store instance.
+        """
+        if format not in OutputWriter.FORMATS:
+            raise ValueError(
+                f"format must be one of {', '.join(OutputWriter.FORMATS)}."
+            )
+
+        path = cls.default_path(filename) if path is None else path
+        os.makedirs(path, exist_ok=True)
+
+        # A missing metadata file marks an incomplete index:
+        metadata = os.path.join(path, cls.METADATA)
+        if os.path.exists(metadata):
+            os.remove(metadata)
+
+        stat = os.stat(filename)
+        ids: list[str] = []
+        families: dict[str, list[int]] = {}
+        offsets: list[tuple[int, int]] = []
+        values: list[list[float]] = []
+
+        for key, record, start, end in cls._scan(filename, format):
+            families.setdefault(record["family"].lower(), []).append(len(ids))
+            ids.append(key)
+            offsets.append((start, end))
+            values.append([
+                np.nan if record["optimizations"].get(field) is None
+                else record["optimizations"][field]
+                for field in cls.FIELDS
+            ])
+
+        columns = np.asarray(values, dtype=cls.DTYPE).reshape(
+            len(ids), len(cls.FIELDS)
+        ).T
+        # NaN values are sorted last:
+        order = np.argsort(columns, axis=1, kind="stable")
+        arrays = {
+            "offsets": np.asarray(offsets, dtype=cls.INDEX_DTYPE),
+            "values": columns,
+            "order": order.astype(cls.INDEX_DTYPE),
+            "sorted": np.take_along_axis(columns, order, axis=1)
+        }
+        # Files are replaced rather than overwritten, so open stores keep
+        # mapping the previous ones:
+        for name, array in arrays.items():
+            target = os.path.join(path, cls.ARRAYS[name])
+            np.ascontiguousarray(array).tofile(target + ".tmp")
+            os.replace(target + ".tmp", target)
+
+        with open(metadata + ".tmp", "w") as fp:
+            json.dump({
+                "version": 1,
+                "format": format,
+                "source": {"size": stat.st_size, "mtime-ns": stat.st_mtime_ns},
+                "fields": cls.FIELDS,
+                "ids": ids,
+                "families": families,
+                "valid": {
+                    field: int(np.count_nonzero(~np.isnan(column)))
+                    for field, column in zip(cls.FIELDS, columns)
+                }
+            }, fp)
+
+        os.replace(metadata + ".tmp", metadata)
+        return cls(filename, path)
+
+    @property
+    def stale(self) -> bool:
+        """Check whether the output file changed since it was indexed.
+
+        Returns:
+            bool: True if the output file size or modification time differ.
+        """
+        stat = os.stat(self.filename)
+        return (stat.st_size, stat.st_mtime_ns) != (
+            self._source["size"], self._source["mtime-ns"]
+        )
+
+    def get(self, key: str) -> dict[str, Any]:
+        """Read a single record from the output file.
+
+        Args:
+            key (str): airfoil ID.
+
+        Returns:
+            dict[str, Any]: airfoil data.
+        """
+        start, end = self.offsets[self._index[key]]
+        with open(self.filename, "rb") as fp:
+            fp.seek(start)
+            record = json.loads(fp.read(end - start))
+
+        record.pop("id", None)
+        return record
+
+    def family(self, family: str) -> list[str]:
+        """Get the airfoils of a family.
+
+        Args:
+            family (str): airfoil family (case-insensitive).
+
+        Returns:
+            list[str]: airfoil IDs, in record order.
+        """
+        return [self.ids[index] for index in self.families.get(
+            family.lower(), []
+        )]
+
+    def range(
+        self,
+        field: str,
+        minimum: float | None = None,
+        maximum: float | None = None
+    ) -> list[str]:
+        """Get the airfoils with a field value in a range.
+
+        Args:
+            field (str): optimization field.
+            minimum (float | None): inclusive minimum value. Defaults to
+                None.
+            maximum (float | None): inclusive maximum value. Defaults to
+                None.
+
+        Returns:
+            list[str]: airfoil IDs, by ascending field value.
+        """
+        column = self._column(field)
+        values = self.sorted[column, :self.valid[field]]
+        start = 0 if minimum is None else int(
+            np.searchsorted(values, minimum, side="left")
+        )
+        end = len(values) if maximum is None else int(
+            np.searchsorted(values, maximum, side="right")
+        )
+        return [self.ids[index] for index in self.order[column, start:end]]
+
+    def top(
+        self,
+        field: str,
+        k: int = 10,
+        family: str | None = None,
+        largest: bool = True
+    ) -> list[tuple[str, float]]:
+        """Get the airfoils with the largest (or smallest) field values.
+
+        Args:
+            field (str): optimization field.
+            k (int): number of airfoils. Defaults to 10.
+            family (str | None): only consider airfoils of this family.
+                Defaults to None.
+            largest (bool): whether to get the largest values instead of
+                the smallest ones. Defaults to True.
+
+        Returns:
+            list[tuple[str, float]]: airfoil ID and field value pairs.
+        """
+        column = self._column(field)
+        positions = self.order[column, :self.valid[field]]
+        if largest:
+            positions = positions[::-1]
+
+        if family is not None:
+            positions = positions[self._mask(families=(family,))[positions]]
+
+        return [
+            (self.ids[index], float(self.values[column, index]))
+            for index in positions[:k]
+        ]
+
+    def select(
+        self,
+        families: tuple[str, ...] = (),
+        ranges: dict[str, tuple[float | None, float | None]] | None = None
+    ) -> list[str]:
+        """Get the airfoils that meet every condition.
+
+        Conditions follow `EntryFilter` semantics: families are alternatives,
+        ranges are inclusive and reject missing values.
+
+        Args:
+            families (tuple[str, ...]): accepted families. Defaults to ().
+            ranges (dict[str, tuple[float | None, float | None]] | None):
+                accepted (minimum, maximum) values per field. Defaults to
+                None.
+
+        Returns:
+            list[str]: airfoil IDs, in record order.
+        """
+        return [
+            self.ids[index] for index in np.flatnonzero(
+                self._mask(families, ranges)
+            )
+        ]
+
+    def _mask(
+        self,
+        families: tuple[str, ...] = (),
+        ranges: dict[str, tuple[float | None, float | None]] | None = None
+    ) -> np.ndarray:
+        """Compute the selection mask of a set of conditions.
+
+        Args:
+            families (tuple[str, ...]): accepted families. Defaults to ().
+            ranges (dict[str, tuple[float | None, float | None]] | None):
+                accepted values per field. Defaults to None.
+
+        Returns:
+            np.ndarray: boolean mask, in record order.
+        """
+        mask = np.ones(len(self.ids), dtype=bool)
+        if families:
+            selected = np.zeros_like(mask)
+            for family in families:
+                selected[self.families.get(family.lower(), [])] = True
+
+            mask &= selected
+
+        for field, (minimum, maximum) in (ranges or {}).items():
+            values = self.values[self._column(field)]
+            # Comparisons with NaN are False, so missing values are rejected:
+            mask &= values >= (-np.inf if minimum is None else minimum)
+            mask &= values <= (np.inf if maximum is None else maximum)
+
+        return mask
+
+    def _column(self, field: str) -> int:
+        """Get the column of an optimization field.
+
+        Args:
+            field (str): optimization field.
+
+        Returns:
+            int: column position.
+        """
+        try:
+            return self.FIELDS.index(field)
+        except ValueError:
+            raise ValueError(
+                f"\"{field}\" is not one of {', '.join(self.FIELDS)}."
+            )
+
+    @classmethod
+    def _scan(
+        cls,
+        filename: str,
+        format: str
+    ) -> Iterator[tuple[str, dict[str, Any], int, int]]:
+        """Read the records of an output file along with their offsets.
+
+        Output files are ASCII-escaped, so character offsets are byte
+        offsets.
+
+        Args:
+            filename (str): output file path.
+            format (str): output file format.
+
+        Yields:
+            tuple[str, dict[str, Any], int, int]: airfoil ID, data and start
+                and end byte offsets.
+        """
+        if format == "ndjson":
+            with open(filename, "rb") as fp:
+                end = 0
+                for line in fp:
+                    start, end = end, end + len(line)
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record.pop("id"), record, start, end
+
+            return
+
+        with open(filename, "rb") as fp:
+            text = fp.read().decode("ascii")
+
+        decoder = json.JSONDecoder()
+        position = cls._skip(text, 0, "{")
+        while True:
+            position = cls._WHITESPACE.match(text, position).end()
+            if text.startswith("}", position):
+                return
+
+            if text.startswith(",", position):
+                position += 1
+
+            key, position = decoder.raw_decode(
+                text, cls._WHITESPACE.match(text, position).end()
+            )
+            start = cls._skip(text, position, ":")
+            record, position = decoder.raw_decode(text, start)
+            yield key, record, start, position
+
+    @classmethod
+    def _skip(cls, text: str, position: int, token: str) -> int:
+        """Skip whitespace and an expected token.
+
+        Args:
+            text (str): JSON document.
+            position (int): current position.
+            token (str): expected token.
+
+        Returns:
+            int: position of the next non-whitespace character after the
+                token.
+        """
+        position = cls._WHITESPACE.match(text, position).end()
+        if not text.startswith(token, position):
+            raise ValueError(f"Expected \"{token}\" at position {position}.")
+
+        return cls._WHITESPACE.match(text, position + 1).end()
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        """Read a single record from the output file.
+
+        Args:
+            key (str): airfoil ID.
+
+        Returns:
+            dict[str, Any]: airfoil data.
+        """
+        return self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether an airfoil is in the store.
+
+        Args:
+            key (str): airfoil ID.
+
+        Returns:
+            bool: True if the airfoil is in the store.
+        """
+        return key in self._index
+
+    def __len__(self) -> int:
+        """Get the number of records.
+
+        Returns:
+            int: number of records.
+        """
+        return len(self.ids)
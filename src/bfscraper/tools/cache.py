@@ -1,43 +1,674 @@
 """Cache utilities module.
 
+Every cached value is stored along with its size and its write and last
+access times, so the cache can be kept within a size and age budget by
+evicting the least recently used (or the oldest) values.
+
 Author:
     Paulo Sanchez (@erlete)
 """
 
 
+import asyncio
 import os
 import pickle
-from typing import Any
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+
+class CacheBackend:
+    """Base cache storage backend.
+
+    Backends store pickled values by key and are expected to support cheap
+    single-key reads and writes, so that the cache never needs to be fully
+    loaded into memory.
+    """
+
+    def get(self, key: str) -> Any:
+        """Get value from storage.
+
+        Args:
+            key (str): key to get value for.
+
+        Returns:
+            Any: stored value, or None if the key is not found.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        """Set value in storage.
+
+        Args:
+            key (str): key to set value for.
+            value (Any): value to set.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Delete value from storage.
+
+        Args:
+            key (str): key to delete.
+        """
+        raise NotImplementedError
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over stored keys.
+
+        Returns:
+            Iterator[str]: stored keys.
+        """
+        raise NotImplementedError
+
+    def usage(self) -> Iterator[tuple[str, int, float, float]]:
+        """Iterate over the storage usage of every stored value.
+
+        Returns:
+            Iterator[tuple[str, int, float, float]]: key, size in bytes,
+                write time and last access time of every value.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete several values from storage.
+
+        Args:
+            keys (Iterable[str]): keys to delete.
+        """
+        for key in keys:
+            self.delete(key)
+
+    def counters(self) -> dict[str, int]:
+        """Get the lookup counters accumulated over every run.
+
+        Returns:
+            dict[str, int]: number of "hits" and "misses".
+        """
+        return {"hits": 0, "misses": 0}
+
+    def verify(self) -> list[str]:
+        """Check the storage integrity.
+
+        Returns:
+            list[str]: keys whose values cannot be loaded.
+        """
+        return [key for key in self.keys() if self._unreadable(key)]
+
+    def compact(self) -> None:
+        """Release unused storage space."""
+
+    def flush(self) -> None:
+        """Persist pending writes."""
+
+    def close(self) -> None:
+        """Persist pending writes and release resources."""
+        self.flush()
+
+    def _unreadable(self, key: str) -> bool:
+        """Check whether a stored value cannot be loaded.
+
+        Args:
+            key (str): key to check.
+
+        Returns:
+            bool: True if loading the value fails.
+        """
+        try:
+            self.get(key)
+        except Exception:
+            return True
+
+        return False
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite cache storage backend.
+
+    Every key is stored as an individual row, so writes cost O(1) regardless
+    of the cache size. Writes are committed in batches of `batch_size`,
+    along with the access times and lookup counters gathered since the last
+    commit, so reads never write to the database themselves.
+
+    Attributes:
+        filename (str): database file path.
+        batch_size (int): number of writes per commit.
+    """
+
+    HEADER = b"SQLite format 3\x00"
+    INSERT = (
+        "INSERT OR REPLACE INTO cache (key, value, size, written, accessed)"
+        + " VALUES (?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, filename: str, batch_size: int = 256) -> None:
+        """Initialize a SQLiteBackend instance.
+
+        Args:
+            filename (str): database file path.
+            batch_size (int): number of writes per commit. Defaults to 256.
+        """
+        self.filename = filename
+        self.batch_size = batch_size
+        self._pending = 0
+        self._accessed: dict[str, float] = {}
+        self._counters = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            filename,
+            check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            + "(key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS counters "
+            + "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self._upgrade()
+        self._connection.commit()
+
+    def _upgrade(self) -> None:
+        """Add usage columns to databases created by previous versions.
+
+        Values stored before usage was tracked are sized and dated when the
+        database is upgraded.
+        """
+        columns = {
+            row[1] for row in self._connection.execute(
+                "PRAGMA table_info(cache)"
+            )
+        }
+        if "size" in columns:
+            return
+
+        for column in (
+            "size INTEGER NOT NULL DEFAULT 0",
+            "written REAL NOT NULL DEFAULT 0",
+            "accessed REAL NOT NULL DEFAULT 0"
+        ):
+            self._connection.execute(f"ALTER TABLE cache ADD COLUMN {column}")
+
+        now = time.time()
+        self._connection.execute(
+            "UPDATE cache SET size = length(value), written = ?, accessed = ?",
+            (now, now)
+        )
+
+    @classmethod
+    def is_database(cls, filename: str) -> bool:
+        """Check whether a file is a SQLite database.
+
+        Args:
+            filename (str): file path.
+
+        Returns:
+            bool: True if the file is a SQLite database or is empty.
+        """
+        with open(filename, "rb") as fp:
+            header = fp.read(len(cls.HEADER))
+
+        return not header or header == cls.HEADER
+
+    def get(self, key: str) -> Any:
+        """Get value from storage.
+
+        Args:
+            key (str): key to get value for.
+
+        Returns:
+            Any: stored value, or None if the key is not found.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+
+            self._counters["hits"] += 1
+            self._accessed[key] = time.time()
+
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Set value in storage.
+
+        Args:
+            key (str): key to set value for.
+            value (Any): value to set.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                self.INSERT, (key, blob, len(blob), now, now)
+            )
+            self._accessed.pop(key, None)
+            self._pending += 1
+
+            if self._pending >= self.batch_size:
+                self._commit()
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        """Set several values in storage within a single transaction.
+
+        Args:
+            items (dict[str, Any]): key-value pairs to set.
+        """
+        now = time.time()
+        blobs = (
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            for key, value in items.items()
+        )
+        with self._lock:
+            self._connection.executemany(self.INSERT, (
+                (key, blob, len(blob), now, now) for key, blob in blobs
+            ))
+            self._commit()
+
+    def delete(self, key: str) -> None:
+        """Delete value from storage.
+
+        Args:
+            key (str): key to delete.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._accessed.pop(key, None)
+            self._pending += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete several values from storage within a single transaction.
+
+        Args:
+            keys (Iterable[str]): keys to delete.
+        """
+        keys = list(keys)
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM cache WHERE key = ?", ((key,) for key in keys)
+            )
+            for key in keys:
+                self._accessed.pop(key, None)
+            self._commit()
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over stored keys.
+
+        Returns:
+            Iterator[str]: stored keys.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT key FROM cache").fetchall()
+
+        return (row[0] for row in rows)
+
+    def usage(self) -> Iterator[tuple[str, int, float, float]]:
+        """Iterate over the storage usage of every stored value.
+
+        Returns:
+            Iterator[tuple[str, int, float, float]]: key, size in bytes,
+                write time and last access time of every value.
+        """
+        with self._lock:
+            self._commit()
+            rows = self._connection.execute(
+                "SELECT key, size, written, accessed FROM cache"
+            ).fetchall()
+
+        return iter(rows)
+
+    def counters(self) -> dict[str, int]:
+        """Get the lookup counters accumulated over every run.
+
+        Returns:
+            dict[str, int]: number of "hits" and "misses".
+        """
+        with self._lock:
+            self._commit()
+            return {
+                "hits": 0, "misses": 0,
+                **dict(self._connection.execute(
+                    "SELECT name, value FROM counters"
+                ).fetchall())
+            }
+
+    def verify(self) -> list[str]:
+        """Check the database and stored values integrity.
+
+        Raises:
+            sqlite3.DatabaseError: if the database itself is corrupt.
+
+        Returns:
+            list[str]: keys whose values cannot be loaded.
+        """
+        with self._lock:
+            self._commit()
+            problems = self._connection.execute(
+                "PRAGMA integrity_check"
+            ).fetchall()
+            if problems != [("ok",)]:
+                raise sqlite3.DatabaseError(
+                    "; ".join(str(row[0]) for row in problems)
+                )
+
+            rows = self._connection.execute("SELECT key, value FROM cache")
+            unreadable = []
+            for key, value in rows:
+                try:
+                    pickle.loads(value)
+                except Exception:
+                    unreadable.append(key)
+
+        return unreadable
+
+    def compact(self) -> None:
+        """Rebuild the database file without unused pages."""
+        with self._lock:
+            self._commit()
+            self._connection.execute("VACUUM")
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def flush(self) -> None:
+        """Persist pending writes."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Persist pending writes and close the database connection."""
+        self.flush()
+        self._connection.close()
+
+    def _commit(self) -> None:
+        """Commit the current transaction. The lock must be held."""
+        if self._accessed:
+            self._connection.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                ((accessed, key) for key, accessed in self._accessed.items())
+            )
+            self._accessed.clear()
+        if any(self._counters.values()):
+            self._connection.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT"
+                + " (name) DO UPDATE SET value = value + excluded.value",
+                self._counters.items()
+            )
+            self._counters = dict.fromkeys(self._counters, 0)
+        if self._pending or self._connection.in_transaction:
+            self._connection.commit()
+        self._pending = 0
 
 
 class Cache:
     """Cache class for storing data between runs.
 
+    Values are stored in a pluggable backend (SQLite by default) and are
+    loaded on demand, one key at a time. Caches created by previous versions
+    (a single pickled dictionary) are migrated automatically on load.
+
+    Along with the values, the cache keeps HTTP validators (ETag and
+    Last-Modified) for every fetched URL, so that expired entries can be
+    revalidated with conditional requests instead of being downloaded again.
+
+    The cache can be kept within a size and age budget, which is enforced
+    when it is closed: values older than `max_age` are dropped, and then the
+    least recently used (or the oldest) values until the cache fits in
+    `max_size`. Table indexes are never evicted.
+
     Attributes:
         filename (str): cache file path.
-        cache (dict): cache dictionary.
+        backend (CacheBackend): storage backend.
+        ttl (int): seconds after which cached URLs must be revalidated (-1
+            for never). A `max-age` sent by the server takes precedence.
+        max_size (int | None): maximum size of the cached values in bytes,
+            or None for no limit.
+        max_age (float | None): seconds after which values are evicted
+            (since their last use, or since they were written if `eviction`
+            is "oldest"), or None for no limit.
+        eviction (str): eviction order, "lru" (least recently used first)
+            or "oldest" (least recently written first).
+        HTTP_PREFIX (str): key prefix for HTTP metadata records.
+        INDEX_PREFIX (str): key prefix for table index records.
+        EVICTIONS (tuple[str, ...]): supported eviction orders.
     """
 
-    def __init__(self, filename: str) -> None:
+    HTTP_PREFIX = "http:"
+    INDEX_PREFIX = "index:"
+    EVICTIONS = ("lru", "oldest")
+
+    def __init__(
+        self,
+        filename: str,
+        backend: CacheBackend | None = None,
+        ttl: int = -1,
+        max_size: int | None = None,
+        max_age: float | None = None,
+        eviction: str = "lru"
+    ) -> None:
         """Initialize a Cache instance.
 
         Args:
             filename (str): cache file path.
+            backend (CacheBackend | None): storage backend. Defaults to a
+                SQLiteBackend stored at `filename`.
+            ttl (int): seconds after which cached URLs must be revalidated
+                (-1 for never). Defaults to -1.
+            max_size (int | None): maximum size of the cached values in
+                bytes. Defaults to None (no limit).
+            max_age (float | None): seconds after which values are evicted.
+                Defaults to None (no limit).
+            eviction (str): eviction order ("lru" or "oldest"). Defaults to
+                "lru".
         """
+        if eviction not in self.EVICTIONS:
+            raise ValueError(
+                f"\"{eviction}\" is not one of {', '.join(self.EVICTIONS)}."
+            )
+
         self.filename = filename
-        self.cache: dict[str, Any] = {}
+        self.backend = backend
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_age = max_age
+        self.eviction = eviction
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="bfscraper-cache"
+        )
         self.load()
 
     def load(self) -> None:
-        """Load cache from file."""
-        if os.path.exists(self.filename):
-            with open(self.filename, "rb") as fp:
-                self.cache = pickle.load(fp)
+        """Open cache storage, migrating legacy pickle caches if found."""
+        if self.backend is not None:
+            return
+
+        if (
+            os.path.exists(self.filename)
+            and not SQLiteBackend.is_database(self.filename)
+        ):
+            self.migrate(self.filename)
+
+        self.backend = SQLiteBackend(self.filename)
+
+    @staticmethod
+    def migrate(filename: str) -> None:
+        """Migrate a legacy pickle cache file to the SQLite format.
+
+        The new database is built next to the legacy file and then moved
+        over it, so an interrupted migration leaves the original intact.
+
+        Args:
+            filename (str): legacy cache file path.
+        """
+        with open(filename, "rb") as fp:
+            legacy = pickle.load(fp)
+
+        temporary = f"{filename}.migrating"
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+        backend = SQLiteBackend(temporary)
+        backend.set_many(legacy)
+        backend.close()
+
+        os.replace(temporary, filename)
 
     def save(self) -> None:
-        """Save cache to file."""
-        with open(self.filename, "wb") as fp:
-            pickle.dump(self.cache, fp)
+        """Persist pending cache writes."""
+        self.backend.flush()
+
+    def close(self) -> None:
+        """Persist pending writes, enforce the budget and release storage."""
+        self._executor.shutdown(wait=True)
+        if self.max_size is not None or self.max_age is not None:
+            self.prune(self.max_size, self.max_age, self.eviction)
+        self.backend.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache usage statistics.
+
+        Returns:
+            dict[str, Any]: number of values ("entries") and their size in
+                bytes ("bytes"), by kind ("records", "http" and "index"),
+                size of the cache files on disk ("disk"), lookups over every
+                run ("hits", "misses" and "hit-rate") and write times of
+                the oldest and newest values ("oldest" and "newest").
+        """
+        kinds = {
+            kind: {"entries": 0, "bytes": 0}
+            for kind in ("records", "http", "index")
+        }
+        written = []
+        for key, size, time_, _ in self.backend.usage():
+            kind = kinds[self._kind(key)]
+            kind["entries"] += 1
+            kind["bytes"] += size
+            written.append(time_)
+
+        counters = self.backend.counters()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "entries": sum(kind["entries"] for kind in kinds.values()),
+            "bytes": sum(kind["bytes"] for kind in kinds.values()),
+            **kinds,
+            "disk": sum(
+                os.path.getsize(filename) for filename in (
+                    self.filename,
+                    f"{self.filename}-wal",
+                    f"{self.filename}-shm"
+                ) if os.path.exists(filename)
+            ),
+            **counters,
+            "hit-rate": counters["hits"] / lookups if lookups else None,
+            "oldest": min(written, default=None),
+            "newest": max(written, default=None)
+        }
+
+    def prune(
+        self,
+        max_size: int | None = None,
+        max_age: float | None = None,
+        eviction: str = "lru"
+    ) -> tuple[int, int]:
+        """Evict cached values until the cache is within a budget.
+
+        Values older than `max_age` are evicted first, followed by the least
+        recently used (or the oldest) values until the remaining ones fit in
+        `max_size`. Table indexes are never evicted.
+
+        Args:
+            max_size (int | None): maximum size of the cached values in
+                bytes. Defaults to None (no limit).
+            max_age (float | None): seconds after which values are evicted.
+                Defaults to None (no limit).
+            eviction (str): eviction order ("lru" or "oldest"). Defaults to
+                "lru".
+
+        Returns:
+            tuple[int, int]: number of evicted values and freed bytes.
+        """
+        if eviction not in self.EVICTIONS:
+            raise ValueError(
+                f"\"{eviction}\" is not one of {', '.join(self.EVICTIONS)}."
+            )
+
+        # Candidates are sorted by the time they were last used or written:
+        candidates = sorted(
+            (accessed if eviction == "lru" else written, size, key)
+            for key, size, written, accessed in self.backend.usage()
+            if not key.startswith(self.INDEX_PREFIX)
+        )
+        total = sum(size for _, size, _ in candidates)
+        deadline = None if max_age is None else time.time() - max_age
+
+        evicted = []
+        freed = 0
+        for time_, size, key in candidates:
+            if not (
+                deadline is not None and time_ < deadline
+                or max_size is not None and total - freed > max_size
+            ):
+                break
+
+            evicted.append(key)
+            freed += size
+
+        self.backend.delete_many(evicted)
+        return len(evicted), freed
+
+    def compact(self) -> tuple[int, int]:
+        """Release unused space of the cache file.
+
+        Returns:
+            tuple[int, int]: size of the cache files on disk before and
+                after compaction, in bytes.
+        """
+        before = self.stats()["disk"]
+        self.backend.compact()
+        return before, self.stats()["disk"]
+
+    def verify(self, repair: bool = False) -> list[str]:
+        """Check that every cached value can be loaded.
+
+        Args:
+            repair (bool): whether to delete values that cannot be loaded.
+                Defaults to False.
+
+        Returns:
+            list[str]: keys whose values cannot be loaded.
+        """
+        unreadable = self.backend.verify()
+        if repair:
+            self.backend.delete_many(unreadable)
+
+        return unreadable
+
+    @classmethod
+    def _kind(cls, key: str) -> str:
+        """Get the kind of a cache key.
+
+        Args:
+            key (str): cache key.
+
+        Returns:
+            str: "http" for HTTP metadata, "index" for table indexes or
+                "records" otherwise.
+        """
+        if key.startswith(cls.HTTP_PREFIX):
+            return "http"
+        if key.startswith(cls.INDEX_PREFIX):
+            return "index"
+
+        return "records"
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache.
@@ -50,7 +681,8 @@ class Cache:
         Returns:
             Any: value from cache.
         """
-        return self.cache.get(key, default)
+        value = self.backend.get(key)
+        return default if value is None else value
 
     def set(self, key: str, value: Any) -> None:
         """Set value in cache.
@@ -59,8 +691,161 @@ class Cache:
             key (str): key to set value for.
             value (Any): value to set.
         """
-        self.cache[key] = value
-        self.save()
+        self.backend.set(key, value)
+
+    def delete(self, key: str) -> None:
+        """Delete value from cache, if present.
+
+        Args:
+            key (str): key to delete.
+        """
+        self.backend.delete(key)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Get value from cache without blocking the event loop.
+
+        Args:
+            key (str): key to get value for.
+            default (Any): default value to return if key is not found.
+                Defaults to None.
+
+        Returns:
+            Any: value from cache.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.get, key, default
+        )
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Set value in cache without blocking the event loop.
+
+        Args:
+            key (str): key to set value for.
+            value (Any): value to set.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.set, key, value
+        )
+
+    async def call(self, function: Callable, *args: Any) -> Any:
+        """Run a cache method without blocking the event loop.
+
+        Args:
+            function (Callable): cache method to run.
+            *args (Any): positional arguments.
+
+        Returns:
+            Any: method result.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args
+        )
+
+    def metadata(self, url: str) -> dict[str, Any] | None:
+        """Get stored HTTP metadata for a URL.
+
+        Args:
+            url (str): request URL.
+
+        Returns:
+            dict[str, Any] | None: validators, fetch time, server lifetime
+                and (optionally) response body, or None if not stored.
+        """
+        return self.get(f"{self.HTTP_PREFIX}{url}")
+
+    def set_metadata(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes | None = None
+    ) -> None:
+        """Store HTTP metadata of a response.
+
+        Validators missing from `headers` (as in most 304 responses) and the
+        previous body are kept from the stored record.
+
+        Args:
+            url (str): request URL.
+            headers (Mapping[str, str]): response headers.
+            body (bytes | None): response body to keep. Defaults to None.
+        """
+        previous = self.metadata(url) or {}
+        max_age = re.search(
+            r"max-age=(\d+)", headers.get("Cache-Control", "")
+        )
+
+        self.set(f"{self.HTTP_PREFIX}{url}", {
+            "etag": headers.get("ETag", previous.get("etag")),
+            "last-modified": headers.get(
+                "Last-Modified", previous.get("last-modified")
+            ),
+            "time": time.time(),
+            "max-age": int(max_age.group(1)) if max_age else None,
+            "body": body if body is not None else previous.get("body")
+        })
+
+    def is_fresh(self, metadata: dict[str, Any] | None) -> bool:
+        """Check whether a cached URL can be used without revalidation.
+
+        Args:
+            metadata (dict[str, Any] | None): stored HTTP metadata.
+
+        Returns:
+            bool: True if the cached URL has not expired.
+        """
+        if self.ttl < 0:
+            return True
+
+        if metadata is None:
+            return False
+
+        lifetime = (
+            metadata["max-age"] if metadata["max-age"] is not None
+            else self.ttl
+        )
+        return time.time() - metadata["time"] < lifetime
+
+    @staticmethod
+    def conditional_headers(
+        metadata: dict[str, Any] | None
+    ) -> dict[str, str]:
+        """Build conditional request headers from stored HTTP metadata.
+
+        Args:
+            metadata (dict[str, Any] | None): stored HTTP metadata.
+
+        Returns:
+            dict[str, str]: If-None-Match/If-Modified-Since headers.
+        """
+        headers = {}
+        if metadata is None:
+            return headers
+
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last-modified"):
+            headers["If-Modified-Since"] = metadata["last-modified"]
+
+        return headers
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over cached keys.
+
+        Returns:
+            Iterator[str]: cached keys.
+        """
+        return self.backend.keys()
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is cached.
+
+        Args:
+            key (str): key to check.
+
+        Returns:
+            bool: True if the key is cached.
+        """
+        return self.backend.get(key) is not None
 
     def __getitem__(self, key: str, default: Any = None) -> Any:
         """Get value from cache.
@@ -0,0 +1,116 @@
+"""Scraping checkpoint module.
+
+A checkpoint keeps the progress of a run, entry by entry, in a SQLite
+database next to the output file, so that an interrupted run can be resumed
+without fetching the data table again or touching completed entries. Every
+update is written within a transaction, so a crash never leaves a corrupt
+checkpoint behind: at worst, the last uncommitted updates are lost and their
+entries are processed again.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import os
+from typing import Any, Iterator
+
+from .cache import SQLiteBackend
+
+
+class Checkpoint:
+    """Scraping checkpoint class.
+
+    Every entry is stored along with its pipeline state: parsed from the
+    data table, with its download links known, done or failed.
+
+    Attributes:
+        filename (str): checkpoint file path.
+        PARSED (str): state of entries parsed from the data table.
+        LINKS (str): state of entries whose download links are known.
+        DONE (str): state of completed entries.
+        FAILED (str): state of entries that could not be completed.
+        ENTRY_PREFIX (str): key prefix for entry records.
+        META (str): key of the run metadata record.
+    """
+
+    PARSED = "parsed"
+    LINKS = "links"
+    DONE = "done"
+    FAILED = "failed"
+    ENTRY_PREFIX = "entry:"
+    META = "meta"
+
+    def __init__(self, filename: str, resume: bool = False) -> None:
+        """Initialize a Checkpoint instance.
+
+        Args:
+            filename (str): checkpoint file path.
+            resume (bool): whether to keep the progress stored by a previous
+                run. Defaults to False (start over).
+        """
+        self.filename = filename
+        if not resume:
+            self._remove()
+
+        self._backend = SQLiteBackend(filename)
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        """Get the run metadata.
+
+        Returns:
+            dict[str, Any]: run metadata.
+        """
+        return self._backend.get(self.META) or {}
+
+    def set_meta(self, **values: Any) -> None:
+        """Update the run metadata.
+
+        Args:
+            **values (Any): metadata values.
+        """
+        self._backend.set(self.META, {**self.meta, **values})
+
+    def update(self, key: str, state: str, record: Any) -> None:
+        """Store the state of an entry.
+
+        Args:
+            key (str): entry key.
+            state (str): pipeline state.
+            record (Any): entry record.
+        """
+        self._backend.set(self.ENTRY_PREFIX + key, (state, record))
+
+    def entries(self) -> Iterator[tuple[str, str, Any]]:
+        """Iterate over the stored entries.
+
+        Returns:
+            Iterator[tuple[str, str, Any]]: key, pipeline state and record
+                of every entry.
+        """
+        for key in self._backend.keys():
+            if key.startswith(self.ENTRY_PREFIX):
+                state, record = self._backend.get(key)
+                yield key.removeprefix(self.ENTRY_PREFIX), state, record
+
+    def flush(self) -> None:
+        """Persist pending updates."""
+        self._backend.flush()
+
+    def close(self) -> None:
+        """Persist pending updates and close the checkpoint."""
+        self._backend.close()
+
+    def discard(self) -> None:
+        """Close and delete the checkpoint, once the run has completed."""
+        self._backend.close()
+        self._remove()
+
+    def _remove(self) -> None:
+        """Delete the checkpoint files, if present."""
+        for filename in (
+            self.filename, f"{self.filename}-wal", f"{self.filename}-shm"
+        ):
+            if os.path.exists(filename):
+                os.remove(filename)
@@ -0,0 +1,99 @@
+"""Content-addressed file storage module.
+
+Downloaded files are named after the hash of their contents, so identical
+files are stored once and a file's path changes whenever its contents do.
+Files are sharded into subdirectories by the first two hash characters:
+`<directory>/ab/abcdef....dat`.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import os
+import tempfile
+from hashlib import blake2b
+from typing import Any
+
+
+class ContentWriter:
+    """Streaming content-addressed file writer class.
+
+    Chunks are written to a temporary file in the storage directory and
+    hashed along the way. Committing moves the file to its content address,
+    so partially written files are never visible.
+
+    Attributes:
+        directory (str): storage directory path.
+        suffix (str): file name suffix, such as ".dat".
+        size (int): number of written bytes.
+        DIGEST_SIZE (int): hash size, in bytes.
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(self, directory: str, suffix: str = "") -> None:
+        """Initialize a ContentWriter instance.
+
+        Args:
+            directory (str): storage directory path.
+            suffix (str): file name suffix. Defaults to "".
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.suffix = suffix
+        self.size = 0
+        self._hash = blake2b(digest_size=self.DIGEST_SIZE)
+        self._fp = tempfile.NamedTemporaryFile(
+            dir=directory, prefix=".", suffix=".part", delete=False
+        )
+
+    def write(self, chunk: bytes) -> None:
+        """Write a chunk.
+
+        Args:
+            chunk (bytes): file chunk.
+        """
+        self._fp.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> dict[str, Any]:
+        """Move the written file to its content address.
+
+        Returns:
+            dict[str, Any]: file path (relative to the storage directory),
+                size in bytes and blake2b hash.
+        """
+        self._fp.close()
+        digest = self._hash.hexdigest()
+        path = os.path.join(digest[:2], digest + self.suffix)
+        target = os.path.join(self.directory, path)
+
+        if os.path.exists(target):
+            os.remove(self._fp.name)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(self._fp.name, target)
+
+        return {"path": path, "size": self.size, "blake2b": digest}
+
+    def discard(self) -> None:
+        """Delete the written file."""
+        self._fp.close()
+        if os.path.exists(self._fp.name):
+            os.remove(self._fp.name)
+
+    def __enter__(self) -> "ContentWriter":
+        """Enter the writer context.
+
+        Returns:
+            ContentWriter: writer instance.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Exit the writer context, discarding uncommitted files."""
+        if not self._fp.closed:
+            self.discard()
@@ -0,0 +1,198 @@
+"""Database entry filters module.
+
+Filters are predicates over parsed database entries, so entries can be
+selected before any of their pages is requested.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Callable
+
+from ..scrapers.records import OPTIMIZATIONS
+
+if TYPE_CHECKING:
+    from ..scrapers.records import Record
+
+Predicate = Callable[[str, "Record"], bool]
+
+
+def describe(predicate: Predicate) -> str:
+    """Get a description of a predicate that is stable across runs.
+
+    Args:
+        predicate (Predicate): entry selection predicate.
+
+    Returns:
+        str: filter specification of an EntryFilter, or qualified name of
+            any other predicate.
+    """
+    if isinstance(predicate, EntryFilter):
+        return str(predicate)
+
+    function = predicate if hasattr(predicate, "__qualname__") \
+        else type(predicate)
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+class EntryFilter:
+    """Parsed database entry filter.
+
+    Conditions of different kinds must all hold, while values of the same
+    kind are alternatives: `families=("NACA", "Eppler")` selects entries of
+    either family. Entries without a value for a ranged field are rejected.
+
+    Attributes:
+        families (set[str]): accepted families (case-insensitive).
+        sources (set[str]): accepted data sources (case-insensitive).
+        names (tuple[str, ...]): accepted name or ID patterns, with shell
+            wildcards (case-insensitive).
+        ranges (dict[str, tuple[float | None, float | None]]): accepted
+            (minimum, maximum) values per optimization field, inclusive.
+            Either bound may be None.
+        predicates (tuple[Predicate, ...]): additional predicates, called
+            with the airfoil ID and the parsed entry record.
+        FIELDS (tuple[str, ...]): optimization fields that accept ranges.
+    """
+
+    FIELDS = OPTIMIZATIONS
+
+    def __init__(
+        self,
+        families: tuple[str, ...] = (),
+        sources: tuple[str, ...] = (),
+        names: tuple[str, ...] = (),
+        ranges: dict[str, tuple[float | None, float | None]] | None = None,
+        predicates: tuple[Predicate, ...] = ()
+    ) -> None:
+        """Initialize an EntryFilter instance.
+
+        Args:
+            families (tuple[str, ...]): accepted families. Defaults to ().
+            sources (tuple[str, ...]): accepted data sources. Defaults to ().
+            names (tuple[str, ...]): accepted name or ID patterns. Defaults
+                to ().
+            ranges (dict[str, tuple[float | None, float | None]] | None):
+                accepted values per optimization field. Defaults to None.
+            predicates (tuple[Predicate, ...]): additional predicates.
+                Defaults to ().
+        """
+        ranges = dict(ranges or {})
+        for field in ranges:
+            if field not in self.FIELDS:
+                raise ValueError(
+                    f"\"{field}\" is not one of {', '.join(self.FIELDS)}."
+                )
+
+        self.families = {family.lower() for family in families}
+        self.sources = {source.lower() for source in sources}
+        self.names = tuple(name.lower() for name in names)
+        self.ranges = ranges
+        self.predicates = tuple(predicates)
+
+    @classmethod
+    def parse_range(
+        cls,
+        value: str
+    ) -> tuple[str, tuple[float | None, float | None]]:
+        """Parse a range condition.
+
+        Args:
+            value (str): condition, in FIELD=MIN:MAX format. Either bound may
+                be omitted, as in "thickness=10:" or "camber=:2".
+
+        Returns:
+            tuple[str, tuple[float | None, float | None]]: field and
+                (minimum, maximum) bounds.
+        """
+        field, _, bounds = value.partition("=")
+        minimum, colon, maximum = bounds.partition(":")
+        if field not in cls.FIELDS or not colon:
+            raise ValueError(
+                f"\"{value}\" is not in FIELD=MIN:MAX format, with FIELD one"
+                + f" of {', '.join(cls.FIELDS)}."
+            )
+
+        try:
+            return field, (
+                float(minimum) if minimum.strip() else None,
+                float(maximum) if maximum.strip() else None
+            )
+        except ValueError:
+            raise ValueError(f"\"{value}\" has non-numeric bounds.")
+
+    def __call__(self, key: str, entry: "Record") -> bool:
+        """Check whether a parsed entry is selected.
+
+        Args:
+            key (str): airfoil ID.
+            entry (Record): parsed database entry.
+
+        Returns:
+            bool: True if the entry meets every condition.
+        """
+        if self.families and entry.family.lower() not in self.families:
+            return False
+
+        if self.sources and not any(
+            source.lower() in self.sources for source in entry.sources
+        ):
+            return False
+
+        if self.names and not any(
+            fnmatchcase(entry.name.lower(), pattern)
+            or fnmatchcase(key.lower(), pattern)
+            for pattern in self.names
+        ):
+            return False
+
+        for field, (minimum, maximum) in self.ranges.items():
+            value = entry.optimization(field)
+            if (
+                value is None
+                or minimum is not None and value < minimum
+                or maximum is not None and value > maximum
+            ):
+                return False
+
+        return all(predicate(key, entry) for predicate in self.predicates)
+
+    def __str__(self) -> str:
+        """Get the filter specification.
+
+        Conditions are listed in a fixed order, so that equal filters have
+        equal specifications.
+
+        Returns:
+            str: filter, as the command line options that select the same
+                entries, followed by the qualified names of its predicates.
+        """
+        def bound(value: float | None) -> str:
+            return "" if value is None else f"{value:g}"
+
+        return " ".join([
+            *(f"--family {family}" for family in sorted(self.families)),
+            *(f"--source {source}" for source in sorted(self.sources)),
+            *(f"--name {name}" for name in sorted(self.names)),
+            *(
+                f"--range {field}={bound(minimum)}:{bound(maximum)}"
+                for field, (minimum, maximum) in sorted(self.ranges.items())
+            ),
+            *(
+                f"--predicate {describe(predicate)}"
+                for predicate in self.predicates
+            )
+        ])
+
+    def __bool__(self) -> bool:
+        """Check whether the filter has any condition.
+
+        Returns:
+            bool: True if some entries may be rejected.
+        """
+        return bool(
+            self.families or self.sources or self.names or self.ranges
+            or self.predicates
+        )
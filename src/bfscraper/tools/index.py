@@ -0,0 +1,55 @@
+"""Table index module.
+
+A table index maps every airfoil ID to a short hash of its data table row,
+so that two versions of the table can be compared without keeping either of
+them around.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import json
+from hashlib import blake2b
+from typing import Any
+
+
+def digest(row: dict[str, Any]) -> str:
+    """Hash a data table row.
+
+    Rows are serialized with sorted keys, so column order does not matter.
+
+    Args:
+        row (dict[str, Any]): data table row.
+
+    Returns:
+        str: 16-character hexadecimal row hash.
+    """
+    return blake2b(
+        json.dumps(row, sort_keys=True, separators=(",", ":")).encode(),
+        digest_size=8
+    ).hexdigest()
+
+
+def diff(
+    previous: dict[str, str],
+    current: dict[str, str]
+) -> tuple[set[str], set[str], set[str]]:
+    """Compare two table indexes.
+
+    Args:
+        previous (dict[str, str]): previous row hashes, by airfoil ID.
+        current (dict[str, str]): current row hashes, by airfoil ID.
+
+    Returns:
+        tuple[set[str], set[str], set[str]]: added, changed and removed
+            airfoil IDs.
+    """
+    added = current.keys() - previous.keys()
+    removed = previous.keys() - current.keys()
+    changed = {
+        key for key in current.keys() & previous.keys()
+        if current[key] != previous[key]
+    }
+
+    return added, changed, removed
@@ -0,0 +1,616 @@
+"""Metrics module.
+
+Contains a small metrics registry with counters and histograms, which can be
+exported in Prometheus text format or as JSON, either at the end of a run or
+periodically while it is in progress.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Metric:
+    """Base metric class.
+
+    Every metric holds one series per distinct set of label values.
+
+    Attributes:
+        name (str): metric name.
+        help (str): metric description.
+        TYPE (str): Prometheus metric type.
+    """
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, help: str, lock: threading.Lock) -> None:
+        """Initialize a Metric instance.
+
+        Args:
+            name (str): metric name.
+            help (str): metric description.
+            lock (threading.Lock): registry lock.
+        """
+        self.name = name
+        self.help = help
+        self._lock = lock
+        self._series: dict[Labels, Any] = {}
+
+    @staticmethod
+    def _labels(labels: dict[str, Any]) -> Labels:
+        """Get the series key of a set of labels.
+
+        Args:
+            labels (dict[str, Any]): label values.
+
+        Returns:
+            Labels: sorted label pairs.
+        """
+        return tuple(sorted(
+            (key, str(value)) for key, value in labels.items()
+        ))
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escape a label value for Prometheus text format.
+
+        Args:
+            value (str): label value.
+
+        Returns:
+            str: escaped label value.
+        """
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\"", "\\\"")
+            .replace("\n", "\\n")
+        )
+
+    @staticmethod
+    def _format(labels: Labels, extra: str = "") -> str:
+        """Format labels in Prometheus text format.
+
+        Args:
+            labels (Labels): label pairs.
+            extra (str): additional, already formatted label. Defaults to "".
+
+        Returns:
+            str: formatted labels, including braces if not empty.
+        """
+        pairs = [
+            f"{key}=\"{Metric._escape(value)}\"" for key, value in labels
+        ] + ([extra] if extra else [])
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def prometheus(self) -> list[str]:
+        """Export the metric in Prometheus text format.
+
+        Returns:
+            list[str]: exposition lines.
+        """
+        raise NotImplementedError
+
+    def json(self) -> dict[str, Any]:
+        """Export the metric as a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: metric data.
+        """
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    TYPE = "counter"
+
+    def inc(self, value: float = 1, **labels: Any) -> None:
+        """Increase the counter.
+
+        Args:
+            value (float): increment. Defaults to 1.
+            **labels (Any): label values.
+        """
+        key = self._labels(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + value
+
+    def value(self, **labels: Any) -> float:
+        """Get the value of a series.
+
+        Args:
+            **labels (Any): label values.
+
+        Returns:
+            float: series value.
+        """
+        return self._series.get(self._labels(labels), 0)
+
+    def prometheus(self) -> list[str]:
+        """Export the counter in Prometheus text format.
+
+        Returns:
+            list[str]: exposition lines.
+        """
+        return [
+            f"{self.name}{self._format(labels)} {value}"
+            for labels, value in self._series.items()
+        ]
+
+    def json(self) -> dict[str, Any]:
+        """Export the counter as a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: counter data.
+        """
+        return {
+            "type": self.TYPE,
+            "help": self.help,
+            "series": [
+                {"labels": dict(labels), "value": value}
+                for labels, value in self._series.items()
+            ]
+        }
+
+
+class Histogram(Metric):
+    """Histogram with fixed cumulative buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): bucket upper bounds.
+        BUCKETS (tuple[float, ...]): default bucket upper bounds, suited to
+            durations in seconds.
+    """
+
+    TYPE = "histogram"
+    BUCKETS = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+        5.0, 10.0, 30.0
+    )
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        lock: threading.Lock,
+        buckets: tuple[float, ...] | None = None
+    ) -> None:
+        """Initialize a Histogram instance.
+
+        Args:
+            name (str): metric name.
+            help (str): metric description.
+            lock (threading.Lock): registry lock.
+            buckets (tuple[float, ...] | None): bucket upper bounds.
+                Defaults to None (BUCKETS).
+        """
+        super().__init__(name, help, lock)
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record a value.
+
+        Args:
+            value (float): observed value.
+            **labels (Any): label values.
+        """
+        key = self._labels(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), sum and count:
+                series = self._series[key] = [
+                    [0] * (len(self.buckets) + 1), 0.0, 0
+                ]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Record the duration of a block, in seconds.
+
+        Args:
+            **labels (Any): label values.
+
+        Yields:
+            None: while the block runs.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        """Get the number of observations of a series.
+
+        Args:
+            **labels (Any): label values.
+
+        Returns:
+            int: number of observations.
+        """
+        series = self._series.get(self._labels(labels))
+        return series[2] if series else 0
+
+    def sum(self, **labels: Any) -> float:
+        """Get the sum of observations of a series.
+
+        Args:
+            **labels (Any): label values.
+
+        Returns:
+            float: sum of observations.
+        """
+        series = self._series.get(self._labels(labels))
+        return series[1] if series else 0.0
+
+    def prometheus(self) -> list[str]:
+        """Export the histogram in Prometheus text format.
+
+        Returns:
+            list[str]: exposition lines.
+        """
+        lines = []
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket"
+                    + self._format(labels, f"le=\"{le}\"")
+                    + f" {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._format(labels)} {total}")
+            lines.append(f"{self.name}_count{self._format(labels)} {count}")
+
+        return lines
+
+    def json(self) -> dict[str, Any]:
+        """Export the histogram as a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: histogram data.
+        """
+        return {
+            "type": self.TYPE,
+            "help": self.help,
+            "buckets": list(self.buckets),
+            "series": [
+                {
+                    "labels": dict(labels),
+                    "counts": list(counts),
+                    "sum": total,
+                    "count": count
+                }
+                for labels, (counts, total, count) in self._series.items()
+            ]
+        }
+
+
+class MetricsRegistry:
+    """Metrics registry class.
+
+    Metrics are created on first use and identified by name, so independent
+    components can share them through the same registry.
+
+    Attributes:
+        FORMATS (dict[str, str]): export format by file extension.
+    """
+
+    FORMATS = {".json": "json", ".prom": "prometheus", ".txt": "prometheus"}
+
+    def __init__(self) -> None:
+        """Initialize a MetricsRegistry instance."""
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Get or create a counter.
+
+        Args:
+            name (str): metric name.
+            help (str): metric description. Defaults to "".
+
+        Returns:
+            Counter: counter instance.
+        """
+        return self._get(Counter, name, help)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        buckets: tuple[float, ...] | None = None
+    ) -> Histogram:
+        """Get or create a histogram.
+
+        Args:
+            name (str): metric name.
+            help (str): metric description. Defaults to "".
+            buckets (tuple[float, ...] | None): bucket upper bounds, used
+                on creation only. Defaults to None (Histogram.BUCKETS).
+
+        Returns:
+            Histogram: histogram instance.
+        """
+        return self._get(Histogram, name, help, buckets)
+
+    def trace_config(self) -> "aiohttp.TraceConfig":
+        """Build an aiohttp trace configuration that records request metrics.
+
+        Recorded metrics, per host:
+            bfscraper_request_pool_seconds: connection pool wait.
+            bfscraper_request_dns_seconds: DNS resolution (cache misses).
+            bfscraper_request_connect_seconds: connection establishment.
+            bfscraper_request_ttfb_seconds: time to the response headers,
+                since the request headers were sent.
+            bfscraper_request_seconds: time to the response headers, since
+                the request started.
+            bfscraper_responses_total: responses, by status code.
+            bfscraper_request_errors_total: failed requests, by exception.
+
+        Body read time and size depend on how responses are consumed, so
+        they are recorded by the scrapers (`bfscraper_request_body_seconds`
+        and `bfscraper_response_bytes_total`).
+
+        Returns:
+            aiohttp.TraceConfig: trace configuration.
+        """
+        # aiohttp is only needed while scraping, not to export metrics:
+        import aiohttp
+
+        phases = {
+            phase: self.histogram(f"bfscraper_request_{phase}_seconds", text)
+            for phase, text in (
+                ("pool", "Connection pool wait."),
+                ("dns", "DNS resolution time."),
+                ("connect", "Connection establishment time."),
+                ("ttfb", "Time to first byte, after sending the request.")
+            )
+        }
+        total = self.histogram(
+            "bfscraper_request_seconds", "Time to the response headers."
+        )
+        responses = self.counter(
+            "bfscraper_responses_total", "Responses, by status code."
+        )
+        errors = self.counter(
+            "bfscraper_request_errors_total", "Failed requests, by exception."
+        )
+
+        def start(phase: str) -> Any:
+            async def handler(
+                session: Any,
+                context: SimpleNamespace,
+                params: Any
+            ) -> None:
+                setattr(context, phase, perf_counter())
+
+            return handler
+
+        def end(phase: str) -> Any:
+            async def handler(
+                session: Any,
+                context: SimpleNamespace,
+                params: Any
+            ) -> None:
+                if hasattr(context, phase):
+                    phases[phase].observe(
+                        perf_counter() - getattr(context, phase),
+                        host=context.host
+                    )
+
+            return handler
+
+        async def on_request_start(
+            session: Any,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams
+        ) -> None:
+            context.host = urlsplit(str(params.url)).hostname or ""
+            context.start = perf_counter()
+
+        async def on_request_end(
+            session: Any,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams
+        ) -> None:
+            now = perf_counter()
+            total.observe(now - context.start, host=context.host)
+            phases["ttfb"].observe(
+                now - getattr(context, "ttfb", context.start),
+                host=context.host
+            )
+            responses.inc(host=context.host, status=params.response.status)
+
+        async def on_request_exception(
+            session: Any,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestExceptionParams
+        ) -> None:
+            errors.inc(
+                host=context.host,
+                exception=params.exception.__class__.__name__
+            )
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_queued_start.append(start("pool"))
+        trace.on_connection_queued_end.append(end("pool"))
+        trace.on_dns_resolvehost_start.append(start("dns"))
+        trace.on_dns_resolvehost_end.append(end("dns"))
+        trace.on_connection_create_start.append(start("connect"))
+        trace.on_connection_create_end.append(end("connect"))
+        trace.on_request_headers_sent.append(start("ttfb"))
+        return trace
+
+    def prometheus(self) -> str:
+        """Export every metric in Prometheus text format.
+
+        Returns:
+            str: exposition text.
+        """
+        lines = []
+        with self._lock:
+            for metric in self._metrics.values():
+                if metric.help:
+                    lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+                lines.extend(metric.prometheus())
+
+        return "\n".join(lines) + "\n"
+
+    def json(self) -> dict[str, Any]:
+        """Export every metric as a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: metrics, by name.
+        """
+        with self._lock:
+            return {
+                name: metric.json() for name, metric in self._metrics.items()
+            }
+
+    def write(self, filename: str) -> None:
+        """Atomically write every metric to a file.
+
+        The format is chosen from the file extension: `.json` for JSON and
+        `.prom` or `.txt` for Prometheus text format.
+
+        Args:
+            filename (str): output file path.
+        """
+        format = self.FORMATS.get(os.path.splitext(filename)[1].lower())
+        if format is None:
+            raise ValueError(
+                "metrics file extension must be one of "
+                + f"{', '.join(self.FORMATS)}."
+            )
+
+        text = (
+            json.dumps(self.json(), indent=4) if format == "json"
+            else self.prometheus()
+        )
+
+        # Readers never see a partially written snapshot:
+        temporary = f"{filename}.tmp"
+        with open(temporary, "w", encoding="utf-8") as fp:
+            fp.write(text)
+        os.replace(temporary, filename)
+
+    def _get(
+        self,
+        cls: type[Metric],
+        name: str,
+        help: str,
+        *args: Any
+    ) -> Any:
+        """Get or create a metric.
+
+        Args:
+            cls (type[Metric]): metric class.
+            name (str): metric name.
+            help (str): metric description.
+            *args (Any): additional constructor arguments.
+
+        Returns:
+            Any: metric instance.
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, help, self._lock, *args
+                )
+            elif not isinstance(metric, cls):
+                raise TypeError(f"{name} is already a {metric.TYPE}.")
+
+        return metric
+
+
+class MetricsExporter:
+    """Periodic metrics snapshot writer.
+
+    Writes the registry to a file every `interval` seconds from a background
+    thread, and once more when stopped, so long runs can be monitored while
+    in progress.
+
+    Attributes:
+        registry (MetricsRegistry): exported registry.
+        filename (str): output file path.
+        interval (float): seconds between snapshots (0 for a final snapshot
+            only).
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        filename: str,
+        interval: float = 0
+    ) -> None:
+        """Initialize a MetricsExporter instance.
+
+        Args:
+            registry (MetricsRegistry): exported registry.
+            filename (str): output file path.
+            interval (float): seconds between snapshots (0 for a final
+                snapshot only). Defaults to 0.
+        """
+        self.registry = registry
+        self.filename = filename
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start writing periodic snapshots."""
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop writing periodic snapshots and write the final one."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.registry.write(self.filename)
+
+    def _run(self) -> None:
+        """Write snapshots until stopped."""
+        while not self._stop.wait(self.interval):
+            self.registry.write(self.filename)
+
+    def __enter__(self) -> "MetricsExporter":
+        """Start the exporter.
+
+        Returns:
+            MetricsExporter: exporter instance.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop the exporter, writing the final snapshot."""
+        self.stop()
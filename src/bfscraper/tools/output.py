@@ -0,0 +1,160 @@
+"""Output utilities module.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import json
+import os
+from typing import Any, Iterator
+
+
+class OutputWriter:
+    """Streaming output writer class.
+
+    Records are serialized and written one at a time, as soon as they are
+    complete, so the whole catalogue never needs to be held in memory. The
+    number of written bytes is tracked along the way.
+
+    Supported formats:
+        json: a single JSON object keyed by airfoil ID, indented.
+        compact: same as json, without whitespace.
+        ndjson: one JSON object per line, with the airfoil ID under "id".
+
+    Attributes:
+        filename (str): output file path.
+        format (str): output format.
+        records (int): number of written records.
+        bytes (int): number of written bytes.
+        FORMATS (tuple[str, ...]): supported output formats.
+        INDENT (int): indentation of the json format.
+    """
+
+    FORMATS = ("json", "compact", "ndjson")
+    INDENT = 4
+
+    def __init__(self, filename: str, format: str = "json") -> None:
+        """Initialize an OutputWriter instance.
+
+        Args:
+            filename (str): output file path.
+            format (str): output format. Defaults to "json".
+        """
+        if format not in self.FORMATS:
+            raise ValueError(
+                f"format must be one of {', '.join(self.FORMATS)}."
+            )
+
+        self.filename = filename
+        self.format = format
+        self.records = 0
+        self.bytes = 0
+        self._fp = open(filename, "w", encoding="utf-8")
+
+        if format != "ndjson":
+            self._write("{")
+
+    def write(self, key: str, record: dict[str, Any]) -> None:
+        """Write a record.
+
+        Args:
+            key (str): airfoil ID.
+            record (dict[str, Any]): airfoil data.
+        """
+        if self.format == "ndjson":
+            self._write(
+                json.dumps({"id": key, **record}, separators=(",", ":"))
+                + "\n"
+            )
+        elif self.format == "compact":
+            self._write(
+                ("," if self.records else "")
+                + json.dumps(key) + ":"
+                + json.dumps(record, separators=(",", ":"))
+            )
+        else:
+            # Same layout as json.dump(data, indent=INDENT):
+            padding = " " * self.INDENT
+            self._write(
+                ("," if self.records else "")
+                + f"\n{padding}{json.dumps(key)}: "
+                + json.dumps(record, indent=self.INDENT).replace(
+                    "\n", f"\n{padding}"
+                )
+            )
+
+        self.records += 1
+
+    @classmethod
+    def read(
+        cls,
+        filename: str,
+        format: str = "json"
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Read the records of an output file.
+
+        Files in ndjson format are read one line at a time. Other formats
+        are a single JSON document, so they are loaded at once.
+
+        Args:
+            filename (str): output file path.
+            format (str): output format. Defaults to "json".
+
+        Yields:
+            tuple[str, dict[str, Any]]: airfoil ID and data pairs.
+        """
+        if format not in cls.FORMATS:
+            raise ValueError(
+                f"format must be one of {', '.join(cls.FORMATS)}."
+            )
+
+        with open(filename, encoding="utf-8") as fp:
+            if format != "ndjson":
+                yield from json.load(fp).items()
+                return
+
+            for line in fp:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.pop("id"), record
+
+    def close(self) -> None:
+        """Finish the output document and close the file.
+
+        The file is synced to disk, so it can be moved over a previous output
+        without risking an empty or truncated file after a crash.
+        """
+        if self._fp.closed:
+            return
+
+        if self.format == "json":
+            self._write("\n}" if self.records else "}")
+        elif self.format == "compact":
+            self._write("}")
+
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.close()
+
+    def _write(self, text: str) -> None:
+        """Write text to the output file, counting its size.
+
+        Args:
+            text (str): text to write.
+        """
+        self._fp.write(text)
+        # JSON output is ASCII-escaped, so characters and bytes match:
+        self.bytes += len(text)
+
+    def __enter__(self) -> "OutputWriter":
+        """Enter the writer context.
+
+        Returns:
+            OutputWriter: writer instance.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Exit the writer context, closing the output document."""
+        self.close()
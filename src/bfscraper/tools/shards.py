@@ -0,0 +1,164 @@
+"""Sharding utilities module.
+
+A crawl can be split into N shards that run independently, in separate
+processes or machines sharing a filesystem. Airfoils are assigned to shards
+by a stable hash of their ID, and every shard keeps its own cache, output
+and dataset files, named after the unsharded ones.
+
+Author:
+    Paulo Sanchez (@erlete)
+"""
+
+
+import os
+from hashlib import blake2b
+from typing import Any
+
+from .output import OutputWriter
+
+
+class Shard:
+    """Crawl shard class.
+
+    Attributes:
+        index (int): shard index, from 0 to count - 1.
+        count (int): total number of shards.
+    """
+
+    def __init__(self, index: int, count: int) -> None:
+        """Initialize a Shard instance.
+
+        Args:
+            index (int): shard index, from 0 to count - 1.
+            count (int): total number of shards.
+        """
+        if not 0 <= index < count:
+            raise ValueError("shards must satisfy 0 <= index < count.")
+
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """Parse a shard specification.
+
+        Args:
+            value (str): shard, in i/N format.
+
+        Returns:
+            Shard: shard instance.
+        """
+        index, _, count = value.partition("/")
+        try:
+            return cls(int(index), int(count))
+        except ValueError:
+            raise ValueError(
+                f"\"{value}\" is not in i/N format (0 <= i < N)."
+            )
+
+    @staticmethod
+    def of(key: str, count: int) -> int:
+        """Get the shard index of an airfoil.
+
+        The hash does not depend on the interpreter (unlike `hash`), so
+        every process and machine agrees on it.
+
+        Args:
+            key (str): airfoil ID.
+            count (int): total number of shards.
+
+        Returns:
+            int: shard index.
+        """
+        return int.from_bytes(
+            blake2b(key.encode(), digest_size=8).digest(), "big"
+        ) % count
+
+    def share(self, count: int) -> int:
+        """Get the shard's part of a number of airfoils to scrape.
+
+        The count is split as evenly as possible, with the remainder going
+        to the lowest shard indexes, so that all shards add up to it.
+
+        Args:
+            count (int): number of airfoils to scrape over all shards (-1
+                for all available).
+
+        Returns:
+            int: number of airfoils to scrape in the shard (-1 for all
+                available).
+        """
+        if count == -1:
+            return -1
+
+        return count // self.count + (self.index < count % self.count)
+
+    def path(self, path: str) -> str:
+        """Get the shard-local version of a file or directory path.
+
+        Args:
+            path (str): unsharded path, such as "scraped.json".
+
+        Returns:
+            str: shard path, such as "scraped.0-of-4.json".
+        """
+        return self.paths(path, self.count)[self.index]
+
+    @staticmethod
+    def paths(path: str, count: int) -> list[str]:
+        """Get the shard-local versions of a file or directory path.
+
+        Args:
+            path (str): unsharded path.
+            count (int): total number of shards.
+
+        Returns:
+            list[str]: shard paths, by shard index.
+        """
+        root, extension = os.path.splitext(path.rstrip("/\\"))
+        return [
+            f"{root}.{index}-of-{count}{extension}" for index in range(count)
+        ]
+
+    def __call__(self, key: str, entry: Any = None) -> bool:
+        """Check whether an airfoil belongs to the shard.
+
+        Args:
+            key (str): airfoil ID.
+            entry (Any): parsed database entry (unused). Defaults to None.
+
+        Returns:
+            bool: True if the airfoil belongs to the shard.
+        """
+        return self.of(key, self.count) == self.index
+
+    def __str__(self) -> str:
+        """Get the shard specification.
+
+        Returns:
+            str: shard, in i/N format.
+        """
+        return f"{self.index}/{self.count}"
+
+
+def merge(inputs: list[str], output: str, format: str = "json") -> int:
+    """Merge output files into one, one record at a time.
+
+    Args:
+        inputs (list[str]): output file paths, all in `format`.
+        output (str): merged output file path.
+        format (str): input and output format. Defaults to "json".
+
+    Returns:
+        int: number of merged records.
+    """
+    seen = set()
+    with OutputWriter(output, format) as writer:
+        for filename in inputs:
+            for key, record in OutputWriter.read(filename, format):
+                # Shards only overlap if their shard counts differ:
+                if key not in seen:
+                    seen.add(key)
+                    writer.write(key, record)
+
+    return writer.records
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The mock BigFoil server lives with the benchmarks:
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks")
+)
+
+from mock_server import MockBigFoil  # noqa: E402
+
+from bfscraper.scrapers.sources import BigFoil  # noqa: E402
+
+
+@pytest.fixture
+def bigfoil(monkeypatch):
+    server = MockBigFoil(count=20, latency=0, jitter=0)
+    with server.serve() as base_url:
+        monkeypatch.setattr(BigFoil, "BASE_URL", base_url)
+        monkeypatch.setattr(
+            BigFoil, "TABLE_URL", f"{base_url}/bigtable1.json"
+        )
+        yield server
@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import aclosing
+
+import aiohttp
+
+import bfscraper
+
+
+def test_scrape_iter_yields_records(bigfoil, tmp_path, capsys):
+    failed = {}
+
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            records = [
+                item async for item in bfscraper.scrape_iter(
+                    session=session,
+                    cache=str(tmp_path / "cache"),
+                    failed=failed
+                )
+            ]
+            assert not session.closed
+
+        return records
+
+    records = dict(asyncio.run(main()))
+
+    assert len(records) == 20
+    assert records["foil-3"]["dat"] == bigfoil.contour(3)
+    assert not failed
+    assert not capsys.readouterr().out
+    assert (tmp_path / "cache").exists()
+
+
+def test_scrape_iter_stops_early(bigfoil, tmp_path):
+    bigfoil.count = 1000
+
+    async def main():
+        async with aclosing(
+            bfscraper.scrape_iter(limit=2, cache=str(tmp_path / "cache"))
+        ) as records:
+            async for _ in records:
+                break
+
+    asyncio.run(main())
+
+    # Only the entries in flight are requested after the first record:
+    assert sum(bigfoil.requests.values()) < 50
+
+
+def test_scrape_iter_reports_failures(bigfoil, tmp_path, capsys):
+    bigfoil.error_rate = 1
+    failed = {}
+
+    async def main():
+        return [
+            item async for item in bfscraper.scrape_iter(
+                count=3,
+                retries=0,
+                cache=str(tmp_path / "cache"),
+                failed=failed
+            )
+        ]
+
+    records = asyncio.run(main())
+
+    assert len(records) == 3
+    assert sum(len(urls) for urls in failed.values()) == 3
+    assert not capsys.readouterr().out
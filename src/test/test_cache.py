@@ -0,0 +1,165 @@
+import asyncio
+import pickle
+import sqlite3
+import time
+
+from bfscraper.tools.cache import Cache, SQLiteBackend
+
+
+def test_cache_roundtrip(tmp_path):
+    filename = str(tmp_path / "cache")
+
+    cache = Cache(filename)
+    cache.set("naca0012", {"dat": "contour"})
+    cache["e387"] = {"dat": "other"}
+    cache.close()
+
+    cache = Cache(filename)
+    assert cache.get("naca0012") == {"dat": "contour"}
+    assert cache["e387"] == {"dat": "other"}
+    assert cache.get("missing", {}) == {}
+    assert "naca0012" in cache
+    assert sorted(cache.keys()) == ["e387", "naca0012"]
+    cache.close()
+
+
+def test_cache_async_access(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+
+    async def run():
+        await cache.aset("naca0012", {"dat": "contour"})
+        return await cache.aget("naca0012")
+
+    assert asyncio.run(run()) == {"dat": "contour"}
+    cache.close()
+
+
+def test_cache_legacy_migration(tmp_path):
+    filename = tmp_path / "cache"
+    with open(filename, "wb") as fp:
+        pickle.dump({"naca0012": {"dat": "contour"}}, fp)
+
+    cache = Cache(str(filename))
+    assert SQLiteBackend.is_database(str(filename))
+    assert cache.get("naca0012") == {"dat": "contour"}
+    cache.close()
+
+
+def test_cache_http_metadata(tmp_path):
+    cache = Cache(str(tmp_path / "cache"), ttl=3600)
+    url = "https://bigfoil.com/bigtable1.json"
+
+    assert not cache.is_fresh(cache.metadata(url))
+    assert Cache.conditional_headers(cache.metadata(url)) == {}
+
+    cache.set_metadata(url, {"ETag": "\"v1\""}, b"[]")
+    cache.set_metadata(url, {"Last-Modified": "Mon, 01 Jan 2024"})
+    metadata = cache.metadata(url)
+
+    assert cache.is_fresh(metadata)
+    assert metadata["body"] == b"[]"
+    assert Cache.conditional_headers(metadata) == {
+        "If-None-Match": "\"v1\"",
+        "If-Modified-Since": "Mon, 01 Jan 2024"
+    }
+
+    cache.set_metadata(url, {"Cache-Control": "max-age=0"})
+    assert not cache.is_fresh(cache.metadata(url))
+    cache.close()
+
+
+def test_cache_prune(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    cache = Cache(str(tmp_path / "cache"))
+    for key in ("a", "b", "c", "d"):
+        cache.set(key, "x" * 100)
+    cache.set(Cache.INDEX_PREFIX + "output", {"a": "hash"})
+    cache.get("a")
+
+    size = cache.stats()["records"]["bytes"] // 4
+    # The least recently used entries are evicted first:
+    assert cache.prune(max_size=3 * size) == (1, size)
+    assert sorted(cache.keys()) == ["a", "c", "d", "index:output"]
+    # Oldest-first eviction ignores accesses:
+    assert cache.prune(max_size=2 * size, eviction="oldest") == (1, size)
+    assert "a" not in cache
+    # Ages are measured since the last use:
+    cache.get("d")
+    assert cache.prune(max_age=2) == (1, size)
+    assert sorted(cache.keys()) == ["d", "index:output"]
+    cache.close()
+
+
+def test_cache_budget_is_enforced_on_close(tmp_path):
+    cache = Cache(str(tmp_path / "cache"), max_size=0)
+    cache.set("naca0012", {"dat": "contour"})
+    cache.set(Cache.INDEX_PREFIX + "output", {})
+    cache.close()
+
+    cache = Cache(str(tmp_path / "cache"))
+    assert list(cache.keys()) == [Cache.INDEX_PREFIX + "output"]
+    cache.close()
+
+
+def test_cache_stats(tmp_path):
+    filename = str(tmp_path / "cache")
+    cache = Cache(filename)
+    cache.set("naca0012", "x" * 100)
+    cache.set_metadata("https://bigfoil.com", {"ETag": '"v1"'})
+    cache.get("naca0012")
+    cache.get("missing")
+    cache.close()
+
+    cache = Cache(filename)
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["records"]["entries"] == stats["http"]["entries"] == 1
+    assert stats["records"]["bytes"] > 100
+    assert stats["disk"] >= stats["bytes"]
+    # Lookups are accumulated over runs (set_metadata looks up once):
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit-rate"] == 1 / 3
+    cache.close()
+
+
+def test_cache_upgrades_databases_without_usage(tmp_path):
+    filename = str(tmp_path / "cache")
+    connection = sqlite3.connect(filename)
+    connection.execute(
+        "CREATE TABLE cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO cache VALUES (?, ?)", ("naca0012", pickle.dumps("x"))
+    )
+    connection.commit()
+    connection.close()
+
+    cache = Cache(filename)
+    assert cache.get("naca0012") == "x"
+    assert cache.stats()["bytes"] == len(pickle.dumps("x"))
+    cache.close()
+
+
+def test_cache_verify(tmp_path):
+    filename = str(tmp_path / "cache")
+    cache = Cache(filename)
+    cache.set("naca0012", "contour")
+    cache.set("e387", "contour")
+    cache.close()
+
+    connection = sqlite3.connect(filename)
+    connection.execute(
+        "UPDATE cache SET value = ? WHERE key = ?", (b"garbage", "e387")
+    )
+    connection.commit()
+    connection.close()
+
+    cache = Cache(filename)
+    assert cache.verify() == ["e387"]
+    assert cache.verify(repair=True) == ["e387"]
+    assert cache.verify() == []
+    assert list(cache.keys()) == ["naca0012"]
+    before, after = cache.compact()
+    assert after <= before
+    cache.close()
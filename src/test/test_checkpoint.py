@@ -0,0 +1,34 @@
+from bfscraper.tools.checkpoint import Checkpoint
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    filename = str(tmp_path / "checkpoint")
+
+    checkpoint = Checkpoint(filename)
+    checkpoint.set_meta(count=10)
+    checkpoint.update("foil-0", Checkpoint.PARSED, "record")
+    checkpoint.update("foil-0", Checkpoint.DONE, "done")
+    checkpoint.update("foil-1", Checkpoint.FAILED, "failed")
+    checkpoint.set_meta(table=True)
+    checkpoint.close()
+
+    checkpoint = Checkpoint(filename, resume=True)
+    assert checkpoint.meta == {"count": 10, "table": True}
+    assert sorted(checkpoint.entries()) == [
+        ("foil-0", Checkpoint.DONE, "done"),
+        ("foil-1", Checkpoint.FAILED, "failed")
+    ]
+    checkpoint.close()
+
+    # Checkpoints are started over unless resumed:
+    checkpoint = Checkpoint(filename)
+    assert checkpoint.meta == {} and not list(checkpoint.entries())
+    checkpoint.close()
+
+
+def test_checkpoint_discard(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint"))
+    checkpoint.update("foil-0", Checkpoint.DONE, "done")
+    checkpoint.discard()
+
+    assert not list(tmp_path.iterdir())
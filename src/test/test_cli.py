@@ -0,0 +1,91 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("aiohttp", "regex", "tqdm", "colorama", "hurry.filesize", "numpy")
+
+
+@pytest.mark.parametrize("arguments", [
+    ["--help"], ["merge", "--help"], ["cache", "prune", "--help"]
+])
+def test_cli_help_imports_no_heavy_dependencies(arguments):
+    script = (
+        "import sys\n"
+        "from bfscraper.cli.interface import cli\n"
+        "try:\n"
+        f"    cli({arguments!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(*[name for name in {HEAVY!r} if name in sys.modules])\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True
+    )
+
+    assert process.returncode == 0
+    assert process.stdout.splitlines()[-1] == ""
+
+
+@pytest.mark.parametrize("selection", [["-c", "5"], ["--family", "NACA"]])
+def test_cli_incremental_rejects_selections(selection):
+    from click.testing import CliRunner
+
+    from bfscraper.cli.interface import cli
+
+    result = CliRunner().invoke(cli, ["--incremental", *selection])
+
+    assert result.exit_code == 2
+    assert "--incremental cannot be combined" in result.output
+
+
+def test_cli_incremental_rejects_resume():
+    from click.testing import CliRunner
+
+    from bfscraper.cli.interface import cli
+
+    result = CliRunner().invoke(cli, ["--incremental", "--resume"])
+
+    assert result.exit_code == 2
+    assert "--incremental and --resume are exclusive" in result.output
+
+
+def test_cli_rejects_unknown_sites():
+    from click.testing import CliRunner
+
+    from bfscraper.cli.interface import cli
+
+    result = CliRunner().invoke(cli, ["--site", "bigfoil", "--site", "nope"])
+
+    assert result.exit_code == 2
+    assert "unknown sources: nope" in result.output
+
+
+def test_cli_cache_commands(tmp_path):
+    from click.testing import CliRunner
+
+    from bfscraper.cli.interface import cli
+    from bfscraper.tools.cache import Cache
+
+    filename = str(tmp_path / "cache")
+    cache = Cache(filename)
+    for index in range(10):
+        cache.set(f"foil-{index}", "x" * 1000)
+    cache.close()
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["cache", "stats", "-C", filename])
+    assert result.exit_code == 0
+    assert "10 entries" in result.output
+
+    result = runner.invoke(cli, ["cache", "prune", "-C", filename])
+    assert result.exit_code == 2
+
+    result = runner.invoke(
+        cli, ["cache", "prune", "-C", filename, "--max-size", "5K"]
+    )
+    assert result.exit_code == 0
+    assert "Evicted 5 entries" in result.output
+
+    result = runner.invoke(cli, ["cache", "verify", "-C", filename])
+    assert result.exit_code == 0
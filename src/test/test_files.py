@@ -0,0 +1,36 @@
+import os
+
+from bfscraper.tools.files import ContentWriter
+
+
+def write(directory, chunks, suffix=".dat"):
+    with ContentWriter(str(directory), suffix) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.commit()
+
+
+def test_content_writer(tmp_path):
+    file = write(tmp_path, [b"NACA 0012\n", b" 1.0 0.0\n"])
+    assert file["size"] == 19
+    assert file["path"] == os.path.join(
+        file["blake2b"][:2], file["blake2b"] + ".dat"
+    )
+    with open(tmp_path / file["path"], "rb") as fp:
+        assert fp.read() == b"NACA 0012\n 1.0 0.0\n"
+
+    # Identical contents are stored once, however they are chunked:
+    assert write(tmp_path, [b"NACA 0012\n 1.0 0.0\n"]) == file
+    assert write(tmp_path, [b"NACA 0015\n"])["path"] != file["path"]
+    assert sum(len(names) for _, _, names in os.walk(tmp_path)) == 2
+
+
+def test_content_writer_discards_uncommitted(tmp_path):
+    try:
+        with ContentWriter(str(tmp_path)) as writer:
+            writer.write(b"partial")
+            raise ConnectionError
+    except ConnectionError:
+        pass
+
+    assert os.listdir(tmp_path) == []
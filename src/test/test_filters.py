@@ -0,0 +1,55 @@
+import pytest
+
+from bfscraper.scrapers.records import Record
+from bfscraper.tools.filters import EntryFilter
+
+ENTRY = Record.create(
+    name="NACA 2412",
+    family="NACA",
+    info="http://bigfoil.com/airfoil.php?airfoil=n2412-il",
+    page="http://bigfoil.com/D/n2412-il_infoDAT.php",
+    sources=["XFoil", "JavaFoil"],
+    optimizations={"thickness": 12.0, "camber": 2.0, "LD-Max": None}
+)
+
+
+@pytest.mark.parametrize("kwargs, selected", [
+    ({}, True),
+    ({"families": ("naca", "eppler")}, True),
+    ({"families": ("Eppler",)}, False),
+    ({"sources": ("xfoil",)}, True),
+    ({"names": ("naca 24*",)}, True),
+    ({"names": ("n2412-*",)}, True),
+    ({"ranges": {"thickness": (10, 14)}}, True),
+    ({"ranges": {"thickness": (None, 11)}}, False),
+    ({"ranges": {"LD-Max": (None, None)}}, False),
+    ({"families": ("NACA",), "sources": ("Wind tunnel",)}, False),
+    ({"predicates": (lambda key, entry: key.endswith("il"),)}, True)
+])
+def test_entry_filter(kwargs, selected):
+    assert EntryFilter(**kwargs)("n2412-il", ENTRY) is selected
+
+
+def test_parse_range():
+    assert EntryFilter.parse_range("thickness=10:") == (
+        "thickness", (10, None)
+    )
+    assert EntryFilter.parse_range("camber=:2.5") == ("camber", (None, 2.5))
+    for value in ("thickness", "span=1:2", "camber=a:b"):
+        with pytest.raises(ValueError):
+            EntryFilter.parse_range(value)
+
+
+def test_entry_filter_spec():
+    spec = str(EntryFilter(
+        families=("NACA", "Eppler"),
+        ranges={"thickness": (10, None), "camber": (None, 2.5)}
+    ))
+
+    assert spec == (
+        "--family eppler --family naca --range camber=:2.5"
+        " --range thickness=10:"
+    )
+    assert str(EntryFilter(families=("eppler", "naca"), ranges={
+        "camber": (None, 2.5), "thickness": (10, None)
+    })) == spec
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pytest
+
+from bfscraper.geometry.contour import parse_selig
+from bfscraper.geometry.dataset import Dataset, DatasetWriter
+from bfscraper.geometry.metrics import analyze
+
+SELIG = """NACA 0012 AIRFOILS
+ 1.00000  0.00126
+ 0.50000  0.05294
+ 0.00000  0.00000
+ 0.50000 -0.05294
+ 1.00000 -0.00126
+"""
+
+
+def test_parse_selig():
+    contour = parse_selig(SELIG)
+    assert contour.shape == (5, 2)
+    assert contour[1, 1] == 0.05294
+
+
+def test_parse_selig_malformed_lines():
+    contour = parse_selig(SELIG.replace(" 0.00000  0.00000", "# LE\n0 0"))
+    assert contour.shape == (5, 2)
+
+
+def test_dataset_roundtrip(tmp_path):
+    path = str(tmp_path / "dataset")
+
+    with DatasetWriter(path) as writer:
+        writer.write_record("naca0012", {"name": "NACA 0012", "dat": SELIG})
+        writer.write_record("empty", {"name": "Empty", "dat": {}})
+        writer.write("flat", np.zeros((3, 2)), {"family": "Test"})
+
+    dataset = Dataset(path)
+    assert len(dataset) == 2
+    assert isinstance(dataset.coordinates, np.memmap)
+    assert np.array_equal(dataset["naca0012"], parse_selig(SELIG))
+    assert dataset[1].shape == (3, 2)
+    assert dataset.columns["name"] == ["NACA 0012", None]
+    assert dataset.columns["family"] == [None, "Test"]
+
+
+def test_interrupted_dataset_keeps_previous(tmp_path):
+    path = str(tmp_path / "dataset")
+    with DatasetWriter(path) as writer:
+        writer.write("flat", np.zeros((3, 2)))
+
+    with pytest.raises(KeyboardInterrupt):
+        with DatasetWriter(path) as writer:
+            writer.write("other", np.ones((5, 2)))
+            raise KeyboardInterrupt
+
+    dataset = Dataset(path)
+    assert dataset.ids == ["flat"] and dataset[0].shape == (3, 2)
+    assert sorted(os.listdir(path)) == sorted([
+        DatasetWriter.COORDINATES, DatasetWriter.OFFSETS,
+        DatasetWriter.METADATA
+    ])
+
+
+def naca4(code, points=100):
+    m, p, t = int(code[0]) / 100, int(code[1]) / 10, int(code[2:]) / 100
+    x = (1 - np.cos(np.linspace(0, np.pi, points))) / 2
+    yt = 5 * t * (
+        0.2969 * np.sqrt(x) - 0.1260 * x - 0.3516 * x ** 2
+        + 0.2843 * x ** 3 - 0.1015 * x ** 4
+    )
+    yc = np.where(
+        x < p,
+        m / max(p, 1e-9) ** 2 * (2 * p * x - x ** 2),
+        m / (1 - p) ** 2 * ((1 - 2 * p) + 2 * p * x - x ** 2)
+    )
+    return np.vstack([
+        np.column_stack([x, yc + yt])[::-1],
+        np.column_stack([x, yc - yt])[1:]
+    ])
+
+
+def test_metrics(tmp_path):
+    path = str(tmp_path / "dataset")
+
+    with DatasetWriter(path) as writer:
+        writer.write("naca2412", naca4("2412"), {
+            "thickness": 12.0, "x-thickness": 30.0, "camber": 2.0
+        })
+        writer.write("naca0015", naca4("0015"), {
+            "thickness": 12.0, "x-thickness": None, "camber": None
+        })
+
+    metrics, flags = analyze(Dataset(path))
+
+    assert np.allclose(metrics["thickness"], [0.12, 0.15], atol=1e-3)
+    assert np.allclose(metrics["x-thickness"], 0.3, atol=0.01)
+    assert np.allclose(metrics["camber"], [0.02, 0.0], atol=1e-3)
+    assert np.allclose(metrics["x-camber"][0], 0.4, atol=0.01)
+    assert np.all(metrics["te-gap"] > 0)
+    assert flags.tolist() == [[False, False, False], [True, False, False]]
+
+
+def test_metrics_small_percentages(tmp_path):
+    path = str(tmp_path / "dataset")
+
+    # Table values below one are percentages too, not chord fractions:
+    with DatasetWriter(path) as writer:
+        writer.write("naca0012", naca4("0012"), {
+            "thickness": 12.0, "x-thickness": 30.0, "camber": 0.5
+        })
+
+    _, flags = analyze(Dataset(path))
+
+    assert flags.tolist() == [[False, False, False]]
+    assert (tmp_path / "dataset" / "metrics.npz").exists()
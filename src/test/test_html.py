@@ -0,0 +1,68 @@
+import urllib.request
+
+import pytest
+
+from bfscraper.scrapers.async_components import DownloadLinksExtractor
+from bfscraper.scrapers.html import LinksParser
+from bfscraper.scrapers.pipeline import Pipeline
+from bfscraper.scrapers.records import Record
+from bfscraper.scrapers.sources import BigFoil
+from bfscraper.tools.cache import Cache
+
+PAGE = (
+    b"<html><body><div>Airfoil</div>"
+    b"<b>Selig Format DAT File:</b> <a href=\"/D/naca0012.dat\">s</a><br>\n"
+    b"<b>Lednicer Format DAT File:</b> <a href=\"/L/naca0012.dat\">l</a><br>"
+    b"<br><div>footer</div>" + b"x" * 1000 + b"</body></html>"
+)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(PAGE)])
+def test_links_parser_chunks(size):
+    parser = LinksParser("http://host")
+    consumed = 0
+    for start in range(0, len(PAGE), size):
+        consumed = start + size
+        if parser.feed(PAGE[start:start + size]):
+            break
+
+    assert parser.done
+    assert consumed < len(PAGE) or size == len(PAGE)
+    assert parser.links == {
+        "selig-format-dat-file": "http://host/D/naca0012.dat",
+        "lednicer-format-dat-file": "http://host/L/naca0012.dat"
+    }
+
+
+def test_links_parser_missing_block():
+    parser = LinksParser("http://host")
+    assert not parser.feed(b"<html><div>Not found</div></html>")
+    assert not parser.done and not parser.links
+
+
+def test_links_extractor_stops_reading(bigfoil, tmp_path):
+    bigfoil.polars = 100_000
+    page = f"{BigFoil.BASE_URL}/D/foil-0_infoDAT.php"
+    with urllib.request.urlopen(page) as response:
+        size = len(response.read())
+
+    collection = {"foil-0": Record.create(
+        name="Foil", family="NACA", info="", page=page, sources=[],
+        optimizations={}
+    )}
+    cache = Cache(str(tmp_path / "cache"))
+    pipeline = Pipeline(
+        stages=[DownloadLinksExtractor],
+        cache=cache,
+        timeout=-1,
+        limit=1,
+        progress_bar=False
+    )
+    pipeline.scrape(collection)
+    cache.close()
+
+    # The page body after the links block is not read:
+    assert collection["foil-0"].download_links
+    assert pipeline.registry.counter(
+        "bfscraper_response_bytes_total"
+    ).value(host="127.0.0.1") < size / 2
@@ -0,0 +1,13 @@
+from bfscraper.tools.index import diff, digest
+
+
+def test_digest_ignores_column_order():
+    row = {"Name": "NACA 0012", "Thickness": "12.0"}
+    assert digest(row) == digest(dict(reversed(row.items())))
+    assert digest(row) != digest({**row, "Thickness": "12.1"})
+
+
+def test_diff():
+    previous = {"a": "1", "b": "2", "c": "3"}
+    current = {"a": "1", "b": "4", "d": "5"}
+    assert diff(previous, current) == ({"d"}, {"b"}, {"c"})
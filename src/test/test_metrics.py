@@ -0,0 +1,33 @@
+import json
+
+from bfscraper.tools.metrics import MetricsExporter, MetricsRegistry
+
+
+def test_registry_prometheus():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc(status=200)
+    registry.counter("requests_total").inc(2, status=200)
+    histogram = registry.histogram("wait_seconds", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage="links")
+
+    text = registry.prometheus()
+    assert "# HELP requests_total Requests." in text
+    assert 'requests_total{status="200"} 3' in text
+    assert 'wait_seconds_bucket{stage="links",le="0.1"} 1' in text
+    assert 'wait_seconds_bucket{stage="links",le="1.0"} 2' in text
+    assert 'wait_seconds_bucket{stage="links",le="+Inf"} 3' in text
+    assert 'wait_seconds_count{stage="links"} 3' in text
+    assert histogram.sum(stage="links") == 5.55
+
+
+def test_exporter_snapshots(tmp_path):
+    registry = MetricsRegistry()
+    filename = str(tmp_path / "stats.json")
+
+    with MetricsExporter(registry, filename, interval=0.01):
+        registry.histogram("stage_seconds").observe(0.2, stage="fetch")
+
+    data = json.loads(open(filename).read())
+    series = data["stage_seconds"]["series"][0]
+    assert series["labels"] == {"stage": "fetch"} and series["count"] == 1
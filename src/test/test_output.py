@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from bfscraper.tools.output import OutputWriter
+
+RECORDS = {
+    "naca0012": {"name": "NACA 0012", "optimizations": {"camber": 0.0}},
+    "e387": {"name": "Eppler 387", "optimizations": {"camber": 3.8}}
+}
+
+
+@pytest.mark.parametrize("format", ["json", "compact"])
+def test_output_writer_json(tmp_path, format):
+    filename = tmp_path / "scraped.json"
+
+    with OutputWriter(str(filename), format) as writer:
+        for key, record in RECORDS.items():
+            writer.write(key, record)
+
+    content = filename.read_text()
+    assert json.loads(content) == RECORDS
+    assert writer.bytes == len(content)
+    if format == "json":
+        assert content == json.dumps(RECORDS, indent=4)
+
+
+def test_output_writer_ndjson(tmp_path):
+    filename = tmp_path / "scraped.ndjson"
+
+    with OutputWriter(str(filename), "ndjson") as writer:
+        for key, record in RECORDS.items():
+            writer.write(key, record)
+
+    lines = filename.read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(RECORDS)
+    assert writer.records == 2
+
+
+def test_output_writer_empty(tmp_path):
+    filename = tmp_path / "scraped.json"
+    OutputWriter(str(filename)).close()
+    assert json.loads(filename.read_text()) == {}
+
+
+@pytest.mark.parametrize("format", OutputWriter.FORMATS)
+def test_output_writer_read(tmp_path, format):
+    filename = str(tmp_path / "scraped.json")
+
+    with OutputWriter(filename, format) as writer:
+        for key, record in RECORDS.items():
+            writer.write(key, record)
+
+    assert dict(OutputWriter.read(filename, format)) == RECORDS
@@ -0,0 +1,173 @@
+import asyncio
+
+from bfscraper.scrapers.async_components import AsyncScraper
+from bfscraper.scrapers.pipeline import Pipeline
+from bfscraper.tools.cache import Cache
+
+EVENTS = []
+
+
+class SlowStage(AsyncScraper):
+    async def _process(self, entry, collection):
+        await asyncio.sleep(0.05 * collection[entry])
+        EVENTS.append(("first", entry))
+
+
+class FastStage(AsyncScraper):
+    async def _process(self, entry, collection):
+        EVENTS.append(("second", entry))
+
+
+def test_pipeline_streams_entries(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {"fast": 0, "slow": 4}
+
+    pipeline = Pipeline(
+        stages=[SlowStage, FastStage],
+        cache=cache,
+        timeout=-1,
+        limit=2,
+        progress_bar=False
+    )
+    pipeline.scrape(collection)
+    cache.close()
+
+    # The fast entry reaches the second stage before the slow one is done:
+    assert EVENTS.index(("second", "fast")) < EVENTS.index(("first", "slow"))
+    assert len(EVENTS) == 4
+    assert not pipeline.failed
+
+
+def test_pipeline_completed_entries_leave_collection(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {f"entry-{i}": 0 for i in range(20)}
+    completed = []
+
+    def on_complete(entry):
+        completed.append(entry)
+        del collection[entry]
+
+    pipeline = Pipeline(
+        stages=[FastStage],
+        cache=cache,
+        timeout=-1,
+        limit=2,
+        progress_bar=False,
+        on_complete=on_complete
+    )
+    pipeline.scrape(collection)
+    cache.close()
+
+    assert len(completed) == 20 and not collection
+
+
+def test_pipeline_source(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {}
+    scrapers = []
+
+    async def source(scraper):
+        scrapers.append(scraper(FastStage))
+        for index in range(5):
+            collection[f"entry-{index}"] = 0
+            yield f"entry-{index}"
+
+    pipeline = Pipeline(
+        stages=[FastStage],
+        cache=cache,
+        timeout=-1,
+        limit=2,
+        progress_bar=False
+    )
+    pipeline.scrape(collection, source)
+    cache.close()
+
+    assert scrapers[0].session is not None
+    assert scrapers[0].breaker is pipeline.breaker
+    assert not pipeline.failed
+
+
+def test_pipeline_coalesces_urls(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {f"entry-{i}": i % 2 for i in range(10)}
+    fetched = []
+
+    class URLStage(AsyncScraper):
+        async def _process(self, entry, collection):
+            async def fetch():
+                fetched.append(entry)
+                await asyncio.sleep(0.01)
+                return collection[entry]
+
+            url = f"https://example.com/{collection[entry]}"
+            collection[entry], _ = await self._coalesce(url, fetch)
+
+    pipeline = Pipeline(
+        stages=[URLStage],
+        cache=cache,
+        timeout=-1,
+        limit=4,
+        progress_bar=False
+    )
+    pipeline.scrape(collection)
+    cache.close()
+
+    assert len(fetched) == 2
+    assert collection == {f"entry-{i}": i % 2 for i in range(10)}
+    assert pipeline.registry.counter(
+        "bfscraper_coalesced_requests_total"
+    ).value(stage="URLStage") == 8
+
+
+def test_pipeline_iterate_applies_backpressure(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {f"entry-{i}": 0 for i in range(50)}
+    processed = []
+
+    class CountingStage(AsyncScraper):
+        async def _process(self, entry, collection):
+            processed.append(entry)
+
+    pipeline = Pipeline(
+        stages=[CountingStage],
+        cache=cache,
+        timeout=-1,
+        limit=2,
+        progress_bar=False
+    )
+
+    async def main():
+        received = []
+        async for entry in pipeline.iterate(collection):
+            received.append(entry)
+            await asyncio.sleep(0.01)
+            # Only a few entries are processed ahead of the consumer:
+            assert len(processed) - len(received) <= 4 * pipeline.limit
+        return received
+
+    received = asyncio.run(main())
+    cache.close()
+
+    assert sorted(received) == sorted(collection)
+
+
+def test_pipeline_iterate_cancels_on_close(tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    collection = {f"entry-{i}": 0 for i in range(1000)}
+
+    pipeline = Pipeline(
+        stages=[FastStage],
+        cache=cache,
+        timeout=-1,
+        limit=2,
+        progress_bar=False
+    )
+
+    async def main():
+        entries = pipeline.iterate(collection)
+        first = await anext(entries)
+        await entries.aclose()
+        return first
+
+    assert asyncio.run(main()) in collection
+    cache.close()
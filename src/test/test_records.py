@@ -0,0 +1,103 @@
+import math
+import pickle
+
+from bfscraper.scrapers.records import Record
+from bfscraper.tools.cache import Cache
+from bfscraper.tools.output import OutputWriter
+from test_site_scraper import scraper
+
+
+def record(index, **kwargs):
+    return Record.create(
+        name=f"Foil {index}",
+        family="".join(["NA", "CA"]),
+        info=f"http://bigfoil.com/airfoil.php?airfoil=foil-{index}",
+        page=f"http://bigfoil.com/D/foil-{index}_infoDAT.php",
+        sources=["XFoil", "".join(["Java", "Foil"])],
+        optimizations={"thickness": 12.0, "camber": None},
+        **kwargs
+    )
+
+
+def test_record_dict_layout():
+    entry = record(1)
+    assert entry.to_dict() == {
+        "name": "Foil 1",
+        "family": "NACA",
+        "links": {
+            "info": "http://bigfoil.com/airfoil.php?airfoil=foil-1",
+            "files": "http://bigfoil.com/D/foil-1_infoDAT.php"
+        },
+        "download-links": {},
+        "dat": {},
+        "data-sources": ["XFoil", "JavaFoil"],
+        "optimizations": {
+            "thickness": 12.0, "x-thickness": None, "camber": None,
+            "LD-Max": None, "Cl-Max": None, "CdCl01": None, "CdCl04": None,
+            "CdCl06": None
+        }
+    }
+    assert entry.optimization("thickness") == 12.0
+    assert entry.optimization("camber") is None
+
+    entry.dat = "foil-1"
+    assert Record.from_dict(entry.to_dict()).to_dict() == entry.to_dict()
+    files = record(1, files=True)
+    assert "files" in files.to_dict() and "dat" not in files.to_dict()
+    assert Record.from_dict(files.to_dict()).files == {}
+
+
+def test_record_strings_are_interned():
+    first, second = record(1), record(2)
+    assert first.family is second.family
+    assert first.sources[1] is second.sources[1]
+
+    loaded = pickle.loads(pickle.dumps(first))
+    assert loaded.family is first.family
+    assert loaded.to_dict() == first.to_dict()
+    assert math.isnan(loaded.optimizations[1])
+
+
+def test_record_pickles_smaller():
+    entry = record(1)
+    assert len(pickle.dumps(entry)) < len(pickle.dumps(entry.to_dict()))
+
+
+def test_legacy_cache_rows_are_loaded(bigfoil, tmp_path):
+    scraper(tmp_path, count=5).run()
+    output = (tmp_path / "scraped.json").read_text()
+
+    # Caches written by previous versions store dictionaries:
+    cache = Cache(str(tmp_path / "cache"))
+    for key, value in OutputWriter.read(str(tmp_path / "scraped.json")):
+        cache.set(key, value)
+    cache.close()
+
+    bigfoil.requests.clear()
+    scraper(tmp_path, count=5).run()
+    assert not bigfoil.requests
+    assert (tmp_path / "scraped.json").read_text() == output
+
+
+def test_record_merge():
+    first = record(1)
+    first.merge(Record.create(
+        name="Foil 1", family="NACA", info="", page="",
+        sources=["Wind", "XFoil"],
+        optimizations={"thickness": 15.0, "camber": 2.0}
+    ))
+
+    assert first.sources == ("XFoil", "JavaFoil", "Wind")
+    assert first.optimization("thickness") == 12.0
+    assert first.optimization("camber") == 2.0
+
+
+def test_record_legacy_state():
+    entry = record(1, origin="bigfoil")
+    assert pickle.loads(pickle.dumps(entry)).origin == "bigfoil"
+
+    # Records pickled by previous versions have no origin:
+    legacy = Record.__new__(Record)
+    legacy.__setstate__(entry.__getstate__()[:9])
+    assert legacy.origin == ""
+    assert legacy.to_dict() == entry.to_dict()
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+from bfscraper.scrapers.async_components import (DownloadDataExtractor,
+                                                 DownloadLinksExtractor)
+from bfscraper.scrapers.pipeline import Pipeline
+from bfscraper.scrapers.records import Record
+from bfscraper.scrapers.retry import (CircuitBreaker, CircuitOpen, Retry,
+                                      RetryPolicy)
+from bfscraper.scrapers.scheduler import WorkerPool
+from bfscraper.scrapers.sources import BigFoil
+from bfscraper.tools.cache import Cache
+
+
+def record(page):
+    return Record.create(
+        name="Foil", family="NACA", info="", page=page, sources=[],
+        optimizations={}
+    )
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(retries=3, backoff=1.0, max_backoff=4.0)
+
+    assert RetryPolicy.is_retryable(asyncio.TimeoutError())
+    assert not RetryPolicy.is_retryable(ValueError())
+    assert 0 <= policy.delay(1, asyncio.TimeoutError()) <= 1.0
+    assert 0 <= policy.delay(10, asyncio.TimeoutError()) <= 4.0
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    url = "https://bigfoil.com/D/x.dat"
+
+    breaker.check(url)
+    breaker.failure(url)
+    breaker.failure(url)
+
+    with pytest.raises(CircuitOpen):
+        breaker.check(url)
+
+    breaker.success(url)
+    breaker.check(url)
+
+
+def test_circuit_breaker_counts_failed_probes():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    url = "https://bigfoil.com/D/x.dat"
+
+    breaker.failure(url)
+    breaker.check(url)
+
+    # The probe in flight is not counted until it fails:
+    with pytest.raises(CircuitOpen) as rejected:
+        breaker.check(url)
+    assert rejected.value.probes == 0
+
+    breaker.failure(url)
+    breaker.check(url)
+    breaker.failure(url)
+    breaker.check(url)
+
+    with pytest.raises(CircuitOpen) as rejected:
+        breaker.check(url)
+    assert rejected.value.probes == 2
+
+
+def test_cancelled_probe_releases_the_circuit(bigfoil, tmp_path):
+    bigfoil.latency = 1
+    url = f"{BigFoil.BASE_URL}/D/foil-0_infoDAT.php"
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.failure(url)
+    cache = Cache(str(tmp_path / "cache"))
+
+    async def request(extractor):
+        async with extractor._request(url):
+            pass
+
+    async def probe():
+        extractor = DownloadLinksExtractor(
+            cache=cache,
+            timeout=-1,
+            limit=1,
+            progress_bar=False,
+            session=DownloadLinksExtractor.create_session(-1, 1),
+            breaker=breaker
+        )
+        task = asyncio.create_task(request(extractor))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await extractor._session.close()
+
+    asyncio.run(probe())
+    cache.close()
+
+    # Another probe may be sent:
+    breaker.check(url)
+
+
+def test_worker_pool_retries_without_blocking():
+    attempts = {}
+    handled = []
+
+    async def handler(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 0 and attempts[item] < 3:
+            raise Retry(0.05)
+        handled.append(item)
+
+    asyncio.run(WorkerPool(workers=1).run(range(4), handler))
+
+    # The retried item does not hold the only worker while waiting:
+    assert handled == [1, 2, 3, 0]
+    assert attempts[0] == 3
+
+
+def test_stages_retry_through_an_outage(bigfoil, tmp_path):
+    bigfoil.outage = 0.6
+    base_url = BigFoil.BASE_URL
+    collection = {
+        f"foil-{index}": record(f"{base_url}/D/foil-{index}_infoDAT.php")
+        for index in range(20)
+    }
+
+    cache = Cache(str(tmp_path / "cache"))
+    pipeline = Pipeline(
+        stages=[DownloadLinksExtractor, DownloadDataExtractor],
+        cache=cache,
+        timeout=-1,
+        limit=4,
+        progress_bar=False,
+        retry=RetryPolicy(retries=2, backoff=0.05, max_backoff=0.1)
+    )
+    pipeline.breaker = CircuitBreaker(threshold=3, cooldown=0.35)
+    pipeline.scrape(collection)
+    cache.close()
+
+    # Requests rejected by the open circuit do not use up retries:
+    assert not pipeline.failed
+    assert all(
+        entry.dat == bigfoil.contour(int(key.removeprefix("foil-")))
+        for key, entry in collection.items()
+    )
+
+
+def test_shared_fetches_fail_once(bigfoil, tmp_path):
+    bigfoil.outage = 0.05
+    base_url = BigFoil.BASE_URL
+    collection = {
+        f"copy-{index}": record(f"{base_url}/D/foil-0_infoDAT.php")
+        for index in range(5)
+    }
+
+    cache = Cache(str(tmp_path / "cache"))
+    pipeline = Pipeline(
+        stages=[DownloadLinksExtractor, DownloadDataExtractor],
+        cache=cache,
+        timeout=-1,
+        limit=5,
+        progress_bar=False,
+        retry=RetryPolicy(retries=4, backoff=0.2, max_backoff=0.4)
+    )
+    pipeline.scrape(collection)
+    keys = [key for key in cache.keys() if key in collection]
+    cache.close()
+
+    # Entries sharing a failed request do not use up its retries:
+    assert not pipeline.failed
+    assert all(
+        entry.dat == bigfoil.contour(0) for entry in collection.values()
+    )
+    # Only the entries that sent the two requests cache their values:
+    assert 1 <= len(keys) <= 2
+
+
+def test_stages_give_up_on_a_host_that_stays_down(bigfoil, tmp_path):
+    bigfoil.outage = 60
+    base_url = BigFoil.BASE_URL
+    collection = {
+        f"foil-{index}": record(f"{base_url}/D/foil-{index}_infoDAT.php")
+        for index in range(20)
+    }
+
+    cache = Cache(str(tmp_path / "cache"))
+    pipeline = Pipeline(
+        stages=[DownloadLinksExtractor, DownloadDataExtractor],
+        cache=cache,
+        timeout=-1,
+        limit=4,
+        progress_bar=False,
+        retry=RetryPolicy(retries=1, backoff=0.01, max_backoff=0.02)
+    )
+    pipeline.breaker = CircuitBreaker(threshold=2, cooldown=0.25)
+    pipeline.scrape(collection)
+    cache.close()
+
+    # Queued URLs fail once the host's probes have used up the retries,
+    # instead of waiting for a cooldown per entry and attempt:
+    assert sum(map(len, pipeline.failed.values())) == len(collection)
+    assert "CircuitOpen" in pipeline.failed
+    assert sum(bigfoil.requests.values()) < 2 * len(collection)
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from bfscraper.scrapers.scheduler import (AdaptiveLimiter, HostLimiter,
+                                          SingleFlight, WorkerPool)
+
+
+def test_worker_pool_bounds_concurrency():
+    active = peak = 0
+    handled = []
+
+    async def handler(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        handled.append(item)
+        active -= 1
+
+    asyncio.run(WorkerPool(workers=3).run(
+        (item for item in range(50)), handler
+    ))
+
+    assert sorted(handled) == list(range(50))
+    assert peak <= 3
+
+
+def test_worker_pool_reports_errors():
+    errors = []
+
+    async def handler(item):
+        if item % 2:
+            raise ValueError(item)
+
+    asyncio.run(WorkerPool(
+        workers=2,
+        on_error=lambda item, exc: errors.append(item)
+    ).run(range(6), handler))
+
+    assert sorted(errors) == [1, 3, 5]
+
+    with pytest.raises(ExceptionGroup):
+        asyncio.run(WorkerPool(workers=2).run(range(6), handler))
+
+
+def test_host_limiter():
+    limiter = HostLimiter({"bigfoil.com": 1})
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.slot("https://bigfoil.com/D/x_infoDAT.php"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    asyncio.run(run())
+    assert peak == 1
+
+
+def test_adaptive_limiter():
+    limiter = AdaptiveLimiter(minimum=2, maximum=8)
+
+    async def request(fail=False):
+        async with limiter.slot():
+            if fail:
+                raise asyncio.TimeoutError()
+
+    async def run():
+        for _ in range(20):
+            await request()
+        assert limiter.limit == 8
+
+        with pytest.raises(asyncio.TimeoutError):
+            await request(fail=True)
+
+    asyncio.run(run())
+
+    assert limiter.limit == 4
+    assert limiter.peak == 8
+    assert limiter.decreases[0][1:] == (8, 4, "TimeoutError")
+
+
+def test_adaptive_limiter_cuts_once_per_round_trip():
+    limiter = AdaptiveLimiter(minimum=2, maximum=64)
+    limiter._success(1.0)
+    limiter.limit = 64
+
+    # Simultaneous failures are a single congestion signal:
+    for _ in range(6):
+        limiter._decrease("timeout", 0.5)
+
+    assert limiter.limit == 32
+    assert len(limiter.decreases) == 1
+
+    # The next round trip may cut the limit again:
+    limiter._last_decrease -= 2
+    limiter._decrease("timeout")
+    assert limiter.limit == 16
+
+
+def test_single_flight_coalesces_calls():
+    calls = []
+    shared = []
+    flights = SingleFlight(size=1, on_shared=shared.append)
+
+    async def fetch():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        results = await asyncio.gather(
+            *(flights.do("a", fetch) for _ in range(5))
+        )
+        # Completed calls are reused, up to the size limit:
+        results.append(await flights.do("a", fetch))
+        await flights.do("b", fetch)
+        results.append(await flights.do("a", fetch))
+        return results
+
+    assert asyncio.run(main()) == ["result"] * 7
+    assert len(calls) == 3
+    assert shared == ["a"] * 5
+
+
+def test_single_flight_shares_exceptions():
+    calls = []
+    flights = SingleFlight()
+
+    async def fetch():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        results = await asyncio.gather(
+            *(flights.do("a", fetch) for _ in range(3)),
+            return_exceptions=True
+        )
+        # Failed calls are not kept:
+        results.append(
+            (await asyncio.gather(flights.do("a", fetch),
+                                  return_exceptions=True))[0]
+        )
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 2
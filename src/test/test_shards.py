@@ -0,0 +1,70 @@
+import pytest
+
+from bfscraper.scrapers.site_scraper import SiteScraper
+from bfscraper.tools.output import OutputWriter
+from bfscraper.tools.shards import Shard, merge
+
+KEYS = [f"foil-{index}" for index in range(200)]
+
+
+def test_shard_parse():
+    shard = Shard.parse("1/4")
+    assert (shard.index, shard.count) == (1, 4)
+    assert str(shard) == "1/4"
+    for value in ("4/4", "-1/4", "1", "a/b"):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+def test_shard_paths():
+    assert Shard(1, 2).path("out/scraped.json") == "out/scraped.1-of-2.json"
+    assert Shard.paths("contours/", 2) == [
+        "contours.0-of-2", "contours.1-of-2"
+    ]
+
+
+def test_shard_partition():
+    shards = [Shard(index, 3) for index in range(3)]
+    owners = [[shard for shard in shards if shard(key)] for key in KEYS]
+    assert all(len(owner) == 1 for owner in owners)
+    assert all(
+        any(shard in owner for owner in owners) for shard in shards
+    )
+
+
+def test_shard_share():
+    assert [Shard(index, 4).share(10) for index in range(4)] == [3, 3, 2, 2]
+    assert [Shard(index, 4).share(2) for index in range(4)] == [1, 1, 0, 0]
+    assert Shard(0, 4).share(-1) == -1
+
+
+@pytest.mark.parametrize("format", OutputWriter.FORMATS)
+def test_merge(tmp_path, format):
+    output = str(tmp_path / "scraped.json")
+    inputs = Shard.paths(output, 2)
+    for index, filename in enumerate(inputs):
+        with OutputWriter(filename, format) as writer:
+            for key in KEYS[index::2] + KEYS[:1]:
+                writer.write(key, {"name": key})
+
+    assert merge(inputs, output, format) == len(KEYS)
+    assert sorted(OutputWriter.read(output, format)) == sorted(
+        (key, {"name": key}) for key in KEYS
+    )
+
+
+def test_merged_shards_scrape_count(bigfoil, tmp_path):
+    output = str(tmp_path / "scraped.json")
+    for index in range(4):
+        SiteScraper(
+            count=10,
+            output=output,
+            timeout=-1,
+            limit=4,
+            verbose=False,
+            cache=str(tmp_path / "cache"),
+            shard=Shard(index, 4)
+        ).run()
+
+    # The count applies to the whole crawl, not to every shard:
+    assert merge(Shard.paths(output, 4), output) == 10
@@ -0,0 +1,223 @@
+import os
+import signal
+
+import pytest
+
+from bfscraper.scrapers.pipeline import Pipeline
+from bfscraper.scrapers.site_scraper import SiteScraper
+from bfscraper.scrapers.sources import BigFoil
+from bfscraper.tools.cache import Cache
+from bfscraper.tools.checkpoint import Checkpoint
+from bfscraper.tools.filters import EntryFilter
+from bfscraper.tools.output import OutputWriter
+
+
+def scraper(tmp_path, **kwargs):
+    return SiteScraper(**{
+        "count": -1,
+        "output": str(tmp_path / "scraped.json"),
+        "timeout": -1,
+        "limit": 4,
+        "verbose": False,
+        "cache": str(tmp_path / "cache"),
+        **kwargs
+    })
+
+
+def test_failed_run_keeps_cache_writes(bigfoil, tmp_path, monkeypatch):
+    scrape = Pipeline.scrape
+
+    def interrupted(self, *args):
+        scrape(self, *args)
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(Pipeline, "scrape", interrupted)
+    with pytest.raises(RuntimeError):
+        scraper(tmp_path, count=5).run()
+
+    cache = Cache(str(tmp_path / "cache"))
+    assert sum(key.startswith("foil-") for key in cache.keys()) == 5
+    cache.close()
+
+
+def test_failed_run_keeps_previous_output(bigfoil, tmp_path, monkeypatch):
+    scraper(tmp_path, count=5).run()
+    output = (tmp_path / "scraped.json").read_text()
+
+    # Nothing listens on the discard port:
+    monkeypatch.setattr(
+        BigFoil, "TABLE_URL", "http://127.0.0.1:9/bigtable1.json"
+    )
+    with pytest.raises(Exception):
+        scraper(tmp_path, count=5, retries=0).run()
+
+    assert (tmp_path / "scraped.json").read_text() == output
+    assert not (tmp_path / "scraped.json.tmp").exists()
+
+
+def test_incremental_run_patches_output(bigfoil, tmp_path, monkeypatch):
+    output = str(tmp_path / "scraped.json")
+    scraper(tmp_path, incremental=True).run()
+
+    # Remove two airfoils and change another one:
+    table = bigfoil.table
+
+    def changed():
+        rows = table()[:18]
+        rows[5]["LD Max"] = "999"
+        return rows
+
+    monkeypatch.setattr(bigfoil, "table", changed)
+    bigfoil.requests.clear()
+    scraper(tmp_path, incremental=True).run()
+
+    records = dict(OutputWriter.read(output))
+    assert len(records) == 18
+    assert records["foil-5"]["optimizations"]["LD-Max"] == 999
+    assert records["foil-3"]["dat"] == bigfoil.contour(3)
+    # Only the changed airfoil is downloaded again:
+    assert bigfoil.requests == {"200": 2}
+
+    cache = Cache(str(tmp_path / "cache"))
+    assert "foil-19" not in cache and "foil-3" in cache
+    cache.close()
+
+
+def test_incremental_run_requires_every_entry(tmp_path):
+    with pytest.raises(ValueError):
+        scraper(tmp_path, incremental=True, count=5)
+
+
+def test_expired_entries_are_revalidated(bigfoil, tmp_path):
+    scraper(tmp_path, count=5).run()
+    output = (tmp_path / "scraped.json").read_text()
+
+    # Fresh entries are served from the cache:
+    bigfoil.requests.clear()
+    scraper(tmp_path, count=5).run()
+    assert not bigfoil.requests
+
+    # Expired ones are revalidated with conditional requests:
+    scraper(tmp_path, count=5, ttl=0).run()
+    assert bigfoil.requests == {"304": 10}
+    assert (tmp_path / "scraped.json").read_text() == output
+
+
+def test_files_are_streamed_to_disk(bigfoil, tmp_path):
+    files = tmp_path / "files"
+    scraper(tmp_path, count=5, files=str(files), formats=None).run()
+    records = dict(OutputWriter.read(str(tmp_path / "scraped.json")))
+
+    assert len(records) == 5
+    for key, record in records.items():
+        assert "dat" not in record
+        assert set(record["files"]) == {
+            "selig-format-dat-file", "lednicer-format-dat-file"
+        }
+        selig = record["files"]["selig-format-dat-file"]
+        assert (files / selig["path"]).read_text() == bigfoil.contour(
+            int(key.removeprefix("foil-"))
+        )
+
+    # Deleted files are downloaded again, and only them:
+    os.remove(files / records["foil-2"]["files"]["selig-format-dat-file"][
+        "path"
+    ])
+    bigfoil.requests.clear()
+    scraper(tmp_path, count=5, files=str(files), formats=None).run()
+
+    assert bigfoil.requests == {"200": 1}
+    assert dict(OutputWriter.read(str(tmp_path / "scraped.json"))) == records
+
+
+def interrupt(monkeypatch, after):
+    save = SiteScraper._save_record
+    saved = []
+
+    # Entries completed while the interruption is handled are not saved:
+    def interrupted(self, entry, data):
+        if len(saved) == after:
+            signal.raise_signal(signal.SIGINT)
+        if len(saved) < after:
+            save(self, entry, data)
+        saved.append(entry)
+
+    monkeypatch.setattr(SiteScraper, "_save_record", interrupted)
+
+
+def test_interrupted_run_is_resumed(bigfoil, tmp_path, monkeypatch):
+    (tmp_path / "clean").mkdir()
+    scraper(tmp_path / "clean", count=10).run()
+    output = dict(OutputWriter.read(str(tmp_path / "clean" / "scraped.json")))
+
+    with monkeypatch.context() as patch:
+        interrupt(patch, 4)
+        with pytest.raises(KeyboardInterrupt):
+            scraper(tmp_path, count=10).run()
+    assert not (tmp_path / "scraped.json").exists()
+    assert not (tmp_path / "scraped.json.tmp").exists()
+
+    checkpoint = Checkpoint(str(tmp_path / "scraped.json.checkpoint"), True)
+    states = [state for _, state, _ in checkpoint.entries()]
+    table = checkpoint.meta.get("table")
+    checkpoint.close()
+    assert states.count(Checkpoint.DONE) == 4
+
+    # Without the cache, only pending entries are requested:
+    os.remove(tmp_path / "cache")
+    bigfoil.requests.clear()
+    bigfoil.table_requests.clear()
+    scraper(tmp_path, count=10, resume=True).run()
+
+    assert bigfoil.requests == {"200": (
+        2 * states.count(Checkpoint.PARSED) + states.count(Checkpoint.LINKS)
+        + 2 * (10 - len(states))
+    )}
+    assert bool(bigfoil.table_requests) != bool(table)
+    # Records are written in completion order:
+    assert dict(OutputWriter.read(str(tmp_path / "scraped.json"))) == output
+    assert not (tmp_path / "scraped.json.checkpoint").exists()
+
+
+def test_failed_entries_are_resumed(bigfoil, tmp_path):
+    bigfoil.broken = {3, 7}
+    scraper(tmp_path, count=10, retries=0).run()
+    assert (tmp_path / "scraped.json.checkpoint").exists()
+
+    bigfoil.broken = set()
+    bigfoil.requests.clear()
+    bigfoil.table_requests.clear()
+    scraper(tmp_path, count=10, resume=True).run()
+
+    records = dict(OutputWriter.read(str(tmp_path / "scraped.json")))
+    assert len(records) == 10
+    assert records["foil-3"]["dat"] == bigfoil.contour(3)
+    # Only the failed airfoils are requested again:
+    assert bigfoil.requests == {"200": 4}
+    assert not bigfoil.table_requests
+    assert not (tmp_path / "scraped.json.checkpoint").exists()
+
+
+def test_resumed_run_with_another_selection_starts_over(bigfoil, tmp_path):
+    bigfoil.broken = {10}
+    scraper(tmp_path, retries=0, filter=EntryFilter(names=("foil-1*",))).run()
+    assert (tmp_path / "scraped.json.checkpoint").exists()
+
+    os.remove(tmp_path / "cache")
+    bigfoil.broken = set()
+    bigfoil.requests.clear()
+    scraper(tmp_path, resume=True).run()
+
+    # The progress of the filtered run does not cover the whole catalogue:
+    assert len(dict(OutputWriter.read(str(tmp_path / "scraped.json")))) == 20
+    assert bigfoil.requests == {"200": 40}
+
+
+def test_resumed_run_without_checkpoint_starts_over(bigfoil, tmp_path):
+    scraper(tmp_path, count=5, resume=True).run()
+    assert len(dict(OutputWriter.read(str(tmp_path / "scraped.json")))) == 5
+
+
+def test_incremental_run_cannot_be_resumed(tmp_path):
+    with pytest.raises(ValueError):
+        scraper(tmp_path, incremental=True, resume=True)
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+from mock_server import MockBigFoil
+
+import bfscraper
+from bfscraper.scrapers.sources import SOURCES, BigFoil, SourceRegistry
+from bfscraper.tools.output import OutputWriter
+from test_site_scraper import scraper
+
+
+class Mirror(BigFoil):
+    NAME = "mirror"
+
+
+@pytest.fixture
+def mirror(monkeypatch):
+    server = MockBigFoil(count=30, latency=0, jitter=0)
+    table = server.table
+
+    # The mirror lists wind tunnel data for every airfoil:
+    def rows():
+        return [
+            {**row, "Data Sources": "XFoil Wind", "CdCl06": "0.01"}
+            for row in table()
+        ]
+
+    monkeypatch.setattr(server, "table", rows)
+    with server.serve("127.0.0.2") as base_url:
+        monkeypatch.setattr(Mirror, "BASE_URL", base_url)
+        monkeypatch.setattr(
+            Mirror, "TABLE_URL", f"{base_url}/bigtable1.json"
+        )
+        monkeypatch.setitem(SOURCES, Mirror.NAME, Mirror)
+        yield server
+
+
+def test_canonical_keys():
+    assert Mirror.canonical("foil-3") == "foil-3"
+    assert Mirror.canonical(" NACA 0012 ") == "naca-0012"
+    assert Mirror.canonical("e387_il") == "e387_il"
+
+
+def test_registry_rejects_unknown_sources():
+    with pytest.raises(ValueError):
+        SourceRegistry(["bigfoil", "missing"])
+    with pytest.raises(ValueError):
+        SourceRegistry([])
+
+
+def test_single_source_stages_are_not_routed():
+    registry = SourceRegistry()
+    assert registry.names == ("bigfoil",)
+    assert registry.budgets(20) == {}
+    assert registry.stages(None, None) == BigFoil().stages(None, None)
+
+
+def test_sources_share_one_pipeline(bigfoil, mirror, tmp_path):
+    instance = scraper(tmp_path, sites=("bigfoil", "mirror"))
+    pipeline = instance._pipeline()
+
+    # Every host gets its own budget within a single connection pool:
+    assert pipeline.limit == 8
+    assert pipeline.hosts.limits == {"127.0.0.1": 4, "127.0.0.2": 4}
+    assert [stage.__name__ for stage in pipeline.stages] == [
+        "DownloadLinksExtractor", "DownloadDataExtractor"
+    ]
+    instance.cache.close()
+
+
+def test_sources_are_merged(bigfoil, mirror, tmp_path, monkeypatch):
+    # The mirror table arrives once BigFoil airfoils are being scraped:
+    table = mirror.table
+    monkeypatch.setattr(mirror, "table", lambda: time.sleep(0.2) or table())
+    scraper(tmp_path, sites=("bigfoil", "mirror")).run()
+    records = dict(OutputWriter.read(str(tmp_path / "scraped.json")))
+
+    assert len(records) == 30
+    for index in range(30):
+        record = records[f"foil-{index}"]
+        assert record["dat"] == bigfoil.contour(index)
+        assert record["optimizations"]["CdCl06"] == 0.01
+        assert set(record["data-sources"]) == {"XFoil", "JavaFoil", "Wind"} \
+            if index < 20 else {"XFoil", "Wind"}
+
+    # Both tables are read, and every airfoil is scraped once:
+    assert bigfoil.table_requests == mirror.table_requests == {"200": 1}
+    assert bigfoil.requests["200"] + mirror.requests["200"] == 60
+    assert mirror.requests["200"] >= 20
+
+
+def test_scrape_iter_merges_sources(bigfoil, mirror, tmp_path):
+    async def main():
+        return [
+            item async for item in bfscraper.scrape_iter(
+                cache=str(tmp_path / "cache"), sites=("mirror", "bigfoil")
+            )
+        ]
+
+    records = dict(asyncio.run(main()))
+
+    assert len(records) == 30
+    assert set(records["foil-3"]["data-sources"]) == {
+        "XFoil", "JavaFoil", "Wind"
+    }
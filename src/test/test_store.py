@@ -0,0 +1,75 @@
+import math
+import os
+
+import pytest
+
+from bfscraper.store import Store
+from bfscraper.tools.output import OutputWriter
+
+RECORDS = {
+    f"foil-{index}": {
+        "name": f"Foil {index}",
+        "family": "NACA" if index % 2 else "Eppler",
+        "optimizations": {
+            "thickness": float(10 + index % 5),
+            "LD-Max": None if index == 3 else float(50 + index)
+        }
+    }
+    for index in range(20)
+}
+
+
+@pytest.fixture(params=OutputWriter.FORMATS)
+def store(tmp_path, request):
+    filename = str(tmp_path / "scraped.json")
+    with OutputWriter(filename, request.param) as writer:
+        for key, record in RECORDS.items():
+            writer.write(key, record)
+
+    return Store.open(filename, request.param)
+
+
+def test_store_get(store):
+    assert len(store) == len(RECORDS)
+    assert "foil-7" in store and "foil-20" not in store
+    assert all(store[key] == record for key, record in RECORDS.items())
+
+
+def test_store_queries(store):
+    assert store.family("naca") == [
+        key for key, record in RECORDS.items() if record["family"] == "NACA"
+    ]
+    assert store.range("LD-Max", 55, 58) == [
+        "foil-5", "foil-6", "foil-7", "foil-8"
+    ]
+    assert len(store.range("LD-Max")) == len(RECORDS) - 1
+    assert store.range("camber") == []
+    assert store.top("LD-Max", 2, family="Eppler") == [
+        ("foil-18", 68.0), ("foil-16", 66.0)
+    ]
+    assert store.top("LD-Max", 1, largest=False) == [("foil-0", 50.0)]
+    assert store.select(("NACA",), {"thickness": (13, None)}) == [
+        "foil-3", "foil-9", "foil-13", "foil-19"
+    ]
+    assert store.select(ranges={"LD-Max": (None, 53)}) == [
+        "foil-0", "foil-1", "foil-2"
+    ]
+    with pytest.raises(ValueError):
+        store.range("span")
+
+
+def test_store_reopen(store):
+    mtime = os.stat(os.path.join(store.path, Store.METADATA)).st_mtime_ns
+    assert not store.stale
+    assert Store.open(store.filename, store.format).ids == store.ids
+    assert os.stat(
+        os.path.join(store.path, Store.METADATA)
+    ).st_mtime_ns == mtime
+
+    with OutputWriter(store.filename, store.format) as writer:
+        writer.write("foil-0", RECORDS["foil-0"])
+
+    assert store.stale
+    store = Store.open(store.filename, store.format)
+    assert store.ids == ["foil-0"]
+    assert math.isnan(store.values[Store.FIELDS.index("camber"), 0])
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from bfscraper.scrapers.async_components import TableExtractor
+from bfscraper.scrapers.retry import RetryPolicy
+from bfscraper.scrapers.sources import BigFoil
+from bfscraper.scrapers.table import TableParser
+from bfscraper.tools.cache import Cache
+
+ROWS = [
+    {"Name": f"Foil {index}", "Family": "Göttingen", "LD Max": str(index)}
+    for index in range(50)
+]
+TABLE = json.dumps(ROWS, indent=1, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.mark.parametrize("size", [1, 7, 256, len(TABLE)])
+def test_table_parser_chunks(size):
+    parser = TableParser()
+    rows = []
+    for start in range(0, len(TABLE), size):
+        rows.extend(parser.feed(TABLE[start:start + size]))
+
+    parser.close()
+    assert rows == ROWS
+    assert parser.done and parser.rows == len(ROWS)
+
+
+def test_table_parser_streams_rows():
+    parser = TableParser()
+    assert parser.feed(TABLE[:TABLE.index(b"}") + 1]) == ROWS[:1]
+
+
+@pytest.mark.parametrize("table", [b'{"rows": []}', b"[1, 2]"])
+def test_table_parser_invalid(table):
+    with pytest.raises(ValueError):
+        TableParser().feed(table)
+
+
+def test_table_parser_incomplete():
+    parser = TableParser()
+    parser.feed(TABLE[:len(TABLE) // 2])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def extract(cache):
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            table = TableExtractor.configure(BigFoil.TABLE_URL)(
+                cache=cache,
+                timeout=-1,
+                limit=1,
+                progress_bar=False,
+                session=session,
+                retry=RetryPolicy(retries=2, backoff=0.01, max_backoff=0.01)
+            )
+            return [row async for row in table.rows()]
+
+    return asyncio.run(main())
+
+
+def test_table_extractor_resumes_rows(bigfoil, tmp_path):
+    bigfoil.truncated = 1
+    cache = Cache(str(tmp_path / "cache"))
+
+    # Rows received before the connection broke are not yielded again:
+    assert extract(cache) == bigfoil.table()
+    assert bigfoil.table_requests == {"200": 2}
+    cache.close()
+
+
+def test_table_extractor_revalidates_cached_table(bigfoil, tmp_path):
+    cache = Cache(str(tmp_path / "cache"))
+    assert extract(cache) == bigfoil.table()
+
+    assert extract(cache) == bigfoil.table()
+    assert bigfoil.table_requests == {"200": 1, "304": 1}
+
+    # Changed tables are fetched again:
+    bigfoil.count = 25
+    assert extract(cache) == bigfoil.table()
+    assert bigfoil.table_requests == {"200": 2, "304": 1}
+    cache.close()